@@ -37,6 +37,15 @@ def build_executable():
         "--hidden-import=pyautogui",
         "--hidden-import=mss",
         "--hidden-import=tkinter",
+        "--hidden-import=pynput",
+        # Carregados sob demanda pelo BotManager (importlib)
+        "--hidden-import=core.screen_capture",
+        "--hidden-import=core.input_simulator",
+        "--hidden-import=modules.auto_heal",
+        "--hidden-import=modules.auto_mana",
+        "--hidden-import=modules.auto_food",
+        "--hidden-import=modules.auto_loot",
+        "--hidden-import=modules.cavebot",
         "main.py"                       # Arquivo principal
     ]
     
@@ -6,55 +6,176 @@ Controla todos os módulos e funcionalidades
 import threading
 import time
 import logging
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple, Callable, Iterable, List, Set
+from dataclasses import dataclass, field
 
-from modules.auto_heal import AutoHeal
-from modules.auto_mana import AutoMana
-from modules.auto_food import AutoFood
-from modules.auto_loot import AutoLoot
-from modules.cavebot import Cavebot
-from core.screen_capture import ScreenCapture
-from core.input_simulator import InputSimulator
 from utils.config_manager import ConfigManager
+from utils.startup import lazy_import, profiler
+from modules.registry import ModuleSpec, get_module_spec, registered_modules
+from modules.rule_engine import RuleState
+from utils.metrics import PerformanceMonitor, MetricsSample
+from utils.event_log import get_event_log, start_event_log, stop_event_log
+
+if TYPE_CHECKING:
+    from core.runtime import BotRuntime
 
 @dataclass
 class BotStatus:
     """Status do bot"""
     running: bool = False
-    auto_heal_enabled: bool = False
-    auto_mana_enabled: bool = False
-    auto_food_enabled: bool = False
-    auto_loot_enabled: bool = False
-    cavebot_enabled: bool = False
+    enabled_modules: Set[str] = field(default_factory=set)
+    
+    def is_enabled(self, module_name: str) -> bool:
+        """Verifica se um módulo está ativo"""
+        return module_name in self.enabled_modules
+
+@dataclass(frozen=True)
+class BotSnapshot:
+    """Fotografia imutável do estado do bot, lida pela interface"""
+    sequence: int = 0
+    timestamp: float = 0.0
+    running: bool = False
+    modules_enabled: Tuple[Tuple[str, bool], ...] = ()
+    health: Optional[float] = None
+    mana: Optional[float] = None
+    cavebot_state: str = ""
+    cavebot_waypoint: int = 0
+    cavebot_total_waypoints: int = 0
+    first_frame_latency: Optional[float] = None  # Segundos entre start_bot e o primeiro frame
+    metrics: MetricsSample = MetricsSample()
+
+    def is_enabled(self, module_name: str) -> bool:
+        """Verifica se um módulo estava ativo no momento da fotografia"""
+        return dict(self.modules_enabled).get(module_name, False)
+
+class LazyModules(Mapping):
+    """Dicionário de módulos que instancia cada módulo no primeiro acesso"""
+    
+    def __init__(self, names: Iterable[str], factory: Callable[[str], Any]):
+        self._names = tuple(names)
+        self._factory = factory
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, name: str):
+        module = self._instances.get(name)
+        if module is not None:
+            return module
+        if name not in self._names:
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = self._factory(name)
+            return self._instances[name]
+    
+    def __contains__(self, name) -> bool:
+        return name in self._names
+    
+    def __iter__(self):
+        return iter(self._names)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def loaded(self, name: str):
+        """Retorna o módulo se já foi instanciado (sem instanciar)"""
+        return self._instances.get(name)
+    
+    def unload(self, name: str) -> bool:
+        """Descarta a instância (será recriada no próximo acesso)"""
+        with self._lock:
+            return self._instances.pop(name, None) is not None
 
 class BotManager:
     """Gerenciador principal do bot"""
     
-    def __init__(self):
+    def __init__(self, profile: Optional[str] = None):
         self.logger = logging.getLogger(__name__)
         self.status = BotStatus()
-        self.config = ConfigManager()
-        
-        # Inicializar componentes core
-        self.screen_capture = ScreenCapture()
-        self.input_simulator = InputSimulator()
-        
-        # Inicializar módulos
-        self.modules = {
-            'auto_heal': AutoHeal(self.screen_capture, self.input_simulator),
-            'auto_mana': AutoMana(self.screen_capture, self.input_simulator),
-            'auto_food': AutoFood(self.screen_capture, self.input_simulator),
-            'auto_loot': AutoLoot(self.screen_capture, self.input_simulator),
-            'cavebot': Cavebot(self.screen_capture, self.input_simulator)
-        }
-        
-        # Thread principal do bot
+        self.config = ConfigManager(profile=profile)
+        
+        # Componentes core e módulos são criados sob demanda (imports pesados:
+        # cv2, mss, pyautogui, pynput só quando o primeiro módulo for usado)
+        self._screen_capture = None
+        self._input_simulator = None
+        self.modules = LazyModules([spec.name for spec in registered_modules()], self._create_module)
+        
+        # Leituras e cooldowns por grupo comuns às regras de cura e mana
+        self.rule_state = RuleState()
+        
+        # Módulos ativos em ordem de prioridade (lista substituída, nunca alterada)
+        self._active_modules: List[Tuple[ModuleSpec, Any]] = []
+        
+        # Configuração lida no loop como fotografia; alterações de módulos ficam
+        # pendentes e são aplicadas entre ciclos
+        self._bot_settings = self.config.snapshot('bot')
+        self.config.subscribe('bot', self._on_bot_config)
+        self._pending_config: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        for name in self.modules:
+            self.config.subscribe(name, self._on_module_config)
+        self.config.subscribe('rois', self._on_rois_config)
+        if self._bot_settings.get('hot_reload', False):
+            self.config.start_watching(self._bot_settings.get('hot_reload_interval', 1.0))
+        
+        # Thread principal do bot (executa o runtime assíncrono)
         self._bot_thread = None
+        self._runtime: Optional['BotRuntime'] = None
         self._stop_event = threading.Event()
         
+        # Última fotografia publicada (substituída atomicamente, nunca alterada)
+        self._snapshot = BotSnapshot()
+        self._snapshot_lock = threading.Lock()
+        
+        # Métricas de desempenho (amostradas em thread própria, publicadas a cada amostra)
+        self.performance = PerformanceMonitor(on_sample=lambda sample: self.publish_snapshot())
+        self.performance.start()
+        
+        # Telemetria estruturada (opcional)
+        if self._bot_settings.get('event_log', False):
+            start_event_log(self._bot_settings.get('event_log_dir', 'logs'))
+        # Tempo até o primeiro frame após start_bot
+        self._start_requested_at: Optional[float] = None
+        self.first_frame_latency: Optional[float] = None
+        
+        self.publish_snapshot()
+        
         self.logger.info("BotManager inicializado com sucesso")
     
+    @property
+    def screen_capture(self):
+        """Captura de tela (criada no primeiro uso)"""
+        if self._screen_capture is None:
+            screen_capture = lazy_import('core.screen_capture').ScreenCapture()
+            screen_capture.apply_rois(self.config.snapshot('rois').as_dict())
+            self._screen_capture = screen_capture
+        return self._screen_capture
+    
+    @property
+    def input_simulator(self):
+        """Simulador de input (criado no primeiro uso)"""
+        if self._input_simulator is None:
+            self._input_simulator = lazy_import('core.input_simulator').InputSimulator()
+        return self._input_simulator
+    
+    def _create_module(self, module_name: str):
+        """Importa e instancia um módulo, aplicando a configuração salva"""
+        spec = get_module_spec(module_name)
+        module_class = getattr(lazy_import(spec.module_path), spec.class_name)
+        module = module_class(self.screen_capture, self.input_simulator)
+        rule_engine = getattr(module, 'rule_engine', None)
+        if rule_engine is not None:
+            rule_engine.state = self.rule_state
+        
+        # Aplicar configurações salvas (inclui regras de cura/mana)
+        section = self.config.snapshot(module_name)
+        if section.as_dict():
+            module.set_config(section.as_dict())
+        
+        self.logger.info(f"Módulo {module_name} carregado")
+        return module
+    
     def start_bot(self):
         """Inicia o bot"""
         if self.status.running:
@@ -68,15 +189,21 @@ class BotManager:
             
             self.status.running = True
             self._stop_event.clear()
+            self._start_requested_at = time.perf_counter()
+            self.first_frame_latency = None
             
             # Iniciar thread principal
+            runtime = lazy_import('core.runtime')
+            self._runtime = runtime.BotRuntime(self, tick_budget=self._bot_settings.get('tick_budget', 0.05))
             self._bot_thread = threading.Thread(target=self._bot_loop, daemon=True)
             self._bot_thread.start()
+            self.publish_snapshot()
             
             self.logger.info("Bot iniciado com sucesso")
             
         except Exception as e:
             self.status.running = False
+            self.publish_snapshot()
             self.logger.error(f"Erro ao iniciar bot: {e}")
             raise
     
@@ -88,85 +215,191 @@ class BotManager:
         self.logger.info("Parando bot...")
         self.status.running = False
         self._stop_event.set()
+        if self._runtime is not None:
+            self._runtime.stop()
         
         if self._bot_thread and self._bot_thread.is_alive():
             self._bot_thread.join(timeout=5)
         
+        # Input ainda na fila não é executado com o bot parado
+        if self._input_simulator is not None:
+            self._input_simulator.cancel_pending()
+        
+        # Tarefas interrompidas não são retomadas na próxima execução
+        for name in self.modules:
+            module = self.modules.loaded(name)
+            if module is not None:
+                module.cancel_task()
+        
+        self.publish_snapshot()
         self.logger.info("Bot parado")
     
     def stop_all(self):
         """Para todos os componentes do bot"""
         self.stop_bot()
-        # Cleanup adicional se necessário
+        if self._input_simulator is not None:
+            self._input_simulator.stop()
+        self.performance.stop()
+        self.config.stop_watching()
+        self.config.flush()
+        stop_event_log()
     
     def _bot_loop(self):
-        """Loop principal do bot"""
+        """Loop principal do bot (loop de eventos do runtime na thread do bot)"""
         self.logger.info("Iniciando loop principal do bot")
-        
-        while not self._stop_event.is_set() and self.status.running:
-            try:
-                # Capturar tela uma vez por ciclo
-                screen = self.screen_capture.capture()
-                if screen is None:
-                    time.sleep(0.5)
-                    continue
-                
-                # Executar módulos habilitados na ordem de prioridade
-                if self.status.auto_heal_enabled:
-                    self.modules['auto_heal'].process(screen)
-                
-                if self.status.auto_mana_enabled:
-                    self.modules['auto_mana'].process(screen)
-                
-                if self.status.auto_food_enabled:
-                    self.modules['auto_food'].process(screen)
-                
-                if self.status.cavebot_enabled:
-                    self.modules['cavebot'].process(screen)
-                
-                if self.status.auto_loot_enabled:
-                    self.modules['auto_loot'].process(screen)
-                
-                # Pausa entre ciclos (configurável)
-                time.sleep(self.config.get('bot.cycle_delay', 0.1))
-                
-            except Exception as e:
-                self.logger.error(f"Erro no loop do bot: {e}", exc_info=True)
-                time.sleep(1)
-        
+        self._runtime.run()
         self.logger.info("Loop do bot finalizado")
     
+    def _finish_cycle(self, cycle_time: float):
+        """Contabiliza um ciclo concluído (métricas, telemetria e fotografia)"""
+        self.performance.record_cycle(cycle_time)
+        if self.first_frame_latency is None:
+            self._record_first_frame()
+        get_event_log().frame(cycle_time * 1000)
+        self.publish_snapshot()
+    
+    def _record_first_frame(self):
+        """Registra tempo até o primeiro frame processado"""
+        self.first_frame_latency = time.perf_counter() - self._start_requested_at
+        profiler.record_first_frame()
+        self.logger.info(f"Primeiro frame processado {self.first_frame_latency * 1000:.0f}ms após iniciar")
+    
     def toggle_module(self, module_name: str, enabled: bool):
         """Ativa/desativa um módulo"""
-        if module_name == 'auto_heal':
-            self.status.auto_heal_enabled = enabled
-        elif module_name == 'auto_mana':
-            self.status.auto_mana_enabled = enabled
-        elif module_name == 'auto_food':
-            self.status.auto_food_enabled = enabled
-        elif module_name == 'auto_loot':
-            self.status.auto_loot_enabled = enabled
-        elif module_name == 'cavebot':
-            self.status.cavebot_enabled = enabled
+        spec = get_module_spec(module_name)
+        if spec is None:
+            self.logger.warning(f"Módulo desconhecido: {module_name}")
+            return
+        
+        if enabled:
+            # Instanciar agora, fora do loop do bot
+            try:
+                module = self.modules[module_name]
+            except Exception as e:
+                self.logger.error(f"Erro ao carregar módulo {module_name}: {e}")
+                self.publish_snapshot()  # Interface volta a mostrar o módulo desativado
+                return
+            self.status.enabled_modules.add(module_name)
+            self._warn_missing_rois(spec)
+        else:
+            self.status.enabled_modules.discard(module_name)
+            module = self.modules.loaded(module_name)
+            if module is not None:
+                module.cancel_task()
         
+        self._rebuild_active_modules()
+        
+        if not enabled and spec.unload_on_disable and self.modules.unload(module_name):
+            self.logger.info(f"Módulo {module_name} descarregado")
+        
+        self.publish_snapshot()
         self.logger.info(f"Módulo {module_name}: {'ativado' if enabled else 'desativado'}")
     
+    def _rebuild_active_modules(self):
+        """Recalcula lista de módulos ativos usada pelo loop"""
+        self._active_modules = [
+            (spec, self.modules[spec.name]) for spec in registered_modules()
+            if spec.name in self.status.enabled_modules
+        ]
+    
+    def _warn_missing_rois(self, spec: ModuleSpec):
+        """Informa ROIs do módulo ainda não configuradas"""
+        rois = self.screen_capture.rois
+        missing = [roi for roi in spec.rois if not rois.get(roi)]
+        if missing:
+            self.logger.info(f"Módulo {spec.name}: ROIs não configuradas ({', '.join(missing)}), "
+                             f"usando detecção automática")
+    
+    def _on_bot_config(self, snapshot):
+        """Nova configuração geral (lida pelo loop no próximo ciclo)"""
+        self._bot_settings = snapshot
+    
+    def _on_module_config(self, snapshot):
+        """Configuração de módulo alterada: aplicar entre ciclos do loop"""
+        if self.modules.loaded(snapshot.section) is None:
+            return  # Instância futura lê a configuração ao ser criada
+        with self._pending_lock:
+            self._pending_config[snapshot.section] = snapshot.as_dict()
+        if not (self._bot_thread and self._bot_thread.is_alive()):
+            self._apply_pending_config()
+    
+    def _on_rois_config(self, snapshot):
+        """ROIs alteradas (interface ou recarga do arquivo): substituir as da captura"""
+        if self._screen_capture is None:
+            return  # Captura futura lê as ROIs ao ser criada
+        try:
+            self._screen_capture.apply_rois(snapshot.as_dict())
+        except Exception as e:
+            self.logger.error(f"Erro ao aplicar ROIs: {e}")
+    
+    def _apply_pending_config(self):
+        """Aplica configurações pendentes dos módulos"""
+        if not self._pending_config:
+            return
+        with self._pending_lock:
+            pending, self._pending_config = self._pending_config, {}
+        for module_name, config in pending.items():
+            module = self.modules.loaded(module_name)
+            if module is None:
+                continue
+            try:
+                module.set_config(config)
+            except Exception as e:
+                self.logger.error(f"Erro ao aplicar configuração de {module_name}: {e}")
+    
     def get_module_config(self, module_name: str) -> Dict[str, Any]:
         """Obtém configuração de um módulo"""
+        module = self.modules.loaded(module_name)
+        if module is not None:
+            return module.get_config()
         if module_name in self.modules:
-            return self.modules[module_name].get_config()
+            return self.config.snapshot(module_name).as_dict()
         return {}
     
     def set_module_config(self, module_name: str, config: Dict[str, Any]):
-        """Define configuração de um módulo"""
+        """Define configuração de um módulo (aplicada entre ciclos e em instâncias futuras)"""
         if module_name in self.modules:
-            self.modules[module_name].set_config(config)
+            self.config.set_section(module_name, config)
             self.logger.info(f"Configuração do módulo {module_name} atualizada")
     
     def get_status(self) -> BotStatus:
         """Retorna status atual do bot"""
         return self.status
     
+    def publish_snapshot(self) -> BotSnapshot:
+        """Gera e publica nova fotografia do estado do bot"""
+        try:
+            heal = self.modules.loaded('auto_heal')
+            mana = self.modules.loaded('auto_mana')
+            cavebot = self.modules.loaded('cavebot')
+            cavebot_status = cavebot.get_status() if cavebot else {}
+            modules_enabled = tuple(
+                (name, name in self.status.enabled_modules) for name in self.modules
+            )
+            with self._snapshot_lock:
+                snapshot = BotSnapshot(
+                    sequence=self._snapshot.sequence + 1,
+                    timestamp=time.time(),
+                    running=self.status.running,
+                    modules_enabled=modules_enabled,
+                    health=heal.get_current_health() if heal else None,
+                    mana=mana.get_current_mana() if mana else None,
+                    cavebot_state=cavebot_status.get('state', ''),
+                    cavebot_waypoint=cavebot_status.get('current_waypoint', 0),
+                    cavebot_total_waypoints=cavebot_status.get('total_waypoints', 0),
+                    first_frame_latency=self.first_frame_latency,
+                    metrics=self.performance.latest()
+                )
+                self._snapshot = snapshot
+            return snapshot
+        except Exception as e:
+            self.logger.error(f"Erro ao publicar status: {e}")
+            return self._snapshot
+    
+    def get_snapshot(self) -> BotSnapshot:
+        """Retorna última fotografia publicada (seguro em qualquer thread)"""
+        return self._snapshot
+    
     def load_cavebot_script(self, script_path: str) -> bool:
         """Carrega script do cavebot"""
         try:
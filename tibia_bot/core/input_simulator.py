@@ -1,6 +1,9 @@
 """
 Input Simulator - Simulação de input com randomização para evitar detecção
 Simula mouse e teclado de forma humanizada
+
+As ações são enfileiradas e executadas por uma thread dedicada: quem chama
+recebe um InputResult (future) sem esperar o movimento/clique terminar
 """
 
 import pyautogui
@@ -8,10 +11,58 @@ import random
 import time
 import logging
 import math
-from typing import Tuple, List, Optional
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Tuple, List, Optional
 from pynput import mouse, keyboard
 import threading
 
+class InputResult(Future):
+    """
+    Conclusão de um comando de input (resultado: bool)
+    Como valor lógico não bloqueia: verdadeiro se o comando foi aceito e ainda
+    não falhou, o que mantém `if success:` dos módulos
+    """
+    
+    def __bool__(self) -> bool:
+        if not self.done():
+            return True
+        return not self.cancelled() and self.exception() is None and bool(self.result())
+
+@dataclass
+class InputCommand:
+    """Ação de input enfileirada"""
+    kind: str                               # move, click, double_click, drag, key, type, scroll
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    futures: List[InputResult] = field(default_factory=list)
+    tick: int = 0                           # Tick (begin_batch/flush) em que foi enviado
+
+# Ações que já começam movendo o mouse até o alvo
+POSITIONED_ACTIONS = ('click', 'double_click', 'drag', 'scroll')
+
+def coalesce_commands(commands: List[InputCommand]) -> List[InputCommand]:
+    """
+    Reduz um lote de comandos sem alterar a ordem do input
+    - Tecla (sem hold) repetida logo após o mesmo pressionamento do mesmo tick vira um só
+    - Movimento seguido de outro movimento ou de ação posicionada é descartado
+    Os futures dos comandos removidos recebem o resultado do comando que os absorveu
+    """
+    result: List[InputCommand] = []
+    for command in commands:
+        previous = result[-1] if result else None
+        if (previous is not None and command.kind == 'key' and previous.kind == 'key'
+                and previous.args[0] == command.args[0] and previous.tick == command.tick
+                and not previous.kwargs.get('hold_time') and not command.kwargs.get('hold_time')):
+            previous.futures.extend(command.futures)
+            continue
+        
+        if previous is not None and previous.kind == 'move' and (command.kind == 'move' or command.kind in POSITIONED_ACTIONS):
+            command.futures[:0] = result.pop().futures
+        result.append(command)
+    return result
+
 class InputSimulator:
     """Simulador de input humanizado"""
     
@@ -29,12 +80,185 @@ class InputSimulator:
         self.click_delay_variance = 0.03  # Variação no delay
         
         # Histórico para análise anti-detecção
-        self.action_history = []
         self.max_history = 100
+        self.action_history: Deque[dict] = deque(maxlen=self.max_history)
+        
+        # Fila de comandos e thread de execução
+        self._queue: Deque[InputCommand] = deque()
+        self._urgent: Deque[InputCommand] = deque()
+        self._queue_cond = threading.Condition()
+        self._busy = False
+        self._held = False      # Tick em andamento: comandos acumulam até flush()
+        self._stopping = False
+        self._tick = 0
+        self.coalesced_count = 0
+        self._worker = threading.Thread(target=self._worker_loop, name="InputWorker", daemon=True)
+        self._worker.start()
         
         self.logger.info("InputSimulator inicializado")
     
-    def move_mouse(self, x: int, y: int, humanize: bool = True) -> bool:
+    def move_mouse(self, x: int, y: int, humanize: bool = True) -> InputResult:
+        """Move o mouse (enfileirado); movimentos redundantes do mesmo tick são descartados"""
+        return self.submit('move', x, y, humanize)
+    
+    def click(self, x: int, y: int, button: str = 'left', humanize: bool = True) -> InputResult:
+        """Clica em coordenadas específicas (enfileirado)"""
+        return self.submit('click', x, y, button, humanize)
+    
+    def double_click(self, x: int, y: int, humanize: bool = True) -> InputResult:
+        """Executa duplo clique (enfileirado)"""
+        return self.submit('double_click', x, y, humanize)
+    
+    def drag(self, start_x: int, start_y: int, end_x: int, end_y: int,
+             duration: float = 0.5, humanize: bool = True) -> InputResult:
+        """Arrasta de um ponto para outro (enfileirado)"""
+        return self.submit('drag', start_x, start_y, end_x, end_y, duration, humanize)
+    
+    def press_key(self, key: str, hold_time: float = None, urgent: bool = False) -> InputResult:
+        """
+        Pressiona uma tecla (enfileirado); repetições seguidas no mesmo tick viram uma só
+        Com urgent=True (cura/mana) passa à frente dos comandos já enfileirados
+        """
+        return self.submit('key', key, hold_time=hold_time, urgent=urgent)
+    
+    def type_text(self, text: str, interval: float = 0.05, humanize: bool = True) -> InputResult:
+        """Digita texto (enfileirado)"""
+        return self.submit('type', text, interval, humanize)
+    
+    def scroll(self, x: int, y: int, clicks: int, direction: str = 'up') -> InputResult:
+        """Scroll do mouse em posição específica (enfileirado)"""
+        return self.submit('scroll', x, y, clicks, direction)
+    
+    def submit(self, kind: str, *args, urgent: bool = False, **kwargs) -> InputResult:
+        """
+        Enfileira um comando sem bloquear; o future recebe True/False ao terminar
+        Comandos urgentes vão para uma fila própria, executada antes do próximo
+        comando comum (não esperam o lote em andamento nem o fim do tick)
+        """
+        future = InputResult()
+        with self._queue_cond:
+            if self._stopping:
+                future.set_result(False)
+                return future
+            queue = self._urgent if urgent else self._queue
+            queue.append(InputCommand(kind, args, kwargs, [future], self._tick))
+            self._queue_cond.notify()
+        return future
+    
+    def begin_batch(self):
+        """Início de um tick: comandos enviados até flush() formam um único lote"""
+        with self._queue_cond:
+            self._held = True
+    
+    def flush(self):
+        """Fim do tick: libera o lote acumulado para a thread de input"""
+        with self._queue_cond:
+            self._held = False
+            self._tick += 1
+            self._queue_cond.notify_all()
+    
+    def pending(self) -> int:
+        """Comandos aguardando execução (inclui o lote em andamento)"""
+        with self._queue_cond:
+            return len(self._queue) + len(self._urgent) + (1 if self._busy else 0)
+    
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda a fila esvaziar (uso fora do loop do bot, ex: encerramento)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue_cond:
+            while self._queue or self._urgent or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue_cond.wait(remaining)
+        return True
+    
+    def cancel_pending(self) -> int:
+        """Descarta comandos ainda não executados (futures resolvidos com False)"""
+        with self._queue_cond:
+            dropped = list(self._urgent) + list(self._queue)
+            self._urgent.clear()
+            self._queue.clear()
+        for command in dropped:
+            self._resolve(command, False)
+        return len(dropped)
+    
+    def stop(self, timeout: float = 2.0):
+        """Encerra a thread de input depois de executar o que já foi enfileirado"""
+        with self._queue_cond:
+            self._stopping = True
+            self._queue_cond.notify_all()
+        self._worker.join(timeout=timeout)
+    
+    def _worker_loop(self):
+        """
+        Executa os comandos em lotes (tudo que chegou desde o último lote)
+        Antes de cada comando comum, executa os urgentes que chegaram nesse meio tempo
+        """
+        while True:
+            with self._queue_cond:
+                self._busy = False
+                self._queue_cond.notify_all()
+                while not self._urgent and (not self._queue or self._held) and not self._stopping:
+                    self._queue_cond.wait()
+                if not self._urgent and not self._queue:
+                    return
+                batch = []
+                if not self._held or self._stopping:
+                    batch = list(self._queue)
+                    self._queue.clear()
+                self._busy = True
+            
+            self._run_urgent()
+            commands = coalesce_commands(batch)
+            self.coalesced_count += len(batch) - len(commands)
+            for command in commands:
+                self._run_urgent()
+                self._run(command)
+    
+    def _run_urgent(self):
+        """Executa os comandos urgentes pendentes"""
+        with self._queue_cond:
+            batch = list(self._urgent)
+            self._urgent.clear()
+        if not batch:
+            return
+        commands = coalesce_commands(batch)
+        self.coalesced_count += len(batch) - len(commands)
+        for command in commands:
+            self._run(command)
+    
+    def _run(self, command: InputCommand):
+        if all(future.cancelled() for future in command.futures):
+            return
+        self._resolve(command, self._execute(command))
+    
+    def _execute(self, command: InputCommand) -> bool:
+        """Executa um comando na thread de input"""
+        handler = {
+            'move': self._move_mouse,
+            'click': self._click,
+            'double_click': self._double_click,
+            'drag': self._drag,
+            'key': self._press_key,
+            'type': self._type_text,
+            'scroll': self._scroll,
+        }.get(command.kind)
+        if handler is None:
+            self.logger.error(f"Comando de input desconhecido: {command.kind}")
+            return False
+        return handler(*command.args, **command.kwargs)
+    
+    @staticmethod
+    def _resolve(command: InputCommand, success: bool):
+        for future in command.futures:
+            if not future.done():
+                try:
+                    future.set_result(success)
+                except Exception:
+                    pass  # Cancelado por quem enfileirou
+    
+    def _move_mouse(self, x: int, y: int, humanize: bool = True) -> bool:
         """
         Move o mouse para coordenadas específicas
         Se humanize=True, adiciona curva natural e velocidade variável
@@ -62,14 +286,14 @@ class InputSimulator:
             self.logger.error(f"Erro ao mover mouse: {e}")
             return False
     
-    def click(self, x: int, y: int, button: str = 'left', humanize: bool = True) -> bool:
+    def _click(self, x: int, y: int, button: str = 'left', humanize: bool = True) -> bool:
         """
         Clica em coordenadas específicas
         button pode ser 'left', 'right' ou 'middle'
         """
         try:
             # Mover mouse para posição
-            if not self.move_mouse(x, y, humanize):
+            if not self._move_mouse(x, y, humanize):
                 return False
             
             # Adicionar jitter pequeno na posição final
@@ -99,10 +323,10 @@ class InputSimulator:
             self.logger.error(f"Erro ao clicar: {e}")
             return False
     
-    def double_click(self, x: int, y: int, humanize: bool = True) -> bool:
+    def _double_click(self, x: int, y: int, humanize: bool = True) -> bool:
         """Executa duplo clique"""
         try:
-            if not self.move_mouse(x, y, humanize):
+            if not self._move_mouse(x, y, humanize):
                 return False
             
             # Primeiro clique
@@ -125,12 +349,12 @@ class InputSimulator:
             self.logger.error(f"Erro no duplo clique: {e}")
             return False
     
-    def drag(self, start_x: int, start_y: int, end_x: int, end_y: int, 
-             duration: float = 0.5, humanize: bool = True) -> bool:
+    def _drag(self, start_x: int, start_y: int, end_x: int, end_y: int, 
+              duration: float = 0.5, humanize: bool = True) -> bool:
         """Arrasta de um ponto para outro"""
         try:
             # Mover para posição inicial
-            if not self.move_mouse(start_x, start_y, humanize):
+            if not self._move_mouse(start_x, start_y, humanize):
                 return False
             
             # Executar drag
@@ -152,7 +376,7 @@ class InputSimulator:
             self.logger.error(f"Erro no drag: {e}")
             return False
     
-    def press_key(self, key: str, hold_time: float = None) -> bool:
+    def _press_key(self, key: str, hold_time: float = None) -> bool:
         """
         Pressiona uma tecla
         key pode ser um caractere ou nome de tecla especial (enter, space, etc.)
@@ -173,7 +397,7 @@ class InputSimulator:
             self.logger.error(f"Erro ao pressionar tecla: {e}")
             return False
     
-    def type_text(self, text: str, interval: float = 0.05, humanize: bool = True) -> bool:
+    def _type_text(self, text: str, interval: float = 0.05, humanize: bool = True) -> bool:
         """
         Digite texto com intervalo entre caracteres
         Se humanize=True, varia o intervalo e adiciona erros ocasionais
@@ -204,7 +428,7 @@ class InputSimulator:
             self.logger.error(f"Erro ao digitar texto: {e}")
             return False
     
-    def scroll(self, x: int, y: int, clicks: int, direction: str = 'up') -> bool:
+    def _scroll(self, x: int, y: int, clicks: int, direction: str = 'up') -> bool:
         """
         Scroll do mouse em posição específica
         direction pode ser 'up' ou 'down'
@@ -212,7 +436,7 @@ class InputSimulator:
         """
         try:
             # Mover mouse para posição
-            self.move_mouse(x, y)
+            self._move_mouse(x, y)
             
             # Determinar direção
             scroll_clicks = clicks if direction == 'up' else -clicks
@@ -259,11 +483,8 @@ class InputSimulator:
             'data': data
         }
         
+        # deque com maxlen descarta a ação mais antiga
         self.action_history.append(action_record)
-        
-        # Manter histórico limitado
-        if len(self.action_history) > self.max_history:
-            self.action_history.pop(0)
     
     def get_action_statistics(self) -> dict:
         """Retorna estatísticas das ações para análise"""
@@ -274,7 +495,9 @@ class InputSimulator:
             'total_actions': len(self.action_history),
             'action_types': {},
             'time_span': 0,
-            'average_interval': 0
+            'average_interval': 0,
+            'coalesced': self.coalesced_count,
+            'pending': self.pending()
         }
         
         # Contar tipos de ação
@@ -298,6 +521,8 @@ class InputSimulator:
     def emergency_stop(self):
         """Para todas as ações de input imediatamente"""
         try:
+            # Ações enfileiradas não devem ser executadas depois da parada
+            self.cancel_pending()
             # Mover mouse para canto (ativa FAILSAFE do PyAutoGUI)
             pyautogui.moveTo(0, 0)
             self.logger.info("Parada de emergência ativada")
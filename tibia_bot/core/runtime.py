@@ -0,0 +1,233 @@
+"""
+Runtime - Execução cooperativa dos módulos (asyncio)
+Um único loop de eventos na thread do bot: a captura roda numa thread
+auxiliar sem bloquear o loop, cada módulo ativo é uma corrotina que aguarda
+frames, pausas e condições visuais, e o frame de cada ciclo é entregue em
+ordem de prioridade (cura antes de cavebot e loot)
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from modules.registry import ModuleSpec
+
+if TYPE_CHECKING:
+    # Só para anotações: numpy e cv2 (waits) ficam fora da inicialização
+    import numpy as np
+    from modules.waits import Wait
+
+class FrameMailbox:
+    """Último frame entregue a um módulo (frame não lido é substituído, nunca enfileirado)"""
+
+    def __init__(self):
+        self._frame: Optional['np.ndarray'] = None
+        self._event = asyncio.Event()
+
+    def put(self, frame: 'np.ndarray'):
+        self._frame = frame
+        self._event.set()
+
+    async def get(self) -> 'np.ndarray':
+        await self._event.wait()
+        self._event.clear()
+        return self._frame
+
+class ModuleContext:
+    """API assíncrona disponível à corrotina de um módulo"""
+
+    def __init__(self, spec: ModuleSpec, tick_budget: float = 0.05):
+        self.spec = spec
+        self.tick_budget = tick_budget          # Tempo máximo esperado de um passo síncrono (s)
+        self.frame: Optional['np.ndarray'] = None  # Último frame recebido
+        self.max_tick_ms = 0.0
+        self.mailbox = FrameMailbox()
+        self._next_tick = 0.0
+        self._last_warning = 0.0
+        self._logger = logging.getLogger(f"modules.{spec.name}")
+
+    async def next_frame(self) -> 'np.ndarray':
+        """Aguarda o próximo frame capturado"""
+        self.frame = await self.mailbox.get()
+        return self.frame
+
+    async def sleep(self, seconds: float):
+        """Pausa sem bloquear os demais módulos"""
+        await asyncio.sleep(seconds)
+
+    async def condition(self, wait: 'Wait',
+                        on_frame: Optional[Callable[['np.ndarray'], None]] = None) -> Optional['np.ndarray']:
+        """
+        Aguarda uma condição visual nos próximos frames
+        A referência é o último frame recebido (o próximo, se ainda não houve nenhum)
+        `on_frame` recebe cada frame que chegar durante a espera
+        Retorna o frame que a satisfez ou None se expirou
+        """
+        if self.frame is None:
+            frame = await self.next_frame()
+            if on_frame is not None:
+                on_frame(frame)
+        wait.start(self.frame, time.perf_counter())
+        while True:
+            frame = await self.next_frame()
+            if on_frame is not None:
+                on_frame(frame)
+            result = wait.poll(frame, time.perf_counter())
+            if result is not None:
+                return frame if result else None
+
+    def due(self, force: bool = False) -> bool:
+        """Verifica se o módulo deve agir neste frame (frequência do registro)"""
+        interval = self.spec.tick_interval
+        if not interval or force:
+            return True
+        now = time.perf_counter()
+        if now < self._next_tick:
+            return False
+        self._next_tick = now + interval
+        return True
+
+    @contextmanager
+    def timed(self):
+        """Mede um passo síncrono e avisa (no máximo a cada 10s) se excedeu o orçamento"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.max_tick_ms = max(self.max_tick_ms, elapsed * 1000)
+            if elapsed > self.tick_budget and start - self._last_warning > 10.0:
+                self._last_warning = start
+                self._logger.warning(f"Passo de {elapsed * 1000:.0f}ms excedeu o orçamento de "
+                                     f"{self.tick_budget * 1000:.0f}ms e atrasou os demais módulos")
+
+class BotRuntime:
+    """Loop de eventos do bot: captura, entrega de frames e corrotinas dos módulos"""
+
+    def __init__(self, manager, tick_budget: float = 0.05):
+        self.logger = logging.getLogger(__name__)
+        self.manager = manager
+        self.tick_budget = tick_budget
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        # Corrotina de cada módulo ativo, com a instância que ela executa
+        self._drivers: Dict[str, Tuple[ModuleContext, asyncio.Task, Any]] = {}
+        # Captura sempre na mesma thread (handles de captura não são compartilhados)
+        self._capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ScreenCapture")
+
+    def run(self):
+        """Executa o loop até stop() (chamado na thread do bot)"""
+        try:
+            asyncio.run(self._main())
+        finally:
+            self._capture_executor.shutdown(wait=False)
+
+    def stop(self):
+        """Pede o encerramento do loop (seguro a partir de outras threads)"""
+        loop, stop = self._loop, self._stop
+        if loop is not None and stop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(stop.set)
+            except RuntimeError:
+                pass  # Loop já encerrado
+
+    def tick_stats(self) -> Dict[str, float]:
+        """Maior passo síncrono de cada módulo ativo (ms)"""
+        return {name: context.max_tick_ms for name, (context, _, _) in self._drivers.items()}
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        manager = self.manager
+        try:
+            while not self._stop.is_set() and not manager._stop_event.is_set() and manager.status.running:
+                try:
+                    await self._cycle()
+                except Exception as e:
+                    self.logger.error(f"Erro no loop do bot: {e}", exc_info=True)
+                    await self._sleep(1)
+        finally:
+            await self._stop_drivers(list(self._drivers))
+
+    async def _cycle(self):
+        """Um ciclo: captura, entrega do frame em ordem de prioridade, pausa configurável"""
+        manager = self.manager
+        cycle_start = time.perf_counter()
+        settings = manager._bot_settings
+        manager._apply_pending_config()
+
+        # Capturar tela uma vez por ciclo, fora do loop de eventos
+        screen = await self._loop.run_in_executor(self._capture_executor, manager.screen_capture.capture)
+        if screen is None:
+            await self._sleep(0.5)
+            return
+
+        await self._sync_drivers()
+
+        # Input enviado pelos módulos neste frame vira um lote (teclas repetidas coalescidas)
+        input_simulator = manager._input_simulator
+        if input_simulator is not None:
+            input_simulator.begin_batch()
+        try:
+            for spec, _ in manager._active_modules:
+                driver = self._drivers.get(spec.name)
+                if driver is not None:
+                    driver[0].mailbox.put(screen)
+
+            # Ceder o loop: módulos acordam na ordem em que receberam o frame
+            await asyncio.sleep(0)
+        finally:
+            if input_simulator is not None:
+                input_simulator.flush()
+
+        manager._finish_cycle(time.perf_counter() - cycle_start)
+
+        # Pausa entre ciclos (configurável); pausas e esperas dos módulos seguem rodando
+        await self._sleep(settings.cycle_delay)
+
+    async def _sync_drivers(self):
+        """
+        Cria/encerra corrotinas conforme a lista de módulos ativos
+        Módulo recriado entre ciclos (desativado e reativado) troca de corrotina
+        """
+        active = {spec.name: module for spec, module in self.manager._active_modules}
+
+        await self._stop_drivers([name for name, (_, _, module) in self._drivers.items()
+                                  if active.get(name) is not module])
+        for spec, module in self.manager._active_modules:
+            if spec.name not in self._drivers:
+                context = ModuleContext(spec, self.tick_budget)
+                task = asyncio.create_task(self._drive(spec, module, context), name=spec.name)
+                self._drivers[spec.name] = (context, task, module)
+
+    async def _stop_drivers(self, names):
+        tasks = []
+        for name in names:
+            _, task, _ = self._drivers.pop(name)
+            task.cancel()
+            tasks.append(task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _drive(self, spec: ModuleSpec, module: Any, context: ModuleContext):
+        """Executa a corrotina do módulo, reiniciando-a no próximo frame em caso de erro"""
+        while True:
+            try:
+                await module.run(context)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Erro no módulo {spec.name}: {e}", exc_info=True)
+                await context.next_frame()
+
+    async def _sleep(self, seconds: float):
+        """Pausa interrompida por stop()"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
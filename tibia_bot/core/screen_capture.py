@@ -34,7 +34,11 @@ class ScreenCapture:
             'food_status': None,    # Status de comida
             'game_area': None,      # Área principal do jogo
             'loot_area': None,      # Área de loot
-            'chat_area': None       # Área de chat
+            'chat_area': None,      # Área de chat
+            'minimap': None,        # Minimapa (localização do cavebot)
+            'battle_list': None,    # Painel de batalha (lista de criaturas)
+            'inventory': None,      # Slots do inventário (reconhecimento de itens)
+            'loot_container': None  # Slots do container aberto ao saquear
         }
         
         self.logger.info("ScreenCapture inicializado")
@@ -81,6 +85,19 @@ class ScreenCapture:
         }
         self.logger.debug(f"ROI {roi_name} definida: {x}, {y}, {width}x{height}")
     
+    def apply_rois(self, rois: Dict[str, Optional[Dict[str, int]]]):
+        """
+        Aplica as ROIs da configuração (seção 'rois')
+        O dicionário é substituído de uma vez: o loop do bot nunca lê um estado parcial
+        """
+        updated = dict.fromkeys(self.rois)
+        for roi_name, roi in rois.items():
+            if roi:
+                updated[roi_name] = {key: int(roi[key]) for key in ('x', 'y', 'width', 'height')}
+        self.rois = updated
+        configured = [name for name, roi in updated.items() if roi]
+        self.logger.info(f"ROIs configuradas: {', '.join(configured) or 'nenhuma'}")
+    
     def capture(self) -> Optional[np.ndarray]:
         """
         Captura a tela usando o método mais apropriado
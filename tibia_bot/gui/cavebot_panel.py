@@ -92,7 +92,7 @@ class CavebotPanel:
         waypoints_list_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
         # Treeview para waypoints
-        columns = ('Tipo', 'X', 'Y', 'Ação')
+        columns = ('Tipo', 'X', 'Y', 'Z', 'Ação')
         self.waypoints_tree = ttk.Treeview(waypoints_list_frame, columns=columns, show='headings', height=8)
         
         for col in columns:
@@ -120,7 +120,8 @@ class CavebotPanel:
         ttk.Label(form_frame, text="Tipo:").grid(row=0, column=0, sticky=tk.W)
         self.waypoint_type_var = tk.StringVar(value="walk")
         type_combo = ttk.Combobox(form_frame, textvariable=self.waypoint_type_var, width=12,
-                                 values=["walk", "attack", "stairs", "hole", "rope", "wait"])
+                                 values=["walk", "attack", "stairs", "hole", "rope", "wait",
+                                         "label", "goto_label"])
         type_combo.grid(row=0, column=1, sticky=tk.W, padx=(5, 10))
         
         ttk.Label(form_frame, text="X:").grid(row=0, column=2, sticky=tk.W)
@@ -131,6 +132,10 @@ class CavebotPanel:
         self.waypoint_y_var = tk.IntVar()
         ttk.Entry(form_frame, textvariable=self.waypoint_y_var, width=8).grid(row=0, column=5, sticky=tk.W, padx=(5, 10))
         
+        ttk.Label(form_frame, text="Z:").grid(row=0, column=6, sticky=tk.W)
+        self.waypoint_z_var = tk.IntVar(value=7)
+        ttk.Entry(form_frame, textvariable=self.waypoint_z_var, width=4).grid(row=0, column=7, sticky=tk.W, padx=(5, 10))
+        
         ttk.Label(form_frame, text="Ação:").grid(row=1, column=0, sticky=tk.W)
         self.waypoint_action_var = tk.StringVar()
         ttk.Entry(form_frame, textvariable=self.waypoint_action_var, width=20).grid(row=1, column=1, columnspan=2, sticky=tk.W, padx=(5, 10))
@@ -198,8 +203,9 @@ class CavebotPanel:
             
             # Carregar waypoints no módulo cavebot
             cavebot_module = self.bot_manager.modules['cavebot']
-            cavebot_module.waypoints = self.waypoints.copy()
-            cavebot_module.script_loaded = True
+            if not cavebot_module.set_waypoints(self.waypoints):
+                messagebox.showerror("Erro", "Script inválido! Verifique labels e saltos no log.")
+                return
             
             # Iniciar cavebot
             cavebot_module.start_cavebot()
@@ -278,6 +284,7 @@ class CavebotPanel:
                     wp_data = {
                         'x': wp.x,
                         'y': wp.y,
+                        'z': wp.z,
                         'type': wp.type.value,
                         'action': wp.action,
                         'delay': wp.delay
@@ -341,7 +348,8 @@ class CavebotPanel:
                 y=self.waypoint_y_var.get(),
                 type=WaypointType(self.waypoint_type_var.get()),
                 action=self.waypoint_action_var.get(),
-                delay=self.waypoint_delay_var.get()
+                delay=self.waypoint_delay_var.get(),
+                z=self.waypoint_z_var.get()
             )
             
             self.waypoints.append(waypoint)
@@ -392,6 +400,7 @@ class CavebotPanel:
             self.waypoint_type_var.set(waypoint.type.value)
             self.waypoint_x_var.set(waypoint.x)
             self.waypoint_y_var.set(waypoint.y)
+            self.waypoint_z_var.set(waypoint.z)
             self.waypoint_action_var.set(waypoint.action)
             self.waypoint_delay_var.set(waypoint.delay)
             
@@ -458,6 +467,7 @@ class CavebotPanel:
                     waypoint.type.value,
                     waypoint.x,
                     waypoint.y,
+                    waypoint.z,
                     waypoint.action[:20]  # Truncar ação se muito longa
                 ))
             
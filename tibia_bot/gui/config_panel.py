@@ -5,6 +5,8 @@ Interface para ajustar todas as configurações do bot
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import json
+import os
 
 class ConfigPanel:
     """Painel de configurações do bot"""
@@ -438,11 +440,18 @@ class ConfigPanel:
         try:
             self.items_listbox.delete(0, tk.END)
             
-            # Obter lista do módulo auto_loot
-            if hasattr(self.bot_manager.modules['auto_loot'], 'valuable_items'):
-                items = self.bot_manager.modules['auto_loot'].valuable_items
-                for item in items:
-                    self.items_listbox.insert(tk.END, item)
+            # Obter lista do módulo auto_loot (ou do arquivo, se ainda não carregado)
+            auto_loot = self.bot_manager.modules.loaded('auto_loot')
+            if auto_loot is not None:
+                items = auto_loot.valuable_items
+            elif os.path.exists("config/valuable_items.json"):
+                with open("config/valuable_items.json", 'r') as f:
+                    items = json.load(f)
+            else:
+                items = []
+            
+            for item in items:
+                self.items_listbox.insert(tk.END, item)
                     
         except Exception as e:
             pass  # Silencioso se módulo não estiver disponível
@@ -5,8 +5,6 @@ Interface intuitiva para configuração e controle do bot
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading
-import time
 from typing import Optional
 import logging
 
@@ -14,6 +12,7 @@ from gui.status_panel import StatusPanel
 from gui.config_panel import ConfigPanel
 from gui.cavebot_panel import CavebotPanel
 from gui.hotkey_panel import HotkeyPanel
+from modules.registry import registered_modules
 
 class TibiaBotGUI:
     """Interface gráfica principal do Tibia Bot"""
@@ -25,8 +24,9 @@ class TibiaBotGUI:
         
         # Estados da interface
         self.is_bot_running = False
-        self.update_thread = None
-        self.stop_update = False
+        self.refresh_interval_ms = 250
+        self._refresh_job = None
+        self._last_sequence = -1
         
         # Configurar janela principal
         self.setup_main_window()
@@ -37,8 +37,8 @@ class TibiaBotGUI:
         # Criar interface
         self.create_widgets()
         
-        # Iniciar thread de atualização
-        self.start_update_thread()
+        # Iniciar atualização periódica (sempre na thread do Tk)
+        self.start_refresh()
         
         self.logger.info("Interface gráfica inicializada")
     
@@ -133,13 +133,7 @@ class TibiaBotGUI:
         
         # Checkboxes dos módulos
         self.module_vars = {}
-        modules = [
-            ('auto_heal', 'Auto Heal'),
-            ('auto_mana', 'Auto Mana'),
-            ('auto_food', 'Auto Food'),
-            ('auto_loot', 'Auto Loot'),
-            ('cavebot', 'Cavebot')
-        ]
+        modules = [(spec.name, spec.label or spec.name) for spec in registered_modules()]
         
         for i, (module_id, module_name) in enumerate(modules):
             var = tk.BooleanVar()
@@ -229,45 +223,36 @@ class TibiaBotGUI:
         except Exception as e:
             self.logger.error(f"Erro ao alternar módulo {module_name}: {e}")
     
-    def start_update_thread(self):
-        """Inicia thread de atualização da interface"""
-        self.stop_update = False
-        self.update_thread = threading.Thread(target=self.update_loop, daemon=True)
-        self.update_thread.start()
+    def start_refresh(self):
+        """Agenda leitura periódica do status do bot no loop do Tk"""
+        self._refresh_job = self.root.after(self.refresh_interval_ms, self.refresh_from_snapshot)
     
-    def update_loop(self):
-        """Loop de atualização da interface"""
-        while not self.stop_update:
-            try:
-                # Atualizar status do bot
-                self.update_bot_status()
-                
-                # Atualizar painéis
+    def refresh_from_snapshot(self):
+        """Renderiza a última fotografia publicada pelo BotManager, se mudou"""
+        try:
+            snapshot = self.bot_manager.get_snapshot()
+            if snapshot.sequence != self._last_sequence:
+                self._last_sequence = snapshot.sequence
+                self.update_bot_status(snapshot)
                 if hasattr(self, 'status_panel'):
-                    self.status_panel.update_status()
-                
-                # Dormir por um tempo
-                time.sleep(0.5)
-                
-            except Exception as e:
-                self.logger.error(f"Erro no loop de atualização: {e}")
-                time.sleep(1)
+                    self.status_panel.render(snapshot)
+        except Exception as e:
+            self.logger.error(f"Erro na atualização da interface: {e}")
+        finally:
+            self.start_refresh()
     
-    def update_bot_status(self):
-        """Atualiza status do bot na interface"""
+    def update_bot_status(self, snapshot):
+        """Atualiza controles principais a partir da fotografia do bot"""
         try:
-            bot_status = self.bot_manager.get_status()
-            
             # Atualizar estado dos módulos
             for module_name, var in self.module_vars.items():
-                if hasattr(bot_status, f'{module_name}_enabled'):
-                    enabled = getattr(bot_status, f'{module_name}_enabled')
-                    if var.get() != enabled:
-                        var.set(enabled)
+                enabled = snapshot.is_enabled(module_name)
+                if var.get() != enabled:
+                    var.set(enabled)
             
             # Atualizar status geral
-            if bot_status.running != self.is_bot_running:
-                self.is_bot_running = bot_status.running
+            if snapshot.running != self.is_bot_running:
+                self.is_bot_running = snapshot.running
                 if self.is_bot_running:
                     self.start_stop_btn.config(text="Parar Bot")
                     self.status_label.config(text="Bot Executando", style='Success.TLabel')
@@ -343,11 +328,62 @@ class TibiaBotGUI:
             messagebox.showerror("Erro", f"Erro ao capturar tela: {e}")
     
     def configure_rois(self):
-        """Abre ferramenta de configuração de ROIs"""
+        """Abre janela de configuração de ROIs (x, y, largura, altura em pixels da tela)"""
         try:
-            # Implementar ferramenta de ROI (pode ser uma janela separada)
-            messagebox.showinfo("Em Desenvolvimento", 
-                              "Ferramenta de configuração de ROIs será implementada em breve!")
+            config = self.bot_manager.config
+            rois = config.snapshot('rois').as_dict()
+            
+            roi_window = tk.Toplevel(self.root)
+            roi_window.title("Configurar ROIs")
+            roi_window.transient(self.root)
+            
+            frame = ttk.Frame(roi_window, padding="10")
+            frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+            
+            fields = ('x', 'y', 'width', 'height')
+            for column, title in enumerate(("ROI", "X", "Y", "Largura", "Altura")):
+                ttk.Label(frame, text=title).grid(row=0, column=column, sticky=tk.W, padx=2)
+            
+            # Campos vazios = ROI não configurada
+            entries = {}
+            for row, (roi_name, roi) in enumerate(sorted(rois.items()), start=1):
+                ttk.Label(frame, text=roi_name).grid(row=row, column=0, sticky=tk.W, padx=2)
+                variables = []
+                for column, field in enumerate(fields, start=1):
+                    variable = tk.StringVar(value=str(roi[field]) if roi else "")
+                    ttk.Entry(frame, textvariable=variable, width=7).grid(row=row, column=column, padx=2, pady=1)
+                    variables.append(variable)
+                entries[roi_name] = variables
+            
+            def save_rois():
+                updated = {}
+                for roi_name, variables in entries.items():
+                    values = [variable.get().strip() for variable in variables]
+                    if not any(values):
+                        updated[roi_name] = None
+                        continue
+                    try:
+                        x, y, width, height = (int(value) for value in values)
+                    except ValueError:
+                        messagebox.showerror("Erro", f"ROI {roi_name}: preencha os quatro valores com inteiros",
+                                             parent=roi_window)
+                        return
+                    if x < 0 or y < 0 or width <= 0 or height <= 0:
+                        messagebox.showerror("Erro", f"ROI {roi_name}: posição negativa ou tamanho zero",
+                                             parent=roi_window)
+                        return
+                    updated[roi_name] = {'x': x, 'y': y, 'width': width, 'height': height}
+                
+                # Inscritos (captura de tela) recebem as ROIs novas imediatamente
+                if config.set_section('rois', updated):
+                    roi_window.destroy()
+                else:
+                    messagebox.showerror("Erro", "Erro ao salvar ROIs!", parent=roi_window)
+            
+            button_frame = ttk.Frame(frame)
+            button_frame.grid(row=len(entries) + 1, column=0, columnspan=len(fields) + 1, pady=(10, 0))
+            ttk.Button(button_frame, text="Salvar", command=save_rois).grid(row=0, column=0, padx=5)
+            ttk.Button(button_frame, text="Cancelar", command=roi_window.destroy).grid(row=0, column=1, padx=5)
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao abrir configuração de ROIs: {e}")
@@ -528,6 +564,8 @@ class TibiaBotGUI:
     
     def cleanup(self):
         """Limpeza ao fechar a aplicação"""
-        self.stop_update = True
-        if self.update_thread and self.update_thread.is_alive():
-            self.update_thread.join(timeout=1)
\ No newline at end of file
+        if self._refresh_job is not None:
+            self.root.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        if hasattr(self, 'status_panel'):
+            self.status_panel.close()
\ No newline at end of file
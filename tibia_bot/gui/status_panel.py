@@ -5,8 +5,30 @@ Exibe informações em tempo real sobre o funcionamento do bot
 
 import tkinter as tk
 from tkinter import ttk
+import logging
 import time
-from typing import Optional
+from collections import deque
+from typing import Dict, List, Optional
+
+from utils.logger import attach_ring_buffer_handler, remove_pipeline_handler, LogEntry
+
+# Níveis exibidos no filtro do log
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# Caracteres das mini-séries (sparklines) de desempenho
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+def sparkline(values, width: int = 20) -> str:
+    """Mini-gráfico em texto com os últimos valores da série"""
+    values = values[-width:]
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = high - low
+    if span <= 0:
+        return SPARK_CHARS[0] * len(values)
+    top = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[int((value - low) / span * top)] for value in values)
 
 class StatusPanel:
     """Painel de status do bot"""
@@ -16,11 +38,22 @@ class StatusPanel:
         self.bot_manager = bot_manager
         
         self.frame = ttk.Frame(parent, padding="10")
+        
+        # Log recente: buffer circular alimentado pelo logging e descarregado em lote
+        # O limite de linhas vale por nível, para o filtro sempre ter o que mostrar
+        self.max_log_lines = 200
+        self.log_flush_interval_ms = 300
+        self.log_handler = attach_ring_buffer_handler(capacity=self.max_log_lines)
+        self._log_sequence = 0
+        self._log_entry_lines: Dict[str, deque] = {}  # nível -> linhas de cada entrada no widget
+        self._log_line_count: Dict[str, int] = {}
+        self._log_job = None
+        
         self.create_widgets()
+        self.start_log_flush()
         
-        # Variáveis de status
-        self.last_update = 0
-        self.update_interval = 1.0  # Atualizar a cada segundo
+        # Último conteúdo aplicado em cada widget (renderização por diferença)
+        self._rendered = {}
     
     def create_widgets(self):
         """Cria widgets do painel de status"""
@@ -111,36 +144,46 @@ class StatusPanel:
         performance_frame = ttk.LabelFrame(self.frame, text="Performance", padding="10")
         performance_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
         
-        ttk.Label(performance_frame, text="FPS Captura:").grid(row=0, column=0, sticky=tk.W)
-        self.fps_label = ttk.Label(performance_frame, text="0.0")
-        self.fps_label.grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        # Valor atual + mini-série dos últimos segundos
+        self.fps_label, self.fps_spark = self._create_metric(performance_frame, "FPS Captura:", "0.0", 0, 0)
+        self.cycle_time_label, self.cycle_time_spark = self._create_metric(
+            performance_frame, "Tempo Ciclo:", "0ms", 0, 3)
+        self.memory_label, self.memory_spark = self._create_metric(performance_frame, "Memória:", "0 MB", 1, 0)
+        self.cpu_label, self.cpu_spark = self._create_metric(performance_frame, "CPU:", "0%", 1, 3)
         
-        ttk.Label(performance_frame, text="Tempo Ciclo:").grid(row=0, column=2, sticky=tk.W, padx=(20, 0))
-        self.cycle_time_label = ttk.Label(performance_frame, text="0ms")
-        self.cycle_time_label.grid(row=0, column=3, sticky=tk.W, padx=(10, 0))
-        
-        ttk.Label(performance_frame, text="Memória:").grid(row=1, column=0, sticky=tk.W)
-        self.memory_label = ttk.Label(performance_frame, text="0 MB")
-        self.memory_label.grid(row=1, column=1, sticky=tk.W, padx=(10, 0))
-        
-        ttk.Label(performance_frame, text="CPU:").grid(row=1, column=2, sticky=tk.W, padx=(20, 0))
-        self.cpu_label = ttk.Label(performance_frame, text="0%")
-        self.cpu_label.grid(row=1, column=3, sticky=tk.W, padx=(10, 0))
+        ttk.Label(performance_frame, text="1º Frame:").grid(row=2, column=0, sticky=tk.W)
+        self.first_frame_label = ttk.Label(performance_frame, text="--")
+        self.first_frame_label.grid(row=2, column=1, sticky=tk.W, padx=(10, 0))
         
         # Log recente
         log_frame = ttk.LabelFrame(self.frame, text="Log Recente", padding="10")
         log_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
         
+        # Filtro de nível (oculta linhas via tags, sem reconstruir o texto)
+        filter_frame = ttk.Frame(log_frame)
+        filter_frame.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        ttk.Label(filter_frame, text="Nível:").grid(row=0, column=0, sticky=tk.W)
+        self.log_level_var = tk.StringVar(value="INFO")
+        level_combo = ttk.Combobox(filter_frame, textvariable=self.log_level_var, width=10,
+                                   values=LOG_LEVELS[1:], state="readonly")
+        level_combo.grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
+        level_combo.bind("<<ComboboxSelected>>", lambda e: self._apply_log_filter())
+        
         # Text widget para log
         self.log_text = tk.Text(log_frame, height=8, width=70, wrap=tk.WORD)
         log_scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
         self.log_text.configure(yscrollcommand=log_scrollbar.set)
         
-        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        log_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.log_text.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        log_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        
+        self.log_text.tag_configure("WARNING", foreground="orange")
+        self.log_text.tag_configure("ERROR", foreground="red")
+        self.log_text.tag_configure("CRITICAL", foreground="red")
+        self._apply_log_filter()
         
         log_frame.columnconfigure(0, weight=1)
-        log_frame.rowconfigure(0, weight=1)
+        log_frame.rowconfigure(1, weight=1)
         
         # Configurar expansão
         self.frame.columnconfigure(0, weight=1)
@@ -148,103 +191,152 @@ class StatusPanel:
         self.frame.rowconfigure(1, weight=1)
         self.frame.rowconfigure(3, weight=1)
     
-    def update_status(self):
-        """Atualiza status do painel"""
+    def _create_metric(self, parent, title: str, initial: str, row: int, column: int):
+        """Cria rótulo, valor e sparkline de uma métrica de performance"""
+        ttk.Label(parent, text=title).grid(row=row, column=column, sticky=tk.W,
+                                           padx=(20, 0) if column else 0)
+        value_label = ttk.Label(parent, text=initial)
+        value_label.grid(row=row, column=column + 1, sticky=tk.W, padx=(10, 0))
+        spark_label = ttk.Label(parent, text="", foreground="gray")
+        spark_label.grid(row=row, column=column + 2, sticky=tk.W, padx=(5, 0))
+        return value_label, spark_label
+    
+    def render(self, snapshot):
+        """Atualiza painel a partir da fotografia publicada pelo BotManager"""
         try:
-            current_time = time.time()
-            if current_time - self.last_update < self.update_interval:
-                return
-            
-            self.last_update = current_time
-            
-            # Obter status do bot
-            bot_status = self.bot_manager.get_status()
-            
             # Atualizar status geral
-            if bot_status.running:
-                self.bot_status_label.config(text="Executando", foreground="green")
+            if snapshot.running:
+                self._set_label(self.bot_status_label, text="Executando", foreground="green")
             else:
-                self.bot_status_label.config(text="Parado", foreground="red")
+                self._set_label(self.bot_status_label, text="Parado", foreground="red")
             
             # Atualizar status dos módulos
-            self._update_module_status("auto_heal", self.heal_status, bot_status.auto_heal_enabled)
-            self._update_module_status("auto_mana", self.mana_status, bot_status.auto_mana_enabled)
-            self._update_module_status("auto_food", self.food_status, bot_status.auto_food_enabled)
-            self._update_module_status("auto_loot", self.loot_status, bot_status.auto_loot_enabled)
-            self._update_module_status("cavebot", self.cavebot_status, bot_status.cavebot_enabled)
+            self._update_module_status(self.heal_status, snapshot.is_enabled('auto_heal'))
+            self._update_module_status(self.mana_status, snapshot.is_enabled('auto_mana'))
+            self._update_module_status(self.food_status, snapshot.is_enabled('auto_food'))
+            self._update_module_status(self.loot_status, snapshot.is_enabled('auto_loot'))
+            self._update_module_status(self.cavebot_status, snapshot.is_enabled('cavebot'))
             
             # Atualizar informações específicas
-            self._update_health_mana_info()
-            self._update_cavebot_info()
-            self._update_performance_info()
+            self._update_health_mana_info(snapshot)
+            self._update_cavebot_info(snapshot)
+            self._update_performance_info(snapshot.metrics)
+            if snapshot.first_frame_latency is not None:
+                self._set_label(self.first_frame_label, text=f"{snapshot.first_frame_latency * 1000:.0f}ms")
             
         except Exception as e:
             # Log silencioso do erro
             pass
     
-    def _update_module_status(self, module_name: str, label: ttk.Label, enabled: bool):
+    def _set_label(self, label: ttk.Label, **options):
+        """Reconfigura o widget apenas se o conteúdo mudou desde a última renderização"""
+        if self._rendered.get(label) != options:
+            label.config(**options)
+            self._rendered[label] = options
+    
+    def _update_module_status(self, label: ttk.Label, enabled: bool):
         """Atualiza status de um módulo específico"""
         if enabled:
-            label.config(text="Ativo", foreground="green")
+            self._set_label(label, text="Ativo", foreground="green")
         else:
-            label.config(text="Desabilitado", foreground="gray")
+            self._set_label(label, text="Desabilitado", foreground="gray")
     
-    def _update_health_mana_info(self):
+    def _update_health_mana_info(self, snapshot):
         """Atualiza informações de vida e mana"""
-        try:
-            # Obter percentuais atuais
-            if hasattr(self.bot_manager.modules['auto_heal'], 'get_current_health'):
-                health = self.bot_manager.modules['auto_heal'].get_current_health()
-                self.heal_health.config(text=f"Vida: {health:.0f}%")
-            
-            if hasattr(self.bot_manager.modules['auto_mana'], 'get_current_mana'):
-                mana = self.bot_manager.modules['auto_mana'].get_current_mana()
-                self.mana_mana.config(text=f"Mana: {mana:.0f}%")
-                
-        except Exception:
-            pass
+        if snapshot.health is not None:
+            self._set_label(self.heal_health, text=f"Vida: {snapshot.health:.0f}%")
+        if snapshot.mana is not None:
+            self._set_label(self.mana_mana, text=f"Mana: {snapshot.mana:.0f}%")
     
-    def _update_cavebot_info(self):
+    def _update_cavebot_info(self, snapshot):
         """Atualiza informações do cavebot"""
+        self._set_label(self.cavebot_waypoint,
+                        text=f"Waypoint: {snapshot.cavebot_waypoint}/{snapshot.cavebot_total_waypoints}")
+    
+    def _update_performance_info(self, metrics):
+        """Atualiza informações de performance"""
+        self._set_label(self.fps_label, text=f"{metrics.fps:.1f}")
+        self._set_label(self.fps_spark, text=sparkline(metrics.fps_history))
+        self._set_label(self.cycle_time_label,
+                        text=f"{metrics.cycle_time_ms:.0f}ms (p95 {metrics.cycle_time_p95_ms:.0f}ms)")
+        self._set_label(self.cycle_time_spark, text=sparkline(metrics.cycle_time_history))
+        
+        memory = f"{metrics.rss_mb:.0f} MB" if metrics.rss_mb is not None else "-- MB"
+        self._set_label(self.memory_label, text=memory)
+        self._set_label(self.memory_spark, text=sparkline(metrics.rss_history))
+        
+        cpu = f"{metrics.cpu_percent:.0f}%" if metrics.cpu_percent is not None else "--%"
+        self._set_label(self.cpu_label, text=cpu)
+        self._set_label(self.cpu_spark, text=sparkline(metrics.cpu_history))
+    
+    def add_log_entry(self, message: str, level: str = "INFO"):
+        """Adiciona entrada ao log"""
         try:
-            if hasattr(self.bot_manager.modules['cavebot'], 'get_status'):
-                cavebot_status = self.bot_manager.modules['cavebot'].get_status()
-                current_wp = cavebot_status.get('current_waypoint', 0)
-                total_wp = cavebot_status.get('total_waypoints', 0)
-                self.cavebot_waypoint.config(text=f"Waypoint: {current_wp}/{total_wp}")
-                
+            timestamp = time.strftime("%H:%M:%S")
+            levelno = logging.getLevelName(level)
+            if not isinstance(levelno, int):
+                levelno = logging.INFO
+            self._append_log_entries([(levelno, level, f"[{timestamp}] {level}: {message}")])
         except Exception:
             pass
     
-    def _update_performance_info(self):
-        """Atualiza informações de performance"""
+    def start_log_flush(self):
+        """Agenda descarga periódica do buffer de log para o widget"""
+        self._log_job = self.frame.after(self.log_flush_interval_ms, self._flush_log)
+    
+    def _flush_log(self):
+        """Insere no widget, em lote, as entradas novas do buffer"""
         try:
-            # Estas informações seriam obtidas do sistema de monitoramento
-            # Por enquanto, valores simulados
-            self.fps_label.config(text="20.0")
-            self.cycle_time_label.config(text="50ms")
-            self.memory_label.config(text="45 MB")
-            self.cpu_label.config(text="15%")
-            
+            self._log_sequence, entries = self.log_handler.entries_since(self._log_sequence)
+            if entries:
+                self._append_log_entries(entries)
         except Exception:
             pass
+        finally:
+            self.start_log_flush()
     
-    def add_log_entry(self, message: str, level: str = "INFO"):
-        """Adiciona entrada ao log"""
-        try:
-            timestamp = time.strftime("%H:%M:%S")
-            log_entry = f"[{timestamp}] {level}: {message}\n"
-            
-            # Adicionar ao texto
-            self.log_text.insert(tk.END, log_entry)
-            
-            # Scroll para o final
+    def _append_log_entries(self, entries: List[LogEntry]):
+        """Acrescenta entradas e descarta as mais antigas do nível além do limite"""
+        # Só acompanhar o final se o usuário não rolou para cima
+        follow = self.log_text.yview()[1] >= 1.0
+        
+        for _, levelname, line in entries:
+            self.log_text.insert(tk.END, line + "\n", levelname)
+            lines = line.count("\n") + 1
+            self._log_entry_lines.setdefault(levelname, deque()).append(lines)
+            self._log_line_count[levelname] = self._log_line_count.get(levelname, 0) + lines
+        
+        for levelname, count in self._log_line_count.items():
+            if count > self.max_log_lines:
+                self._log_line_count[levelname] = self._trim_log_level(levelname, count)
+        
+        if follow:
             self.log_text.see(tk.END)
-            
-            # Limitar número de linhas (manter últimas 100)
-            lines = self.log_text.get(1.0, tk.END).split('\n')
-            if len(lines) > 100:
-                self.log_text.delete(1.0, f"{len(lines)-100}.0")
-                
-        except Exception:
-            pass
\ No newline at end of file
+    
+    def _trim_log_level(self, levelname: str, count: int) -> int:
+        """Remove as entradas mais antigas do nível até caber no limite"""
+        entry_lines = self._log_entry_lines[levelname]
+        while count > self.max_log_lines and entry_lines:
+            # Entradas vizinhas do mesmo nível formam uma faixa só da tag;
+            # o início da faixa é sempre o início da entrada mais antiga
+            tag_range = self.log_text.tag_nextrange(levelname, "1.0")
+            if not tag_range:
+                entry_lines.clear()
+                return 0
+            lines = entry_lines.popleft()
+            self.log_text.delete(tag_range[0], f"{tag_range[0]} + {lines} lines")
+            count -= lines
+        return count
+    
+    def _apply_log_filter(self):
+        """Oculta níveis abaixo do selecionado (elide nas tags)"""
+        minimum = LOG_LEVELS.index(self.log_level_var.get())
+        for index, levelname in enumerate(LOG_LEVELS):
+            self.log_text.tag_configure(levelname, elide=index < minimum)
+    
+    def close(self):
+        """Remove handler de log e cancela descarga agendada"""
+        if self._log_job is not None:
+            self.frame.after_cancel(self._log_job)
+            self._log_job = None
+        remove_pipeline_handler(self.log_handler)
@@ -9,6 +9,9 @@ Funcionalidades:
 - Auto-Food (Auto Comida)
 - Auto-Loot (Coleta Automática)
 - Cavebot (Caça Automática)
+
+Use --startup-timing para imprimir o tempo de cada fase da inicialização
+e --profile <nome> para usar config/profiles/<nome>.json.
 """
 
 import sys
@@ -23,9 +26,21 @@ from pathlib import Path
 project_dir = Path(__file__).parent
 sys.path.append(str(project_dir))
 
+from utils.startup import profiler
+profiler.enabled = '--startup-timing' in sys.argv
+
 from gui.main_window import TibiaBotGUI
 from core.bot_manager import BotManager
 from utils.logger import setup_logger
+profiler.mark("imports")
+
+def _profile_from_args() -> str:
+    """Perfil de configuração passado com --profile <nome>"""
+    if '--profile' in sys.argv:
+        index = sys.argv.index('--profile')
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return None
 
 def main():
     """Função principal do bot"""
@@ -33,6 +48,7 @@ def main():
         # Configurar logging
         logger = setup_logger()
         logger.info("Iniciando Tibia Bot...")
+        profiler.mark("logging")
         
         # Verificar se está executando no Windows (recomendado)
         if os.name != 'nt':
@@ -43,6 +59,7 @@ def main():
         root.title("Tibia Bot - Automação Avançada")
         root.geometry("800x600")
         root.resizable(True, True)
+        profiler.mark("tk")
         
         # Definir ícone da aplicação (se existir)
         try:
@@ -53,10 +70,21 @@ def main():
             logger.warning(f"Não foi possível carregar o ícone: {e}")
         
         # Inicializar gerenciador do bot
-        bot_manager = BotManager()
+        bot_manager = BotManager(profile=_profile_from_args())
+        profiler.mark("bot_manager")
         
         # Criar interface gráfica
         app = TibiaBotGUI(root, bot_manager)
+        profiler.mark("gui")
+        
+        # Relatório de inicialização após a primeira renderização da janela
+        def report_startup():
+            profiler.mark("first_draw")
+            logger.info(f"Interface pronta em {profiler.elapsed() * 1000:.0f}ms")
+            if profiler.enabled:
+                print(profiler.report())
+        
+        root.after_idle(report_startup)
         
         # Configurar fechamento da aplicação
         def on_closing():
@@ -8,6 +8,8 @@ import numpy as np
 import time
 from typing import Optional, List
 from modules.base_module import BaseModule
+from modules.item_recognition import ItemRecognizer, SlotGrid, inventory_grid, INVENTORY_ORIGIN
+from utils.event_log import get_event_log
 
 class AutoFood(BaseModule):
     """Módulo de alimentação automática"""
@@ -20,7 +22,7 @@ class AutoFood(BaseModule):
             'food_hotkey': 'F7',     # Tecla da comida
             'check_interval': 5.0,   # Verificar fome a cada 5 segundos
             'use_right_click': True, # Usar clique direito na comida
-            'food_inventory_slot': 1, # Slot da comida no inventário (1-20)
+            'food_inventory_slot': 1, # Slot da comida no inventário (1-20), se não reconhecida
         }
         
         # Estados internos
@@ -28,6 +30,12 @@ class AutoFood(BaseModule):
         self.food_cooldown = 5.0  # Cooldown mínimo entre uso de comida
         self.last_hunger_check = 0
         
+        # Reconhecimento da comida no inventário
+        self.inventory_start_x, self.inventory_start_y = INVENTORY_ORIGIN
+        self.item_recognizer = ItemRecognizer()
+        self.food_items = ['meat', 'ham', 'fish', 'bread', 'roll', 'apple', 'banana',
+                           'cheese', 'carrot', 'brown mushroom', 'dragon ham']
+        
         # Templates para detecção de fome
         self.hunger_indicators = [
             'hungry.png',    # Ícone de fome
@@ -44,10 +52,11 @@ class AutoFood(BaseModule):
             is_hungry = self._check_hunger_status(screen_image)
             
             if is_hungry and self._can_eat():
-                success = self._consume_food()
+                success = self._consume_food(screen_image)
                 if success:
                     self.mark_execution()
                     self.last_food_time = time.time()
+                    get_event_log().action(self.name, 'eat')
                     self.logger.info("Comida consumida")
                 return success
             
@@ -142,12 +151,12 @@ class AutoFood(BaseModule):
         current_time = time.time()
         return (current_time - self.last_food_time) >= self.food_cooldown
     
-    def _consume_food(self) -> bool:
+    def _consume_food(self, screen_image: Optional[np.ndarray] = None) -> bool:
         """Consome comida usando método configurado"""
         try:
             if self.config['use_right_click']:
                 # Método 1: Clique direito no slot da comida no inventário
-                return self._right_click_food()
+                return self._right_click_food(screen_image)
             else:
                 # Método 2: Usar hotkey
                 return self._use_food_hotkey()
@@ -156,11 +165,12 @@ class AutoFood(BaseModule):
             self.logger.error(f"Erro ao consumir comida: {e}")
             return False
     
-    def _right_click_food(self) -> bool:
+    def _right_click_food(self, screen_image: Optional[np.ndarray] = None) -> bool:
         """Clica com botão direito na comida no inventário"""
         try:
-            # Calcular posição do slot da comida no inventário
-            slot_position = self._get_inventory_slot_position(self.config['food_inventory_slot'])
+            # Slot com comida reconhecida ou, sem reconhecimento, o slot configurado
+            slot = self._find_food_slot(screen_image) if screen_image is not None else None
+            slot_position = self._get_inventory_slot_position(slot or self.config['food_inventory_slot'])
             if slot_position is None:
                 self.logger.error("Posição do slot de comida não configurada")
                 return False
@@ -197,34 +207,29 @@ class AutoFood(BaseModule):
     def _get_inventory_slot_position(self, slot_number: int) -> Optional[tuple]:
         """
         Calcula posição de um slot do inventário
-        Slots numerados de 1-20 (4 colunas x 5 linhas)
+        Slots numerados a partir de 1 (4 colunas x 5 linhas sem ROI 'inventory')
         """
         try:
-            if not (1 <= slot_number <= 20):
-                return None
-            
-            # Configurações do inventário (devem ser ajustadas conforme resolução)
-            inventory_start_x = 600  # X inicial do inventário
-            inventory_start_y = 300  # Y inicial do inventário
-            slot_width = 32          # Largura de cada slot
-            slot_height = 32         # Altura de cada slot
-            slot_spacing_x = 2       # Espaçamento horizontal
-            slot_spacing_y = 2       # Espaçamento vertical
-            
-            # Calcular linha e coluna (0-indexado)
-            row = (slot_number - 1) // 4
-            col = (slot_number - 1) % 4
-            
-            # Calcular posição central do slot
-            x = inventory_start_x + col * (slot_width + slot_spacing_x) + slot_width // 2
-            y = inventory_start_y + row * (slot_height + slot_spacing_y) + slot_height // 2
-            
-            return (x, y)
-            
+            return self._inventory_grid().slot_center(slot_number)
         except Exception as e:
             self.logger.error(f"Erro ao calcular posição do slot: {e}")
             return None
     
+    def _inventory_grid(self) -> SlotGrid:
+        """Grade do inventário (ROI 'inventory' ou posição configurada)"""
+        return inventory_grid(self.screen_capture.rois, (self.inventory_start_x, self.inventory_start_y))
+    
+    def _find_food_slot(self, screen_image: np.ndarray) -> Optional[int]:
+        """Primeiro slot do inventário com comida reconhecida"""
+        try:
+            items = self.item_recognizer.identify(screen_image, self._inventory_grid())
+            for slot, item in enumerate(items, start=1):
+                if item in self.food_items:
+                    return slot
+        except Exception as e:
+            self.logger.error(f"Erro ao procurar comida no inventário: {e}")
+        return None
+    
     def setup_food_status_roi(self, x: int, y: int, width: int, height: int):
         """Configura ROI da área de status de comida"""
         self.screen_capture.set_roi('food_status', x, y, width, height)
@@ -6,8 +6,10 @@ Monitora a barra de vida e usa poções/magias de cura
 import cv2
 import numpy as np
 import time
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Dict, Any
 from modules.base_module import BaseModule
+from utils.event_log import get_event_log
+from modules.rule_engine import ThresholdRule, ThresholdRuleEngine, rule_from_dict, build_legacy_rules
 
 class AutoHeal(BaseModule):
     """Módulo de autocura automática"""
@@ -24,6 +26,7 @@ class AutoHeal(BaseModule):
             'spell_hotkey': 'F5',    # Tecla da magia
             'emergency_threshold': 30,  # Percentual crítico
             'emergency_hotkey': 'F2',   # Tecla de emergência
+            'rules': [],                # Regras explícitas (substituem as chaves acima)
         }
         
         # Estados internos
@@ -36,6 +39,13 @@ class AutoHeal(BaseModule):
         self.health_bar_template = None
         self.last_health_percentage = 100
         
+        # Tabela de decisão compilada a partir das regras
+        self.rule_engine = ThresholdRuleEngine()
+        self._compile_rules()
+        
+        # Momento em que o valor entrou na faixa de alguma regra (latência da ação)
+        self._action_needed_since: Optional[float] = None
+        
     def process(self, screen_image: np.ndarray) -> bool:
         """Processa verificação de vida e executa cura se necessário"""
         if not self.can_execute():
@@ -48,25 +58,26 @@ class AutoHeal(BaseModule):
                 return False
             
             self.last_health_percentage = health_percentage
-            
-            # Determinar se precisa de cura
-            needs_healing = False
-            is_emergency = False
-            
-            if health_percentage <= self.config['emergency_threshold']:
-                needs_healing = True
-                is_emergency = True
-            elif health_percentage <= self.config['health_threshold']:
-                needs_healing = True
-            
-            # Executar cura se necessário
-            if needs_healing and self._can_heal():
-                success = self._execute_heal(is_emergency)
+            self.rule_engine.state.update('health', health_percentage)
+            
+            # Marcar início da necessidade (para medir latência até a ação)
+            if not self.rule_engine.candidates(health_percentage):
+                self._action_needed_since = None
+            elif self._action_needed_since is None:
+                self._action_needed_since = time.time()
+            
+            # Consultar tabela de regras
+            rule = self.rule_engine.evaluate(health_percentage)
+            if rule is not None:
+                success = self._execute_rule(rule)
                 if success:
                     self.mark_execution()
                     self.last_heal_time = time.time()
-                    self.logger.info(f"Cura executada - Vida: {health_percentage}% "
-                                   f"({'EMERGÊNCIA' if is_emergency else 'Normal'})")
+                    self.rule_engine.mark_used(rule, self.last_heal_time)
+                    latency_ms = (self.last_heal_time - (self._action_needed_since or self.last_heal_time)) * 1000
+                    self._action_needed_since = None
+                    get_event_log().action(self.name, rule.name, health_percentage, latency_ms)
+                    self.logger.info(f"Cura executada - Vida: {health_percentage}% ({rule.name})")
                 return success
             
             return False
@@ -177,33 +188,31 @@ class AutoHeal(BaseModule):
             self.logger.error(f"Erro na análise da barra de vida: {e}")
             return None
     
-    def _can_heal(self) -> bool:
-        """Verifica se pode executar cura (cooldown)"""
-        current_time = time.time()
-        return (current_time - self.last_heal_time) >= self.heal_cooldown
+    def set_config(self, config: Dict[str, Any]):
+        """Define nova configuração e recompila as regras"""
+        super().set_config(config)
+        self._compile_rules()
     
-    def _execute_heal(self, is_emergency: bool = False) -> bool:
-        """Executa ação de cura"""
+    def _compile_rules(self):
+        """Compila regras da configuração (ou das chaves antigas)"""
         try:
-            if is_emergency:
-                # Usar cura de emergência
-                hotkey = self.config['emergency_hotkey']
-                self.logger.info("Executando cura de EMERGÊNCIA")
+            if self.config.get('rules'):
+                rules = [rule_from_dict(data) for data in self.config['rules']]
             else:
-                # Usar cura normal
-                if self.config['use_potions']:
-                    hotkey = self.config['potion_hotkey']
-                elif self.config['use_spells']:
-                    hotkey = self.config['spell_hotkey']
-                else:
-                    self.logger.warning("Nenhum método de cura configurado")
-                    return False
-            
-            # Pressionar tecla de cura
-            success = self.input_simulator.press_key(hotkey)
+                rules = build_legacy_rules(self.config, 'health_threshold',
+                                           self.heal_cooldown, 'heal')
+            self.rule_engine.compile(rules)
+            self.logger.debug(f"{len(self.rule_engine.rules)} regras de cura compiladas")
+        except Exception as e:
+            self.logger.error(f"Erro ao compilar regras de cura: {e}")
+    
+    def _execute_rule(self, rule: ThresholdRule) -> bool:
+        """Executa ação de cura da regra"""
+        try:
+            success = self.input_simulator.press_key(rule.hotkey, urgent=True)
             
             if success:
-                self.logger.debug(f"Tecla de cura pressionada: {hotkey}")
+                self.logger.debug(f"Tecla de cura pressionada: {rule.hotkey}")
             
             return success
             
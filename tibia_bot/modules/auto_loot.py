@@ -8,6 +8,12 @@ import numpy as np
 import time
 from typing import List, Dict, Optional, Tuple
 from modules.base_module import BaseModule
+from modules.spatial import cluster_points, within_radius, to_int_points
+from modules.corpse_tracker import CorpseTracker, TileKey
+from modules.item_recognition import ItemRecognizer, SlotGrid, inventory_grid
+from modules.loot_pipeline import LootLatency, LootMove, container_opened, plan_loot
+from modules.waits import Delay, InputDone, NextFrame, Task
+from utils.event_log import get_event_log
 import json
 import os
 
@@ -25,12 +31,16 @@ class AutoLoot(BaseModule):
             'use_optimized_loot': True,  # Usar lógica otimizada (coleta tudo, depois descarta)
             'auto_open_corpses': True,   # Abrir corpos automaticamente
             'pickup_all_items': False,   # Coletar todos os itens (ignora lista)
+            'corpse_ttl': 300.0,         # Segundos até esquecer um corpo não mais visto
+            'corpse_memory': 256,        # Máximo de corpos lembrados
+            'container_timeout': 0.6,    # Espera máxima pela janela do corpo (s)
         }
         
         # Estados internos
         self.last_loot_time = 0
         self.loot_cooldown = 0.5
-        self.corpses_processed = set()  # Cache de corpos já processados
+        self.corpse_tracker = CorpseTracker(ttl=self.config['corpse_ttl'],
+                                            capacity=self.config['corpse_memory'])
         
         # Lista de itens valiosos (configurável)
         self.valuable_items = self._load_valuable_items()
@@ -38,6 +48,11 @@ class AutoLoot(BaseModule):
         # Lista de itens descartáveis (para modo otimizado)
         self.trash_items = self._load_trash_items()
         
+        # Reconhecimento de itens nos slots (hash perceptual dos sprites)
+        self.item_recognizer = ItemRecognizer()
+        self.loot_latency = LootLatency()
+        self._container_warned = False
+        
         # Templates para detecção
         self.corpse_templates = [
             'dead_monster.png',
@@ -45,6 +60,16 @@ class AutoLoot(BaseModule):
             'bones.png'
         ]
         
+    def set_config(self, config: Dict):
+        """Define nova configuração e ajusta a memória de corpos"""
+        super().set_config(config)
+        self.corpse_tracker.ttl = self.config['corpse_ttl']
+        self.corpse_tracker.capacity = self.config['corpse_memory']
+    
+    def observe(self, screen_image: np.ndarray):
+        """Acompanha a câmera todo frame, inclusive durante a coleta em andamento"""
+        self._update_camera(screen_image)
+    
     def process(self, screen_image: np.ndarray) -> bool:
         """Processa detecção e coleta de loot"""
         if not self.can_execute():
@@ -55,23 +80,8 @@ class AutoLoot(BaseModule):
             loot_positions = self._detect_loot_opportunities(screen_image)
             
             if loot_positions and self._can_loot():
-                # Processar cada posição de loot
-                items_looted = 0
-                for position in loot_positions[:3]:  # Limitar a 3 por ciclo
-                    if self._process_loot_position(position, screen_image):
-                        items_looted += 1
-                        time.sleep(self.config['loot_delay'])
-                
-                if items_looted > 0:
-                    self.mark_execution()
-                    self.last_loot_time = time.time()
-                    self.logger.info(f"Coletados {items_looted} grupos de itens")
-                    
-                    # Se usando modo otimizado, executar limpeza
-                    if self.config['use_optimized_loot']:
-                        self._optimize_inventory()
-                    
-                    return True
+                # Coleta em etapas: o loop segue rodando (cura etc.) enquanto a interface responde
+                return self.start_task(self._loot_task(loot_positions[:3]))  # Limitar a 3 por ciclo
             
             return False
             
@@ -79,6 +89,27 @@ class AutoLoot(BaseModule):
             self.logger.error(f"Erro no módulo auto_loot: {e}")
             return False
     
+    def _loot_task(self, loot_positions: List[Tuple[int, int]]) -> Task:
+        """Coleta das posições detectadas, cedendo o loop a cada espera"""
+        # SQMs pela câmera do frame da detecção (o jogador pode andar até o corpo)
+        tiles = [self.corpse_tracker.key(x, y) for x, y in loot_positions]
+        
+        items_looted = 0
+        for position, tile in zip(loot_positions, tiles):
+            if (yield from self._process_loot_position(position, tile)):
+                items_looted += 1
+                yield Delay(self.config['loot_delay'])
+        
+        if items_looted > 0:
+            self.mark_execution()
+            self.last_loot_time = time.time()
+            get_event_log().action(self.name, 'loot', items_looted)
+            self.logger.info(f"Coletados {items_looted} grupos de itens")
+            
+            # Sem container visível o lixo não foi descartado junto com a coleta
+            if self.config['use_optimized_loot'] and self._container_grid() is None:
+                yield from self._optimize_inventory()
+    
     def _detect_loot_opportunities(self, screen_image: np.ndarray) -> List[Tuple[int, int]]:
         """Detecta oportunidades de loot na tela"""
         try:
@@ -121,16 +152,13 @@ class AutoLoot(BaseModule):
                 if result is not None:
                     x, y, confidence = result
                     
-                    # Verificar se já processamos este corpo
-                    corpse_id = f"{template_name}_{x}_{y}"
-                    if corpse_id not in self.corpses_processed:
-                        corpse_positions.append((x, y))
-                        self.corpses_processed.add(corpse_id)
-                        self.logger.debug(f"Corpo detectado: {template_name} em ({x}, {y})")
-            
-            # Limpar cache de corpos antigos
-            if len(self.corpses_processed) > 50:
-                self.corpses_processed.clear()
+                    # Corpo já aberto: só renova a validade (marcado ao abrir, depois do filtro de raio)
+                    if self.corpse_tracker.contains(x, y):
+                        self.corpse_tracker.mark(x, y)
+                        continue
+                    
+                    corpse_positions.append((x, y))
+                    self.logger.debug(f"Corpo detectado: {template_name} em ({x}, {y})")
             
             return corpse_positions
             
@@ -198,36 +226,35 @@ class AutoLoot(BaseModule):
             return []
     
     def _filter_nearby_positions(self, positions: List[Tuple[int, int]], min_distance: int) -> List[Tuple[int, int]]:
-        """Remove posições muito próximas umas das outras"""
+        """Agrupa posições muito próximas umas das outras (centróide de cada grupo)"""
         if not positions:
             return []
         
-        filtered = [positions[0]]
-        
-        for pos in positions[1:]:
-            too_close = False
-            for filtered_pos in filtered:
-                distance = np.sqrt((pos[0] - filtered_pos[0])**2 + (pos[1] - filtered_pos[1])**2)
-                if distance < min_distance:
-                    too_close = True
-                    break
-            
-            if not too_close:
-                filtered.append(pos)
-        
-        return filtered
+        centroids, _ = cluster_points(positions, min_distance)
+        return to_int_points(centroids)
     
     def _filter_by_radius(self, positions: List[Tuple[int, int]], 
                          player_pos: Tuple[int, int], max_radius: int) -> List[Tuple[int, int]]:
         """Filtra posições que estão dentro do raio de coleta"""
-        filtered = []
-        
-        for pos in positions:
-            distance = np.sqrt((pos[0] - player_pos[0])**2 + (pos[1] - player_pos[1])**2)
-            if distance <= max_radius:
-                filtered.append(pos)
+        if not positions:
+            return []
         
-        return filtered
+        mask = within_radius(positions, player_pos, max_radius)
+        return [pos for pos, inside in zip(positions, mask) if inside]
+    
+    def _update_camera(self, screen_image: np.ndarray):
+        """Atualiza deslocamento da câmera a partir da área de jogo"""
+        try:
+            roi = self.screen_capture.rois.get('game_area')
+            if roi:
+                game_area = screen_image[roi['y']:roi['y'] + roi['height'],
+                                         roi['x']:roi['x'] + roi['width']]
+            else:
+                game_area = screen_image
+            if game_area.size:
+                self.corpse_tracker.update_camera(game_area)
+        except Exception as e:
+            self.logger.error(f"Erro ao estimar movimento da câmera: {e}")
     
     def _get_player_position(self, screen_image: np.ndarray) -> Optional[Tuple[int, int]]:
         """Estima posição do jogador na tela (geralmente centro da tela)"""
@@ -238,127 +265,138 @@ class AutoLoot(BaseModule):
         except:
             return None
     
-    def _process_loot_position(self, position: Tuple[int, int], screen_image: np.ndarray) -> bool:
-        """Processa uma posição de loot específica"""
-        try:
-            x, y = position
-            
-            # Se configurado para coletar tudo, simplesmente clicar
-            if self.config['pickup_all_items'] or self.config['use_optimized_loot']:
-                return self._click_and_loot(x, y)
-            else:
-                # Analisar itens específicos na posição
-                return self._selective_loot(x, y, screen_image)
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao processar posição de loot: {e}")
+    def _process_loot_position(self, position: Tuple[int, int], tile: TileKey) -> Task:
+        """Processa uma posição de loot específica (retorna se coletou)"""
+        x, y = position
+        
+        # Com a ROI do container: abrir, reconhecer e coletar em lote
+        if self._container_grid() is not None:
+            return (yield from self._loot_corpse(x, y, tile))
+        
+        if not (self.config['pickup_all_items'] or self.config['use_optimized_loot']):
+            if not self._container_warned:
+                self.logger.warning("ROI loot_container não configurada, coletando tudo")
+                self._container_warned = True
+        return (yield from self._click_and_loot(x, y, tile))
+    
+    def _loot_corpse(self, x: int, y: int, tile: TileKey) -> Task:
+        """
+        Abre o corpo, aguarda a janela do container e executa todos os movimentos
+        planejados a partir de um único frame (coleta + descarte do lixo)
+        """
+        started = time.perf_counter()
+        container = self._container_grid()
+        inventory = self._inventory_grid()
+        
+        if not self.input_simulator.click(x, y, button='right', humanize=True):
+            return False
+        
+        # Referência da espera é o frame anterior ao clique (clique executado pela thread de input)
+        frame = yield container_opened(container, timeout=self.config['container_timeout'])
+        if frame is None:
+            self.logger.debug(f"Container não abriu em ({x}, {y})")
             return False
+        self.corpse_tracker.mark_tile(tile)
+        
+        container_items, container_empty = self.item_recognizer.scan(frame, container)
+        inventory_items, inventory_empty = self.item_recognizer.scan(frame, inventory)
+        take_unlisted = self.config['pickup_all_items'] or self.config['use_optimized_loot']
+        moves = plan_loot(container, container_items, container_empty,
+                          inventory, inventory_items, inventory_empty,
+                          self.valuable_items, self.trash_items, take_unlisted)
+        
+        taken = yield from self._execute_moves(moves)
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.loot_latency.add(latency_ms)
+        get_event_log().action(self.name, 'loot_corpse', taken, latency_ms)
+        self.logger.debug(f"Corpo em ({x}, {y}): {taken} itens, "
+                          f"{len(moves) - taken} movimentos de descarte, {latency_ms:.0f}ms")
+        return taken > 0
+    
+    def _execute_moves(self, moves: List[LootMove]) -> Task:
+        """Enfileira todos os arrastos planejados de uma vez; retorna quantos itens foram coletados"""
+        if not moves:
+            return 0
+        
+        submitted = []
+        for move in moves:
+            duration = 0.3 if move.discard else 0.2
+            future = self.input_simulator.drag(move.source[0], move.source[1],
+                                               move.target[0], move.target[1], duration=duration)
+            submitted.append((move, future, duration))
+        
+        # Lote executado em sequência pela thread de input; o loop segue enquanto isso
+        yield InputDone(submitted[-1][1], timeout=sum(d for _, _, d in submitted) + 1.0)
+        
+        taken = 0
+        for move, future, _ in submitted:
+            if not future:
+                self.logger.debug(f"Falha ao mover {move.item or 'item'} de {move.source}")
+            elif not move.discard:
+                taken += 1
+        return taken
     
-    def _click_and_loot(self, x: int, y: int) -> bool:
+    def _click_and_loot(self, x: int, y: int, tile: TileKey) -> Task:
         """Clica na posição e tenta coletar tudo"""
-        try:
-            # Clique direito para abrir corpo ou item
-            success = self.input_simulator.click(x, y, button='right', humanize=True)
-            
-            if success:
-                time.sleep(0.1)  # Pequena pausa para interface carregar
-                
-                # Se modo otimizado, coletar tudo com Ctrl+A ou cliques múltiplos
-                if self.config['use_optimized_loot']:
-                    return self._loot_all_items()
-                
-                self.logger.debug(f"Loot executado em ({x}, {y})")
-            
-            return success
-            
-        except Exception as e:
-            self.logger.error(f"Erro no clique de loot: {e}")
-            return False
+        # Clique direito para abrir corpo ou item
+        success = self.input_simulator.click(x, y, button='right', humanize=True)
+        
+        if success:
+            # Sem ROI do container não há o que observar: clique concluído e pausa
+            # curta, sem bloquear o loop
+            yield InputDone(success)
+            if not success:
+                return False
+            self.corpse_tracker.mark_tile(tile)
+            yield Delay(0.1)
+            
+            # Se modo otimizado, coletar tudo com Ctrl+A ou cliques múltiplos
+            if self.config['use_optimized_loot']:
+                return self._loot_all_items()
+            
+            self.logger.debug(f"Loot executado em ({x}, {y})")
+        
+        return bool(success)
     
     def _loot_all_items(self) -> bool:
         """Coleta todos os itens disponíveis"""
         try:
             # Método 1: Tentar Ctrl+A para selecionar tudo
-            self.input_simulator.press_key('ctrl+a')
-            time.sleep(0.1)
-            
             # Método 2: Cliques múltiplos nas posições típicas de itens
             # (Implementar se Ctrl+A não funcionar)
-            
-            return True
+            return bool(self.input_simulator.press_key('ctrl+a'))
             
         except Exception as e:
             self.logger.error(f"Erro ao coletar todos os itens: {e}")
             return False
     
-    def _selective_loot(self, x: int, y: int, screen_image: np.ndarray) -> bool:
-        """Coleta apenas itens específicos da lista de valiosos"""
-        try:
-            # Esta implementação seria mais complexa, envolvendo
-            # análise detalhada dos itens disponíveis
-            # Por simplicidade, usar método de coleta geral
-            return self._click_and_loot(x, y)
-            
-        except Exception as e:
-            self.logger.error(f"Erro no loot seletivo: {e}")
-            return False
-    
-    def _optimize_inventory(self):
+    def _optimize_inventory(self) -> Task:
         """Remove itens indesejados do inventário (modo otimizado)"""
-        try:
-            # Percorrer slots do inventário e descartar itens de lixo
-            for slot in range(1, 21):  # 20 slots do inventário
-                if self._is_trash_item_in_slot(slot):
-                    self._discard_item_from_slot(slot)
-                    time.sleep(0.1)
-            
-        except Exception as e:
-            self.logger.error(f"Erro na otimização do inventário: {e}")
-    
-    def _is_trash_item_in_slot(self, slot: int) -> bool:
-        """Verifica se há item descartável no slot"""
-        # Esta seria uma implementação complexa de reconhecimento de itens
-        # Por enquanto, implementação simplificada
-        return False
-    
-    def _discard_item_from_slot(self, slot: int):
-        """Descarta item de um slot específico"""
-        try:
-            # Calcular posição do slot
-            slot_pos = self._get_inventory_slot_position(slot)
-            if slot_pos:
-                x, y = slot_pos
-                # Arrastar item para fora do inventário
-                self.input_simulator.drag(x, y, x + 100, y + 100, duration=0.3)
-        except Exception as e:
-            self.logger.error(f"Erro ao descartar item do slot {slot}: {e}")
+        # Reconhecer o inventário inteiro no próximo frame e descartar o lixo em lote
+        frame = yield NextFrame()
+        inventory = self._inventory_grid()
+        items, empty = self.item_recognizer.scan(frame, inventory)
+        moves = plan_loot(None, [], [], inventory, items, empty,
+                          self.valuable_items, self.trash_items, take_unlisted=False)
+        yield from self._execute_moves(moves)
     
     def _get_inventory_slot_position(self, slot_number: int) -> Optional[Tuple[int, int]]:
-        """Calcula posição de um slot do inventário (reutilizado do auto_food)"""
+        """Calcula posição de um slot do inventário"""
         try:
-            if not (1 <= slot_number <= 20):
-                return None
-            
-            # Configurações do inventário
-            inventory_start_x = 600
-            inventory_start_y = 300
-            slot_width = 32
-            slot_height = 32
-            slot_spacing_x = 2
-            slot_spacing_y = 2
-            
-            row = (slot_number - 1) // 4
-            col = (slot_number - 1) % 4
-            
-            x = inventory_start_x + col * (slot_width + slot_spacing_x) + slot_width // 2
-            y = inventory_start_y + row * (slot_height + slot_spacing_y) + slot_height // 2
-            
-            return (x, y)
-            
+            return self._inventory_grid().slot_center(slot_number)
         except Exception as e:
             self.logger.error(f"Erro ao calcular posição do slot: {e}")
             return None
     
+    def _inventory_grid(self) -> SlotGrid:
+        """Grade do inventário (ROI 'inventory' ou posição padrão)"""
+        return inventory_grid(self.screen_capture.rois)
+    
+    def _container_grid(self) -> Optional[SlotGrid]:
+        """Grade do container aberto (ROI 'loot_container')"""
+        roi = self.screen_capture.rois.get('loot_container')
+        return SlotGrid.from_roi(roi) if roi else None
+    
     def _can_loot(self) -> bool:
         """Verifica se pode executar loot (cooldown)"""
         current_time = time.time()
@@ -411,6 +449,10 @@ class AutoLoot(BaseModule):
             self.valuable_items.remove(item_name)
             self.logger.info(f"Item removido da lista de valiosos: {item_name}")
     
+    def get_loot_stats(self) -> Dict[str, float]:
+        """Latência por corpo das últimas coletas em lote"""
+        return self.loot_latency.summary()
+    
     def setup_loot_area_roi(self, x: int, y: int, width: int, height: int):
         """Configura ROI da área principal do jogo para loot"""
         self.screen_capture.set_roi('game_area', x, y, width, height)
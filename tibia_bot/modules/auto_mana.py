@@ -6,8 +6,10 @@ Monitora a barra de mana e usa poções/magias para restaurar
 import cv2
 import numpy as np
 import time
-from typing import Optional
+from typing import Optional, Dict, Any
 from modules.base_module import BaseModule
+from utils.event_log import get_event_log
+from modules.rule_engine import ThresholdRule, ThresholdRuleEngine, rule_from_dict, build_legacy_rules
 
 class AutoMana(BaseModule):
     """Módulo de gerenciamento automático de mana"""
@@ -24,6 +26,7 @@ class AutoMana(BaseModule):
             'spell_hotkey': 'F6',    # Tecla da magia de mana
             'emergency_threshold': 20,  # Percentual crítico
             'emergency_hotkey': 'F4',   # Tecla de emergência
+            'rules': [],                # Regras explícitas (substituem as chaves acima)
         }
         
         # Estados internos
@@ -34,6 +37,13 @@ class AutoMana(BaseModule):
         
         self.last_mana_percentage = 100
         
+        # Tabela de decisão compilada a partir das regras
+        self.rule_engine = ThresholdRuleEngine()
+        self._compile_rules()
+        
+        # Momento em que o valor entrou na faixa de alguma regra (latência da ação)
+        self._action_needed_since: Optional[float] = None
+        
     def process(self, screen_image: np.ndarray) -> bool:
         """Processa verificação de mana e executa ação se necessário"""
         if not self.can_execute():
@@ -46,25 +56,26 @@ class AutoMana(BaseModule):
                 return False
             
             self.last_mana_percentage = mana_percentage
-            
-            # Determinar se precisa de mana
-            needs_mana = False
-            is_emergency = False
-            
-            if mana_percentage <= self.config['emergency_threshold']:
-                needs_mana = True
-                is_emergency = True
-            elif mana_percentage <= self.config['mana_threshold']:
-                needs_mana = True
-            
-            # Executar ação de mana se necessário
-            if needs_mana and self._can_use_mana():
-                success = self._execute_mana_action(is_emergency)
+            self.rule_engine.state.update('mana', mana_percentage)
+            
+            # Marcar início da necessidade (para medir latência até a ação)
+            if not self.rule_engine.candidates(mana_percentage):
+                self._action_needed_since = None
+            elif self._action_needed_since is None:
+                self._action_needed_since = time.time()
+            
+            # Consultar tabela de regras
+            rule = self.rule_engine.evaluate(mana_percentage)
+            if rule is not None:
+                success = self._execute_rule(rule)
                 if success:
                     self.mark_execution()
                     self.last_mana_time = time.time()
-                    self.logger.info(f"Ação de mana executada - Mana: {mana_percentage}% "
-                                   f"({'EMERGÊNCIA' if is_emergency else 'Normal'})")
+                    self.rule_engine.mark_used(rule, self.last_mana_time)
+                    latency_ms = (self.last_mana_time - (self._action_needed_since or self.last_mana_time)) * 1000
+                    self._action_needed_since = None
+                    get_event_log().action(self.name, rule.name, mana_percentage, latency_ms)
+                    self.logger.info(f"Ação de mana executada - Mana: {mana_percentage}% ({rule.name})")
                 return success
             
             return False
@@ -168,33 +179,31 @@ class AutoMana(BaseModule):
             self.logger.error(f"Erro na análise da barra de mana: {e}")
             return None
     
-    def _can_use_mana(self) -> bool:
-        """Verifica se pode executar ação de mana (cooldown)"""
-        current_time = time.time()
-        return (current_time - self.last_mana_time) >= self.mana_cooldown
+    def set_config(self, config: Dict[str, Any]):
+        """Define nova configuração e recompila as regras"""
+        super().set_config(config)
+        self._compile_rules()
     
-    def _execute_mana_action(self, is_emergency: bool = False) -> bool:
-        """Executa ação de restauração de mana"""
+    def _compile_rules(self):
+        """Compila regras da configuração (ou das chaves antigas)"""
         try:
-            if is_emergency:
-                # Usar restauração de emergência
-                hotkey = self.config['emergency_hotkey']
-                self.logger.info("Executando restauração de mana de EMERGÊNCIA")
+            if self.config.get('rules'):
+                rules = [rule_from_dict(data) for data in self.config['rules']]
             else:
-                # Usar restauração normal
-                if self.config['use_potions']:
-                    hotkey = self.config['potion_hotkey']
-                elif self.config['use_spells']:
-                    hotkey = self.config['spell_hotkey']
-                else:
-                    self.logger.warning("Nenhum método de restauração de mana configurado")
-                    return False
-            
-            # Pressionar tecla de mana
-            success = self.input_simulator.press_key(hotkey)
+                rules = build_legacy_rules(self.config, 'mana_threshold',
+                                           self.mana_cooldown, 'mana')
+            self.rule_engine.compile(rules)
+            self.logger.debug(f"{len(self.rule_engine.rules)} regras de mana compiladas")
+        except Exception as e:
+            self.logger.error(f"Erro ao compilar regras de mana: {e}")
+    
+    def _execute_rule(self, rule: ThresholdRule) -> bool:
+        """Executa ação de restauração de mana da regra"""
+        try:
+            success = self.input_simulator.press_key(rule.hotkey, urgent=True)
             
             if success:
-                self.logger.debug(f"Tecla de mana pressionada: {hotkey}")
+                self.logger.debug(f"Tecla de mana pressionada: {rule.hotkey}")
             
             return success
             
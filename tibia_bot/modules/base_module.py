@@ -3,10 +3,12 @@ Base Module - Classe base para todos os módulos do bot
 """
 
 import logging
+import threading
 import time
 from typing import Dict, Any, Optional
 from abc import ABC, abstractmethod
 import numpy as np
+from modules.waits import Task, Wait
 
 class BaseModule(ABC):
     """Classe base para todos os módulos do bot"""
@@ -23,6 +25,10 @@ class BaseModule(ABC):
         self.last_execution = 0
         self.execution_interval = 0.5  # Intervalo mínimo entre execuções
         
+        # Tarefa em etapas (gerador de Waits)
+        self._task: Optional[Task] = None
+        self._task_lock = threading.Lock()
+        
         self.logger.info(f"Módulo {name} inicializado")
     
     @abstractmethod
@@ -33,6 +39,78 @@ class BaseModule(ABC):
         """
         pass
     
+    async def run(self, ctx):
+        """
+        Corrotina do módulo no runtime do bot: process() a cada frame (na frequência
+        do registro). Uma tarefa iniciada por process() segue logo depois, cada Wait
+        aguardado com ctx.condition() sem bloquear os demais módulos
+        """
+        try:
+            while True:
+                frame = await ctx.next_frame()
+                self.observe(frame)
+                if not ctx.due():
+                    continue
+                with ctx.timed():
+                    self.process(frame)
+                if self._task is not None:
+                    await self._run_task(ctx)
+        except BaseException:
+            # Corrotina encerrada (módulo desativado, bot parado): tarefa não é retomada
+            self.cancel_task()
+            raise
+    
+    def observe(self, screen_image: np.ndarray):
+        """Chamado com todo frame recebido, inclusive durante uma tarefa (padrão: nada)"""
+        pass
+    
+    def start_task(self, task: Task) -> bool:
+        """
+        Inicia uma tarefa em etapas: gerador que produz Waits e recebe o frame que
+        satisfez cada condição (None se expirou). Executada pela corrotina do módulo
+        logo após o process() que a iniciou
+        """
+        with self._task_lock:
+            if self._task is not None:
+                return False
+            self._task = task
+        return True
+    
+    def has_task(self) -> bool:
+        """Verifica se há tarefa em andamento"""
+        return self._task is not None
+    
+    def cancel_task(self):
+        """Interrompe a tarefa em andamento"""
+        with self._task_lock:
+            if self._task is not None:
+                self._task.close()
+            self._task = None
+    
+    async def _run_task(self, ctx):
+        """Executa a tarefa até o fim, aguardando cada condição produzida"""
+        value = None
+        while True:
+            with ctx.timed():
+                wait = self._resume_task(value)
+            if wait is None:
+                return
+            value = await ctx.condition(wait, on_frame=self.observe)
+    
+    def _resume_task(self, value: Optional[np.ndarray]) -> Optional[Wait]:
+        """Envia o resultado da espera; retorna a próxima condição (None ao terminar)"""
+        with self._task_lock:
+            if self._task is None:
+                return None  # Cancelada durante a espera
+            try:
+                return self._task.send(value)
+            except StopIteration:
+                pass
+            except Exception as e:
+                self.logger.error(f"Erro na tarefa do módulo {self.name}: {e}")
+            self._task = None
+            return None
+    
     def can_execute(self) -> bool:
         """Verifica se o módulo pode ser executado agora"""
         current_time = time.time()
@@ -0,0 +1,148 @@
+"""
+Battle List - Leitura da lista de criaturas do cliente
+Lê o painel de batalha linha a linha (altura fixa): nome por template de
+texto, percentual de vida pela barra e marcação de alvo atacado
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+BATTLE_TEMPLATES_DIR = "assets/templates/battle"
+UNKNOWN_CREATURE = "unknown"
+
+@dataclass(frozen=True)
+class BattleListLayout:
+    """Geometria de uma linha do painel (pixels, relativos à ROI)"""
+    row_height: int = 22
+    first_row_y: int = 0
+    name_x: int = 22            # Nome começa após o ícone da criatura
+    name_y: int = 1
+    name_height: int = 12
+    hp_bar_x: int = 22
+    hp_bar_y: int = 15
+    hp_bar_width: int = 132
+    hp_bar_height: int = 4
+    max_rows: int = 15
+
+@dataclass(frozen=True)
+class BattleEntry:
+    """Criatura listada no painel de batalha"""
+    row: int
+    name: str
+    hp_percent: float
+    attacked: bool                  # Moldura vermelha (alvo atual do jogador)
+    click_position: Tuple[int, int]  # Centro da linha na tela (clicar ataca a criatura)
+    confidence: float = 0.0         # Confiança do reconhecimento do nome
+
+class BattleListReader:
+    """Leitor do painel de batalha a partir da ROI 'battle_list'"""
+
+    def __init__(self, layout: Optional[BattleListLayout] = None,
+                 templates_dir: str = BATTLE_TEMPLATES_DIR, name_threshold: float = 0.75):
+        self.logger = logging.getLogger(__name__)
+        self.layout = layout or BattleListLayout()
+        self.templates_dir = templates_dir
+        self.name_threshold = name_threshold
+        self._name_templates: Optional[Dict[str, np.ndarray]] = None
+
+    def _load_name_templates(self) -> Dict[str, np.ndarray]:
+        """Templates de nome: <templates_dir>/<criatura>.png (tons de cinza)"""
+        if self._name_templates is None:
+            self._name_templates = {}
+            if os.path.isdir(self.templates_dir):
+                for filename in sorted(os.listdir(self.templates_dir)):
+                    name, ext = os.path.splitext(filename)
+                    if ext.lower() != '.png':
+                        continue
+                    template = cv2.imread(os.path.join(self.templates_dir, filename), cv2.IMREAD_GRAYSCALE)
+                    if template is not None:
+                        self._name_templates[name] = template
+            self.logger.debug(f"{len(self._name_templates)} templates de nome carregados")
+        return self._name_templates
+
+    def read(self, panel: np.ndarray, origin: Tuple[int, int] = (0, 0)) -> List[BattleEntry]:
+        """
+        Lê as criaturas do painel (imagem BGR da ROI)
+        `origin` é a posição da ROI na tela, usada para a posição de clique
+        """
+        layout = self.layout
+        height, width = panel.shape[:2]
+        gray = cv2.cvtColor(panel, cv2.COLOR_BGR2GRAY)
+        entries = []
+
+        for row in range(layout.max_rows):
+            top = layout.first_row_y + row * layout.row_height
+            if top + layout.row_height > height:
+                break
+
+            hp_percent = self._read_hp(panel, top)
+            if hp_percent is None:
+                break  # Linhas são contíguas: primeira vazia encerra a lista
+
+            name, confidence = self._read_name(gray, top)
+            entries.append(BattleEntry(
+                row=row,
+                name=name,
+                hp_percent=hp_percent,
+                attacked=self._is_attacked(panel, top),
+                click_position=(origin[0] + min(layout.name_x + 40, width - 1),
+                                origin[1] + top + layout.row_height // 2),
+                confidence=confidence
+            ))
+
+        return entries
+
+    def _read_hp(self, panel: np.ndarray, top: int) -> Optional[float]:
+        """Percentual de vida pela fração colorida da barra (None se não há barra)"""
+        layout = self.layout
+        y = top + layout.hp_bar_y + layout.hp_bar_height // 2
+        bar = panel[y, layout.hp_bar_x:layout.hp_bar_x + layout.hp_bar_width].astype(np.int16)
+        if bar.size == 0:
+            return None
+
+        # Barra colorida (verde, amarelo, vermelho) sobre fundo escuro/cinza
+        brightest = bar.max(axis=1)
+        colored = (brightest > 80) & (brightest - bar.min(axis=1) > 40)
+        if not colored.any():
+            # Sem parte colorida: criatura com vida zerada mantém a moldura escura da barra
+            return 0.0 if self._has_bar_frame(panel, top) else None
+
+        # Barra preenchida da esquerda até a última coluna colorida
+        filled = int(np.flatnonzero(colored)[-1]) + 1
+        return round(100.0 * filled / len(colored), 1)
+
+    def _has_bar_frame(self, panel: np.ndarray, top: int) -> bool:
+        """Verifica a moldura preta da barra de vida (linha ocupada)"""
+        layout = self.layout
+        frame = panel[top + layout.hp_bar_y - 1, layout.hp_bar_x:layout.hp_bar_x + layout.hp_bar_width]
+        return frame.size > 0 and bool((frame.max(axis=1) < 30).mean() > 0.9)
+
+    def _read_name(self, gray: np.ndarray, top: int) -> Tuple[str, float]:
+        """Nome da criatura pelo template de texto mais parecido"""
+        layout = self.layout
+        region = gray[top + layout.name_y:top + layout.name_y + layout.name_height, layout.name_x:]
+
+        best_name, best_score = UNKNOWN_CREATURE, 0.0
+        for name, template in self._load_name_templates().items():
+            th, tw = template.shape[:2]
+            if th > region.shape[0] or tw > region.shape[1]:
+                continue
+            result = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
+            score = float(result.max())
+            if score > best_score:
+                best_name, best_score = name, score
+
+        if best_score < self.name_threshold:
+            return UNKNOWN_CREATURE, best_score
+        return best_name, best_score
+
+    def _is_attacked(self, panel: np.ndarray, top: int) -> bool:
+        """Moldura vermelha ao redor do ícone indica o alvo atacado"""
+        column = panel[top:top + self.layout.row_height, 0].astype(np.int16)
+        red = (column[:, 2] > 180) & (column[:, 1] < 80) & (column[:, 0] < 80)
+        return bool(red.mean() > 0.5)
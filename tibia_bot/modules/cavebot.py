@@ -8,32 +8,18 @@ import numpy as np
 import time
 import json
 import os
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Callable
 from enum import Enum
-from dataclasses import dataclass
 from modules.base_module import BaseModule
-
-class WaypointType(Enum):
-    """Tipos de waypoint"""
-    WALK = "walk"
-    ATTACK = "attack"
-    USE_STAIRS = "stairs"
-    USE_HOLE = "hole"
-    USE_ROPE = "rope"
-    USE_SHOVEL = "shovel"
-    WAIT = "wait"
-    LABEL = "label"
-    GOTO_LABEL = "goto_label"
-
-@dataclass
-class Waypoint:
-    """Ponto de navegação"""
-    x: int
-    y: int
-    type: WaypointType
-    action: str = ""
-    delay: float = 0.0
-    condition: str = ""
+from modules.tile_map import TileMap, Position, DEFAULT_FLOOR
+from modules.cavebot_script import (Waypoint, WaypointType, CompiledScript, ScriptValidationError,
+                                    CONTROL_TYPES, compile_waypoints, load_compiled_script)
+from modules.pathfinding import PathPlanner
+from modules.minimap_locator import MinimapLocator
+from modules.spatial import cluster_points
+from modules.monster_tracker import MonsterTracker
+from modules.battle_list import BattleListReader, BattleEntry, UNKNOWN_CREATURE
+from utils.event_log import get_event_log
 
 class CavebotState(Enum):
     """Estados do cavebot"""
@@ -59,19 +45,35 @@ class Cavebot(BaseModule):
             'monster_priority': [],      # Lista de prioridade de monstros
             'avoid_monsters': [],        # Monstros para evitar
             'stuck_threshold': 5.0,      # Tempo para considerar travado
-            'waypoint_precision': 10,    # Precisão para considerar waypoint alcançado
+            'waypoint_precision': 1,     # Distância em SQMs para considerar waypoint alcançado
+            'step_timeout': 1.0,         # Tempo sem sair do SQM para marcar o próximo como bloqueado
+            'click_to_walk': False,      # Andar clicando no SQM visível mais distante do caminho
+            'minimap_maps': {},          # Andar -> {'path', 'origin_x', 'origin_y'} para localização
+            'minimap_zoom': 1.0,         # Pixels do minimapa por SQM
+            'full_scan_interval': 3,     # Ciclos entre detecções completas (previsão nos demais)
+            'local_match_margin': 48,    # Margem (pixels) da janela de rematch do alvo
+            'local_match_threshold': 0.7,  # Confiança mínima do rematch antes de varrer a tela
+            'monster_source': 'screen',  # 'screen' (templates no mapa) ou 'battle_list'
         }
         
         # Estados internos
         self.state = CavebotState.STOPPED
         self.waypoints: List[Waypoint] = []
+        self.script: Optional[CompiledScript] = None  # Índice de labels e saltos
         self.current_waypoint_index = 0
         self.script_loaded = False
         self.script_path = ""
         
-        # Navegação
+        # Navegação (posição do jogador em coordenadas do mundo)
+        self.tile_map = TileMap()
+        self.current_position: Optional[Position] = None
+        self.position_reader: Optional[Callable[[np.ndarray], Optional[Position]]] = None
+        self.minimap_locator: Optional[MinimapLocator] = None
         self.last_position = None
         self.position_check_time = 0
+        self.path_planner = PathPlanner()
+        self.current_path: List[Position] = []
+        self._last_step: Optional[Tuple[Position, Position, float]] = None
         self.stuck_start_time = None
         self.last_movement_time = 0
         
@@ -80,6 +82,12 @@ class Cavebot(BaseModule):
         self.last_attack_time = 0
         self.attack_cooldown = 1.5
         self.monsters_on_screen = []
+        self.monster_tracker = MonsterTracker()
+        self._cycles_since_scan: Optional[int] = None  # None força varredura
+        self._template_cache: Dict[str, Optional[np.ndarray]] = {}
+        self.battle_list_reader = BattleListReader()
+        self.battle_list: List[BattleEntry] = []
+        self._battle_list_warned = False
         
         # Templates para detecção
         self.monster_templates = self._load_monster_templates()
@@ -89,7 +97,28 @@ class Cavebot(BaseModule):
             'hole': 'hole.png',
             'rope_spot': 'rope_spot.png'
         }
+    
+    @property
+    def state(self) -> CavebotState:
+        """Estado atual da máquina de estados"""
+        return self._state
+    
+    @state.setter
+    def state(self, new_state: CavebotState):
+        """Troca de estado (transições vão para o log de eventos)"""
+        old_state = getattr(self, '_state', None)
+        self._state = new_state
+        if old_state is not None and old_state != new_state:
+            get_event_log().state(self.name, old_state.value, new_state.value)
         
+    async def run(self, ctx):
+        """Corrotina do módulo; estado inicial e encerramento vão para o log de eventos"""
+        get_event_log().state(self.name, "", self.state.value)
+        try:
+            await super().run(ctx)
+        finally:
+            get_event_log().state(self.name, self.state.value, "")
+    
     def process(self, screen_image: np.ndarray) -> bool:
         """Processa lógica principal do cavebot"""
         if not self.can_execute() or not self.script_loaded:
@@ -151,7 +180,8 @@ class Cavebot(BaseModule):
                 self.current_waypoint_index = 0
                 return False
             
-            if self._reached_waypoint(current_waypoint):
+            # Labels e saltos são executados sem caminhar
+            if current_waypoint.type in CONTROL_TYPES or self._reached_waypoint(current_waypoint):
                 return self._execute_waypoint(current_waypoint, screen_image)
             
             # Mover em direção ao waypoint
@@ -168,7 +198,7 @@ class Cavebot(BaseModule):
                 self.state = CavebotState.WALKING
                 return False
             
-            # Verificar se alvo ainda está visível
+            # Verificar se alvo ainda está visível (e atualizar sua posição)
             if not self._is_monster_visible(self.current_target):
                 self.current_target = None
                 self.state = CavebotState.WALKING
@@ -223,7 +253,16 @@ class Cavebot(BaseModule):
     def _process_stuck_state(self, screen_image: np.ndarray) -> bool:
         """Processa estado de travamento"""
         try:
-            # Tentar destravar com movimentos aleatórios
+            # Marcar próximo SQM do caminho como bloqueado para forçar replanejamento
+            if self.current_position and self.current_path:
+                self.path_planner.grid.mark_blocked(self.current_path[0])
+                self._last_step = None
+                self.state = CavebotState.WALKING
+                self.stuck_start_time = None
+                self.logger.info("Travado: replanejando caminho")
+                return True
+            
+            # Sem caminho conhecido: tentar destravar com movimentos aleatórios
             import random
             directions = ['up', 'down', 'left', 'right']
             random_direction = random.choice(directions)
@@ -241,16 +280,25 @@ class Cavebot(BaseModule):
             return False
     
     def _update_position(self, screen_image: np.ndarray):
-        """Atualiza posição atual do jogador"""
+        """Atualiza posição atual do jogador no mundo"""
         try:
-            # Detectar posição do jogador na tela
-            # Por simplicidade, assumir centro da tela
-            height, width = screen_image.shape[:2]
-            current_position = (width // 2, height // 2)
-            
-            # Verificar se está travado
-            if self.last_position:
-                if self._positions_equal(current_position, self.last_position):
+            # Centro da visão (SQM do jogador) para conversões de tela
+            self.tile_map.update_view(screen_image, self.screen_capture.rois.get('game_area'))
+            
+            # Ler posição do mundo (minimapa ou leitura de coordenadas)
+            if self.position_reader is None:
+                return
+            
+            measured = self.position_reader(screen_image)
+            if measured is None:
+                return
+            
+            self.current_position = measured
+            self._check_step_result(measured)
+            
+            # Verificar se está travado (apenas enquanto caminha)
+            if self.last_position and self.state == CavebotState.WALKING:
+                if self._positions_equal(measured, self.last_position):
                     if self.stuck_start_time is None:
                         self.stuck_start_time = time.time()
                     elif time.time() - self.stuck_start_time > self.config['stuck_threshold']:
@@ -259,50 +307,184 @@ class Cavebot(BaseModule):
                             self.logger.warning("Jogador travado detectado")
                 else:
                     self.stuck_start_time = None
+            else:
+                self.stuck_start_time = None
             
-            self.last_position = current_position
+            self.last_position = measured
             
         except Exception as e:
             self.logger.error(f"Erro ao atualizar posição: {e}")
     
+    def _check_step_result(self, measured: Position):
+        """Aprende bloqueios da grade a partir do resultado do último passo"""
+        self.path_planner.grid.mark_walkable(measured)
+        
+        if self._last_step is None:
+            return
+        
+        step_from, step_to, step_time = self._last_step
+        if measured != step_from:
+            self._last_step = None
+        elif time.time() - step_time > self.config['step_timeout']:
+            # Passo não saiu do lugar: SQM de destino está bloqueado
+            self.path_planner.grid.mark_blocked(step_to)
+            self._last_step = None
+            self.logger.debug(f"SQM bloqueado descoberto: ({step_to.x}, {step_to.y}, {step_to.z})")
+    
+    def set_position_reader(self, reader: Optional[Callable[[np.ndarray], Optional[Position]]]):
+        """Define fonte de posição do jogador (recebe a tela, retorna Position)"""
+        self.position_reader = reader
+    
+    def set_player_position(self, x: int, y: int, z: int = DEFAULT_FLOOR):
+        """Define posição do jogador manualmente (leitura externa de coordenadas)"""
+        self.current_position = Position(x, y, z)
+        self.last_position = self.current_position
+        self.stuck_start_time = None
+        if self.minimap_locator:
+            self.minimap_locator.reset(self.current_position)
+    
+    def set_config(self, config: Dict[str, Any]):
+        """Define nova configuração e reconfigura a localização pelo minimapa"""
+        super().set_config(config)
+        self._setup_minimap_locator()
+    
+    def _setup_minimap_locator(self):
+        """Cria localizador se houver mapas de andares configurados"""
+        try:
+            maps = self.config.get('minimap_maps') or {}
+            if not maps:
+                return
+            
+            locator = MinimapLocator(minimap_zoom=self.config.get('minimap_zoom', 1.0))
+            for z, floor in maps.items():
+                locator.add_floor(int(z), floor['path'], floor['origin_x'], floor['origin_y'])
+            locator.reset(self.current_position)
+            self.minimap_locator = locator
+            
+            # Não sobrescrever uma fonte de posição externa
+            if self.position_reader is None or self.position_reader == self._read_minimap_position:
+                self.position_reader = self._read_minimap_position
+            
+            self.logger.info(f"Localização pelo minimapa configurada ({len(maps)} andares)")
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao configurar localização pelo minimapa: {e}")
+    
+    def _read_minimap_position(self, screen_image: np.ndarray) -> Optional[Position]:
+        """Lê posição do jogador registrando o minimapa no mapa do andar"""
+        if self.minimap_locator is None or not self.screen_capture.rois.get('minimap'):
+            return None
+        
+        minimap = self.screen_capture.capture_roi('minimap', screen_image)
+        if minimap is None:
+            return None
+        
+        return self.minimap_locator.locate(minimap)
+    
     def _update_monsters(self, screen_image: np.ndarray):
-        """Atualiza lista de monstros visíveis"""
+        """
+        Atualiza lista de monstros visíveis
+        Detecção completa a cada 'full_scan_interval' ciclos; nos demais as
+        trilhas seguem a posição prevista. Em combate, só o alvo é procurado
+        (janela ao redor da posição prevista), com varredura completa apenas
+        quando a confiança cai. Com a lista de batalha como fonte, só os
+        monstros listados são procurados no mapa (para a posição de clique)
+        """
         try:
-            self.monsters_on_screen = []
+            now = time.time()
+            interval = max(int(self.config.get('full_scan_interval', 1)), 1)
+            templates = self.monster_templates
+            
+            battle_list = self._read_battle_list(screen_image)
+            hp_by_name: Dict[str, float] = {}
+            if battle_list is not None:
+                for entry in battle_list:
+                    hp_by_name[entry.name] = min(entry.hp_percent, hp_by_name.get(entry.name, 100.0))
+                templates = {name: path for name, path in templates.items() if name in hp_by_name}
+            
+            if battle_list is not None and not templates:
+                # Nenhum monstro conhecido na lista: nada a procurar no mapa
+                full_scan = True
+            elif self.state == CavebotState.FIGHTING and self.current_target:
+                full_scan = not self._rematch_target(self.current_target['id'], screen_image, now)
+            else:
+                full_scan = (self._cycles_since_scan is None or self._cycles_since_scan + 1 >= interval
+                             or not self.monster_tracker.tracks)
+            
+            if full_scan:
+                detections = []
+                for monster_name, template_path in templates.items():
+                    results = self._find_all_templates(template_path, screen_image, threshold=0.7)
+                    detections.extend((monster_name, x, y, confidence) for x, y, confidence in results)
+                self.monster_tracker.update(detections, now)
+                self._cycles_since_scan = 0
+                scanned = True
+            else:
+                self._cycles_since_scan = (self._cycles_since_scan or 0) + 1
+                scanned = False
             
-            # Detectar monstros usando templates
-            for monster_name, template_path in self.monster_templates.items():
-                results = self._find_all_templates(template_path, screen_image, threshold=0.7)
-                
-                for x, y, confidence in results:
-                    monster = {
-                        'name': monster_name,
-                        'x': x,
-                        'y': y,
-                        'confidence': confidence,
-                        'distance': self._calculate_distance_to_player(x, y)
-                    }
-                    self.monsters_on_screen.append(monster)
+            self.monsters_on_screen = []
+            # Trilhas não encontradas na última varredura continuam pela previsão
+            # até serem descartadas pelo tracker (evita perder o alvo por uma falha)
+            for track, px, py in self.monster_tracker.predict(now):
+                x, y = int(round(px)), int(round(py))
+                self.monsters_on_screen.append({
+                    'id': track.id,
+                    'name': track.name,
+                    'x': x,
+                    'y': y,
+                    'confidence': track.confidence,
+                    'distance': self._calculate_distance_to_player(x, y),
+                    'position': (self.tile_map.screen_to_world(x, y, self.current_position)
+                                 if self.current_position else None),
+                    'predicted': track.last_seen != now,
+                    'hp': hp_by_name.get(track.name)
+                })
             
             # Ordenar por prioridade e distância
             self.monsters_on_screen.sort(key=lambda m: (
                 self._get_monster_priority(m['name']),
                 m['distance']
             ))
+            if scanned:
+                get_event_log().detection('monsters', len(self.monsters_on_screen))
             
         except Exception as e:
             self.logger.error(f"Erro ao atualizar monstros: {e}")
     
+    def _read_battle_list(self, screen_image: np.ndarray) -> Optional[List[BattleEntry]]:
+        """Lê o painel de batalha (None se a fonte configurada é a tela)"""
+        if self.config.get('monster_source') != 'battle_list':
+            return None
+        
+        roi = self.screen_capture.rois.get('battle_list')
+        if not roi:
+            if not self._battle_list_warned:
+                self.logger.warning("ROI battle_list não configurada, procurando monstros na tela")
+                self._battle_list_warned = True
+            return None
+        
+        try:
+            panel = screen_image[roi['y']:roi['y'] + roi['height'], roi['x']:roi['x'] + roi['width']]
+            self.battle_list = self.battle_list_reader.read(panel, (roi['x'], roi['y']))
+            return self.battle_list
+        except Exception as e:
+            self.logger.error(f"Erro ao ler lista de batalha: {e}")
+            return None
+    
     def _find_priority_monster(self) -> Optional[Dict]:
         """Encontra monstro de maior prioridade para atacar"""
         try:
+            if self._using_battle_list():
+                return self._find_battle_target()
+            
             for monster in self.monsters_on_screen:
                 # Verificar se não está na lista de evitar
                 if monster['name'] in self.config['avoid_monsters']:
                     continue
                 
-                # Verificar distância
-                if monster['distance'] <= self.config['attack_range'] * 32:  # 32px por SQM
+                # Verificar distância (em SQMs)
+                if monster['distance'] <= self.config['attack_range']:
                     return monster
             
             return None
@@ -311,6 +493,64 @@ class Cavebot(BaseModule):
             self.logger.error(f"Erro ao encontrar monstro prioritário: {e}")
             return None
     
+    def _using_battle_list(self) -> bool:
+        """Alvos vêm da lista de batalha (fonte configurada e ROI definida)"""
+        return (self.config.get('monster_source') == 'battle_list'
+                and bool(self.screen_capture.rois.get('battle_list')))
+    
+    def _find_battle_target(self, name: Optional[str] = None) -> Optional[Dict]:
+        """
+        Alvo escolhido na lista de batalha (opcionalmente só criaturas com o nome)
+        Ordem: criatura já atacada pelo jogador, prioridade configurada, menor
+        vida, distância e linha. O ataque é feito clicando na linha da lista
+        """
+        candidates = []
+        for entry in self.battle_list:
+            if entry.name == UNKNOWN_CREATURE or entry.name in self.config['avoid_monsters']:
+                continue
+            if name is not None and entry.name != name:
+                continue
+            distance = self._battle_entry_distance(entry)
+            if distance > self.config['attack_range']:
+                continue
+            candidates.append((entry, distance))
+        
+        if not candidates:
+            return None
+        
+        entry, distance = min(candidates, key=lambda candidate: (
+            not candidate[0].attacked,
+            self._get_monster_priority(candidate[0].name),
+            candidate[0].hp_percent,
+            candidate[1],
+            candidate[0].row
+        ))
+        x, y = entry.click_position
+        return {
+            'id': f"battle:{entry.name}",
+            'name': entry.name,
+            'x': x,
+            'y': y,
+            'confidence': entry.confidence,
+            'distance': distance,
+            'position': None,
+            'predicted': False,
+            'hp': entry.hp_percent,
+            'attacked': entry.attacked,
+            'source': 'battle_list'
+        }
+    
+    def _battle_entry_distance(self, entry: BattleEntry) -> float:
+        """
+        Distância (SQMs) da criatura listada: a do monstro mais próximo com o
+        mesmo nome no mapa. Sem template do monstro não há como localizá-lo e a
+        lista só mostra criaturas em vista, então ele é considerado ao alcance
+        """
+        if entry.name not in self.monster_templates:
+            return 0.0
+        return min((monster['distance'] for monster in self.monsters_on_screen
+                    if monster['name'] == entry.name), default=float('inf'))
+    
     def _get_current_waypoint(self) -> Optional[Waypoint]:
         """Retorna waypoint atual"""
         if 0 <= self.current_waypoint_index < len(self.waypoints):
@@ -319,15 +559,14 @@ class Cavebot(BaseModule):
     
     def _reached_waypoint(self, waypoint: Waypoint) -> bool:
         """Verifica se chegou no waypoint"""
-        if not self.last_position:
+        if not self.current_position:
             return False
         
-        distance = np.sqrt(
-            (self.last_position[0] - waypoint.x) ** 2 +
-            (self.last_position[1] - waypoint.y) ** 2
-        )
+        target = waypoint.position
+        if not self.current_position.same_floor(target):
+            return False
         
-        return distance <= self.config['waypoint_precision']
+        return self.current_position.distance_to(target) <= self.config['waypoint_precision']
     
     def _execute_waypoint(self, waypoint: Waypoint, screen_image: np.ndarray) -> bool:
         """Executa ação do waypoint"""
@@ -364,25 +603,63 @@ class Cavebot(BaseModule):
     def _move_to_waypoint(self, waypoint: Waypoint) -> bool:
         """Move em direção ao waypoint"""
         try:
-            if not self.last_position:
+            if not self.current_position:
                 return False
             
-            # Calcular direção
-            dx = waypoint.x - self.last_position[0]
-            dy = waypoint.y - self.last_position[1]
+            # Planejar caminho (reutiliza cache enquanto estiver sobre o caminho)
+            path = self.path_planner.plan(self.current_position, waypoint.position)
+            if path is None:
+                self.current_path = []
+                return self._move_towards(waypoint.position)
             
-            # Determinar direção principal
-            if abs(dx) > abs(dy):
-                direction = 'right' if dx > 0 else 'left'
-            else:
-                direction = 'down' if dy > 0 else 'up'
+            self.current_path = path
+            if not path:
+                return False
             
-            return self._move_direction(direction)
+            if self.config['click_to_walk'] and len(path) > 1:
+                return self._click_walk(path)
+            
+            direction = PathPlanner.path_to_directions(self.current_position, path[:1])[0]
+            if self._move_direction(direction):
+                self._last_step = (self.current_position, path[0], time.time())
+                return True
+            return False
             
         except Exception as e:
             self.logger.error(f"Erro ao mover para waypoint: {e}")
             return False
     
+    def _move_towards(self, target: Position) -> bool:
+        """Passo na direção principal do alvo (sem caminho conhecido)"""
+        if not self.current_position.same_floor(target):
+            self.logger.debug("Waypoint em outro andar, sem caminho possível")
+            return False
+        
+        dx = target.x - self.current_position.x
+        dy = target.y - self.current_position.y
+        
+        if abs(dx) > abs(dy):
+            direction = 'right' if dx > 0 else 'left'
+        else:
+            direction = 'down' if dy > 0 else 'up'
+        
+        return self._move_direction(direction)
+    
+    def _click_walk(self, path: List[Position]) -> bool:
+        """Clica no SQM visível mais distante do caminho"""
+        target = PathPlanner.click_target(self.current_position, path)
+        if target is None:
+            return False
+        
+        screen_position = self.tile_map.world_to_screen(target, self.current_position)
+        if screen_position is None:
+            return False
+        
+        success = self.input_simulator.click(screen_position[0], screen_position[1], humanize=True)
+        if success:
+            self.last_movement_time = time.time()
+        return success
+    
     def _move_direction(self, direction: str) -> bool:
         """Move em uma direção específica"""
         try:
@@ -409,10 +686,15 @@ class Cavebot(BaseModule):
     def _attack_monster(self, monster: Dict) -> bool:
         """Ataca um monstro"""
         try:
+            if monster.get('attacked'):
+                # Já é o alvo do jogador: clicar de novo na lista cancelaria o ataque
+                return True
+            
             # Clicar no monstro para atacar
             success = self.input_simulator.click(monster['x'], monster['y'], humanize=True)
             
             if success:
+                get_event_log().action(self.name, 'attack')
                 self.logger.debug(f"Atacando monstro em ({monster['x']}, {monster['y']})")
             
             return success
@@ -425,6 +707,23 @@ class Cavebot(BaseModule):
         """Verifica se pode atacar (cooldown)"""
         return (time.time() - self.last_attack_time) >= self.attack_cooldown
     
+    def _goto_label(self, label: str) -> bool:
+        """Salta para o waypoint da label (destino pré-resolvido na compilação)"""
+        target = None
+        if self.script is not None:
+            target = self.script.jump_target(self.current_waypoint_index)
+            if target is None:
+                target = self.script.labels.get(label)
+        
+        if target is None:
+            self.logger.error(f"Label não encontrada: {label}")
+            self._advance_waypoint()
+            return False
+        
+        self.current_waypoint_index = target
+        self.logger.debug(f"Salto para label '{label}' (waypoint {target})")
+        return True
+    
     def _advance_waypoint(self):
         """Avança para próximo waypoint"""
         self.current_waypoint_index += 1
@@ -438,21 +737,9 @@ class Cavebot(BaseModule):
                 self.logger.error(f"Script não encontrado: {script_path}")
                 return False
             
-            with open(script_path, 'r', encoding='utf-8') as f:
-                script_data = json.load(f)
-            
-            # Converter dados para waypoints
-            self.waypoints = []
-            for wp_data in script_data.get('waypoints', []):
-                waypoint = Waypoint(
-                    x=wp_data['x'],
-                    y=wp_data['y'],
-                    type=WaypointType(wp_data.get('type', 'walk')),
-                    action=wp_data.get('action', ''),
-                    delay=wp_data.get('delay', 0.0),
-                    condition=wp_data.get('condition', '')
-                )
-                self.waypoints.append(waypoint)
+            # Compilar (ou ler do cache, se o JSON não mudou)
+            script = load_compiled_script(script_path)
+            self._apply_script(script)
             
             self.script_path = script_path
             self.script_loaded = True
@@ -461,10 +748,39 @@ class Cavebot(BaseModule):
             self.logger.info(f"Script carregado: {script_path} ({len(self.waypoints)} waypoints)")
             return True
             
+        except ScriptValidationError as e:
+            for issue in e.issues:
+                self.logger.error(f"Script inválido: {issue}")
+            return False
         except Exception as e:
             self.logger.error(f"Erro ao carregar script: {e}")
             return False
     
+    def set_waypoints(self, waypoints: List[Waypoint]) -> bool:
+        """Define waypoints (ex: editor da interface), validando e indexando labels"""
+        try:
+            self._apply_script(compile_waypoints(list(waypoints)))
+            self.script_loaded = True
+            self.current_waypoint_index = 0
+            return True
+        except ScriptValidationError as e:
+            for issue in e.issues:
+                self.logger.error(f"Script inválido: {issue}")
+            return False
+    
+    def _apply_script(self, script: CompiledScript):
+        """Ativa script compilado"""
+        self.script = script
+        self.waypoints = script.waypoints
+    
+    def _reindex(self):
+        """Recompila índice de labels após edição dos waypoints"""
+        try:
+            self.script = compile_waypoints(self.waypoints)
+        except ScriptValidationError:
+            # Ex: salto para label ainda não adicionada
+            self.script = None
+    
     def save_script(self, script_path: str) -> bool:
         """Salva script atual"""
         try:
@@ -478,6 +794,7 @@ class Cavebot(BaseModule):
                 wp_data = {
                     'x': wp.x,
                     'y': wp.y,
+                    'z': wp.z,
                     'type': wp.type.value,
                     'action': wp.action,
                     'delay': wp.delay,
@@ -496,15 +813,17 @@ class Cavebot(BaseModule):
             return False
     
     def add_waypoint(self, x: int, y: int, wp_type: WaypointType = WaypointType.WALK, 
-                    action: str = "", delay: float = 0.0):
+                    action: str = "", delay: float = 0.0, z: int = DEFAULT_FLOOR):
         """Adiciona waypoint ao script"""
-        waypoint = Waypoint(x, y, wp_type, action, delay)
+        waypoint = Waypoint(x, y, wp_type, action, delay, z=z)
         self.waypoints.append(waypoint)
-        self.logger.info(f"Waypoint adicionado: ({x}, {y}) - {wp_type.value}")
+        self._reindex()
+        self.logger.info(f"Waypoint adicionado: ({x}, {y}, {z}) - {wp_type.value}")
     
     def clear_waypoints(self):
         """Limpa todos os waypoints"""
         self.waypoints.clear()
+        self.script = None
         self.current_waypoint_index = 0
         self.script_loaded = False
         self.logger.info("Waypoints limpos")
@@ -515,6 +834,8 @@ class Cavebot(BaseModule):
             self.config['enabled'] = True
             self.state = CavebotState.WALKING
             self.logger.info("Cavebot iniciado")
+            if self.position_reader is None and self.current_position is None:
+                self.logger.warning("Nenhuma fonte de posição configurada - waypoints não serão alcançados")
         else:
             self.logger.error("Nenhum script carregado")
     
@@ -523,6 +844,8 @@ class Cavebot(BaseModule):
         self.config['enabled'] = False
         self.state = CavebotState.STOPPED
         self.current_target = None
+        self.monster_tracker.clear()
+        self._cycles_since_scan = None
         self.logger.info("Cavebot parado")
     
     def _load_monster_templates(self) -> Dict[str, str]:
@@ -550,50 +873,93 @@ class Cavebot(BaseModule):
             return 999
     
     def _calculate_distance_to_player(self, x: int, y: int) -> float:
-        """Calcula distância até o jogador"""
-        if not self.last_position:
+        """Calcula distância em SQMs entre um pixel da tela e o jogador"""
+        distance = self.tile_map.screen_distance(x, y)
+        if distance is None:
             return float('inf')
-        
-        return np.sqrt(
-            (x - self.last_position[0]) ** 2 +
-            (y - self.last_position[1]) ** 2
-        )
+        return distance
     
-    def _positions_equal(self, pos1: Tuple[int, int], pos2: Tuple[int, int], threshold: int = 5) -> bool:
-        """Verifica se duas posições são iguais (com threshold)"""
-        return abs(pos1[0] - pos2[0]) <= threshold and abs(pos1[1] - pos2[1]) <= threshold
+    def _positions_equal(self, pos1: Position, pos2: Position) -> bool:
+        """Verifica se duas posições do mundo são o mesmo SQM"""
+        return pos1 == pos2
     
     def _is_monster_visible(self, monster: Dict) -> bool:
         """Verifica se monstro ainda está visível"""
-        # Verificar se monstro ainda está na lista atual
+        if monster.get('source') == 'battle_list':
+            # Linha da criatura muda quando outras saem da lista: escolher de novo pelo nome
+            current_monster = self._find_battle_target(monster['name'])
+            if current_monster is None:
+                return False
+            if monster is self.current_target:
+                self.current_target = current_monster
+            return True
+        
+        # Mesmo ID de trilha na lista atual
         for current_monster in self.monsters_on_screen:
-            if (current_monster['name'] == monster['name'] and
-                abs(current_monster['x'] - monster['x']) <= 20 and
-                abs(current_monster['y'] - monster['y']) <= 20):
+            if current_monster['id'] == monster['id']:
+                if monster is self.current_target:
+                    self.current_target = current_monster
                 return True
         return False
     
+    def _rematch_target(self, track_id: int, screen_image: np.ndarray, now: float) -> bool:
+        """
+        Procura o alvo só numa janela ao redor da posição prevista
+        Retorna False se não encontrado com confiança suficiente
+        """
+        track = self.monster_tracker.get(track_id)
+        if track is None:
+            return False
+        
+        template = self._get_template(self.monster_templates.get(track.name, ''))
+        if template is None:
+            return False
+        
+        th, tw = template.shape[:2]
+        margin = int(self.config.get('local_match_margin', 48))
+        px, py = track.predict(now, self.monster_tracker.max_prediction)
+        height, width = screen_image.shape[:2]
+        x1, y1 = max(int(px) - margin, 0), max(int(py) - margin, 0)
+        x2, y2 = min(int(px) + tw + margin, width), min(int(py) + th + margin, height)
+        if x2 - x1 < tw or y2 - y1 < th:
+            return False
+        
+        result = cv2.matchTemplate(screen_image[y1:y2, x1:x2], template, cv2.TM_CCOEFF_NORMED)
+        _, confidence, _, location = cv2.minMaxLoc(result)
+        if confidence < self.config.get('local_match_threshold', 0.7):
+            self.logger.debug(f"Rematch de {track.name} com confiança {confidence:.2f}, varrendo a tela")
+            return False
+        
+        return self.monster_tracker.observe(track_id, x1 + location[0], y1 + location[1], confidence, now)
+    
+    def _get_template(self, template_path: str) -> Optional[np.ndarray]:
+        """Template carregado uma vez e mantido em memória"""
+        if template_path not in self._template_cache:
+            template = None
+            if template_path and os.path.exists(template_path):
+                template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+            self._template_cache[template_path] = template
+        return self._template_cache[template_path]
+    
     def _find_all_templates(self, template_path: str, screen_image: np.ndarray, 
                           threshold: float = 0.8) -> List[Tuple[int, int, float]]:
         """Encontra todas as ocorrências de um template"""
         try:
-            if not os.path.exists(template_path):
-                return []
-            
-            template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+            template = self._get_template(template_path)
             if template is None:
                 return []
             
             result = cv2.matchTemplate(screen_image, template, cv2.TM_CCOEFF_NORMED)
             
-            # Encontrar todos os matches acima do threshold
-            locations = np.where(result >= threshold)
-            matches = []
-            
-            for pt in zip(*locations[::-1]):
-                matches.append((pt[0], pt[1], result[pt[1], pt[0]]))
+            # Pixels acima do threshold, agrupados em uma ocorrência por monstro
+            ys, xs = np.nonzero(result >= threshold)
+            if len(xs) == 0:
+                return []
             
-            return matches
+            radius = max(min(template.shape[:2]) // 2, 1)
+            centroids, scores = cluster_points(np.column_stack((xs, ys)), radius, result[ys, xs])
+            return [(int(round(x)), int(round(y)), float(score))
+                    for (x, y), score in zip(centroids, scores)]
             
         except Exception as e:
             self.logger.error(f"Erro no template matching múltiplo: {e}")
@@ -606,6 +972,10 @@ class Cavebot(BaseModule):
             'script_loaded': self.script_loaded,
             'current_waypoint': self.current_waypoint_index,
             'total_waypoints': len(self.waypoints),
+            'path_length': len(self.current_path),
+            'position': (self.current_position.x, self.current_position.y, self.current_position.z)
+                        if self.current_position else None,
             'monsters_visible': len(self.monsters_on_screen),
+            'battle_list': len(self.battle_list),
             'current_target': self.current_target['name'] if self.current_target else None
         }
\ No newline at end of file
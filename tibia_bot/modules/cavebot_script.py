@@ -0,0 +1,198 @@
+"""
+Cavebot Script - Compilação e cache de scripts de waypoints
+Converte o JSON em forma indexada (labels, saltos resolvidos, tipos
+pré-convertidos) e guarda o resultado em cache binário ao lado do script
+"""
+
+import hashlib
+import json
+import logging
+import marshal
+import os
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from modules.tile_map import Position, DEFAULT_FLOOR
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache"
+
+class WaypointType(Enum):
+    """Tipos de waypoint"""
+    WALK = "walk"
+    ATTACK = "attack"
+    USE_STAIRS = "stairs"
+    USE_HOLE = "hole"
+    USE_ROPE = "rope"
+    USE_SHOVEL = "shovel"
+    WAIT = "wait"
+    LABEL = "label"
+    GOTO_LABEL = "goto_label"
+
+_TYPES_BY_VALUE = {wp_type.value: wp_type for wp_type in WaypointType}
+
+# Waypoints de controle de fluxo: executados sem caminhar até (x, y)
+CONTROL_TYPES = (WaypointType.LABEL, WaypointType.GOTO_LABEL)
+
+@dataclass
+class Waypoint:
+    """Ponto de navegação (coordenadas do mundo, em SQMs)"""
+    x: int
+    y: int
+    type: WaypointType
+    action: str = ""
+    delay: float = 0.0
+    condition: str = ""
+    z: int = DEFAULT_FLOOR
+
+    @property
+    def position(self) -> Position:
+        """Posição do waypoint no mundo"""
+        return Position(self.x, self.y, self.z)
+
+class ScriptValidationError(ValueError):
+    """Script de cavebot inválido"""
+
+    def __init__(self, issues: List[str]):
+        self.issues = issues
+        super().__init__("; ".join(issues))
+
+@dataclass
+class CompiledScript:
+    """Script indexado, pronto para execução"""
+    waypoints: List[Waypoint]
+    labels: Dict[str, int] = field(default_factory=dict)       # label -> índice
+    jump_targets: List[int] = field(default_factory=list)      # índice -> destino (-1 sem salto)
+    source_hash: str = ""
+    name: str = ""
+
+    def jump_target(self, index: int) -> Optional[int]:
+        """Destino pré-resolvido de um GOTO_LABEL"""
+        if 0 <= index < len(self.jump_targets) and self.jump_targets[index] >= 0:
+            return self.jump_targets[index]
+        return None
+
+def compile_waypoints(waypoints: List[Waypoint], source_hash: str = "", name: str = "") -> CompiledScript:
+    """Valida waypoints e resolve labels e saltos"""
+    issues = []
+    labels: Dict[str, int] = {}
+
+    for index, waypoint in enumerate(waypoints):
+        if waypoint.delay < 0:
+            issues.append(f"Waypoint {index}: delay negativo ({waypoint.delay})")
+        if waypoint.type == WaypointType.LABEL:
+            if not waypoint.action:
+                issues.append(f"Waypoint {index}: label sem nome")
+            elif waypoint.action in labels:
+                issues.append(f"Waypoint {index}: label duplicada '{waypoint.action}'")
+            else:
+                labels[waypoint.action] = index
+
+    jump_targets = []
+    for index, waypoint in enumerate(waypoints):
+        target = -1
+        if waypoint.type == WaypointType.GOTO_LABEL:
+            if waypoint.action not in labels:
+                issues.append(f"Waypoint {index}: label de destino desconhecida '{waypoint.action}'")
+            else:
+                target = labels[waypoint.action]
+        jump_targets.append(target)
+
+    if issues:
+        raise ScriptValidationError(issues)
+
+    return CompiledScript(waypoints, labels, jump_targets, source_hash, name)
+
+def compile_script_data(script_data: Dict[str, Any], source_hash: str = "") -> CompiledScript:
+    """Converte dados JSON do script em forma compilada"""
+    issues = []
+    waypoints = []
+
+    for index, wp_data in enumerate(script_data.get('waypoints', [])):
+        try:
+            wp_type = WaypointType(wp_data.get('type', 'walk'))
+        except ValueError:
+            issues.append(f"Waypoint {index}: tipo inválido '{wp_data.get('type')}'")
+            continue
+
+        # Labels e saltos não precisam de coordenadas
+        if wp_type not in CONTROL_TYPES and ('x' not in wp_data or 'y' not in wp_data):
+            issues.append(f"Waypoint {index}: coordenadas ausentes")
+            continue
+
+        waypoints.append(Waypoint(
+            x=int(wp_data.get('x', 0)),
+            y=int(wp_data.get('y', 0)),
+            type=wp_type,
+            action=wp_data.get('action', ''),
+            delay=float(wp_data.get('delay', 0.0)),
+            condition=wp_data.get('condition', ''),
+            z=int(wp_data.get('z', DEFAULT_FLOOR))
+        ))
+
+    if issues:
+        raise ScriptValidationError(issues)
+
+    return compile_waypoints(waypoints, source_hash, script_data.get('name', ''))
+
+def _to_cache_payload(script: CompiledScript) -> Dict[str, Any]:
+    """Serializa em colunas de tipos nativos (formato marshal)"""
+    waypoints = script.waypoints
+    return {
+        'version': CACHE_VERSION,
+        'hash': script.source_hash,
+        'name': script.name,
+        'x': [wp.x for wp in waypoints],
+        'y': [wp.y for wp in waypoints],
+        'type': [wp.type.value for wp in waypoints],
+        'action': [wp.action for wp in waypoints],
+        'delay': [wp.delay for wp in waypoints],
+        'condition': [wp.condition for wp in waypoints],
+        'z': [wp.z for wp in waypoints],
+        'labels': script.labels,
+        'jump_targets': script.jump_targets,
+    }
+
+def _from_cache_payload(payload: Dict[str, Any]) -> CompiledScript:
+    """Reconstrói script compilado a partir do cache"""
+    types = [_TYPES_BY_VALUE[value] for value in payload['type']]
+    waypoints = list(map(Waypoint, payload['x'], payload['y'], types, payload['action'],
+                         payload['delay'], payload['condition'], payload['z']))
+    return CompiledScript(waypoints, payload['labels'], payload['jump_targets'],
+                          payload['hash'], payload['name'])
+
+def load_compiled_script(script_path: str, use_cache: bool = True) -> CompiledScript:
+    """
+    Carrega script compilado, usando o cache quando o hash do JSON confere
+    Lança ScriptValidationError se o script for inválido
+    """
+    logger = logging.getLogger(__name__)
+
+    with open(script_path, 'rb') as f:
+        raw = f.read()
+    source_hash = hashlib.sha256(raw).hexdigest()
+    cache_path = script_path + CACHE_SUFFIX
+
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                payload = marshal.loads(f.read())
+            if payload.get('version') == CACHE_VERSION and payload.get('hash') == source_hash:
+                return _from_cache_payload(payload)
+        except Exception as e:
+            # Cache corrompido ou de outra versão do Python: recompilar
+            logger.debug(f"Cache de script ignorado ({cache_path}): {e}")
+
+    script = compile_script_data(json.loads(raw.decode('utf-8')), source_hash)
+
+    if use_cache:
+        try:
+            temp_path = cache_path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(marshal.dumps(_to_cache_payload(script)))
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar cache do script: {e}")
+
+    return script
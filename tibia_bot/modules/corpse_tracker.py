@@ -0,0 +1,139 @@
+"""
+Corpse Tracker - Memória de corpos já processados pelo auto loot
+Corpos são identificados pelo SQM (não pelo pixel exato), relativo a uma
+câmera que acompanha o movimento do jogador, com validade e limite de tamanho
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from modules.tile_map import SQM_SIZE
+
+TileKey = Tuple[int, int]
+
+@dataclass
+class CorpseEntry:
+    """Corpo conhecido"""
+    first_seen: float
+    last_seen: float
+
+class CorpseTracker:
+    """
+    Corpos já processados, por SQM
+
+    - Chave: SQM da posição na tela somada ao deslocamento acumulado da câmera
+      (estimado por correlação de fase entre frames da área de jogo), de forma
+      que o mesmo corpo mantém a chave enquanto o jogador anda
+    - Validade (ttl) renovada a cada vez que o corpo é visto
+    - Limite de entradas explícito, descartando as menos vistas recentemente (LRU)
+    """
+
+    def __init__(self, ttl: float = 300.0, capacity: int = 256, sqm_size: int = SQM_SIZE,
+                 min_motion_confidence: float = 0.3, motion_scale: float = 0.5,
+                 min_shift: float = 1.0):
+        self.ttl = ttl
+        self.capacity = capacity
+        self.sqm_size = sqm_size
+        self.min_motion_confidence = min_motion_confidence
+        self.motion_scale = motion_scale  # Redução da imagem na estimativa de movimento
+        self.min_shift = min_shift        # Deslocamentos menores (pixels) são ruído da estimativa
+
+        self._entries: 'OrderedDict[TileKey, CorpseEntry]' = OrderedDict()
+        self._camera = np.zeros(2)  # Deslocamento acumulado da câmera (pixels)
+        self._previous_frame: Optional[np.ndarray] = None
+        self._window: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def camera_offset(self) -> Tuple[float, float]:
+        """Deslocamento acumulado da câmera em pixels"""
+        return float(self._camera[0]), float(self._camera[1])
+
+    def update_camera(self, game_area: np.ndarray) -> Optional[Tuple[float, float]]:
+        """
+        Estima o movimento da imagem desde o frame anterior e acumula na câmera
+        Retorna o deslocamento aplicado ou None (primeiro frame/baixa confiança/parado)
+
+        O jogo desenha a cena em pixels inteiros: o deslocamento é arredondado e
+        valores abaixo de `min_shift` são ignorados, senão o ruído sub-pixel da
+        correlação se acumula e a câmera deriva com o jogador parado
+        """
+        gray = cv2.cvtColor(game_area, cv2.COLOR_BGR2GRAY) if game_area.ndim == 3 else game_area
+        if self.motion_scale != 1.0:
+            gray = cv2.resize(gray, None, fx=self.motion_scale, fy=self.motion_scale,
+                              interpolation=cv2.INTER_AREA)
+        frame = gray.astype(np.float32)
+
+        previous = self._previous_frame
+        self._previous_frame = frame
+        if previous is None or previous.shape != frame.shape:
+            self._window = cv2.createHanningWindow(frame.shape[::-1], cv2.CV_32F)
+            return None
+
+        (dx, dy), response = cv2.phaseCorrelate(previous, frame, self._window)
+        if response < self.min_motion_confidence:
+            # Troca de andar, teleporte ou tela sem textura: câmera mantida
+            return None
+
+        # Cena deslocada em (dx, dy) equivale à câmera andando no sentido oposto
+        shift = np.array([dx, dy]) / self.motion_scale
+        if np.hypot(shift[0], shift[1]) < self.min_shift:
+            return None
+        shift = np.round(shift)
+        self._camera -= shift
+        return float(-shift[0]), float(-shift[1])
+
+    def key(self, px: float, py: float) -> TileKey:
+        """SQM (relativo à câmera) de um pixel da tela"""
+        return (int(np.floor((px + self._camera[0]) / self.sqm_size + 0.5)),
+                int(np.floor((py + self._camera[1]) / self.sqm_size + 0.5)))
+
+    def contains(self, px: float, py: float, now: Optional[float] = None) -> bool:
+        """Verifica se o corpo na posição já foi processado"""
+        now = time.time() if now is None else now
+        entry = self._entries.get(self.key(px, py))
+        return entry is not None and now - entry.last_seen <= self.ttl
+
+    def mark(self, px: float, py: float, now: Optional[float] = None) -> bool:
+        """
+        Registra corpo na posição
+        Retorna True se ele é novo (deve ser aberto), False se já era conhecido
+        """
+        return self.mark_tile(self.key(px, py), now)
+
+    def mark_tile(self, key: TileKey, now: Optional[float] = None) -> bool:
+        """Registra corpo pela chave de SQM (obtida com key() quando foi visto)"""
+        now = time.time() if now is None else now
+        entry = self._entries.get(key)
+
+        if entry is not None and now - entry.last_seen <= self.ttl:
+            entry.last_seen = now
+            self._entries.move_to_end(key)
+            return False
+
+        self._entries[key] = CorpseEntry(first_seen=now, last_seen=now)
+        self._entries.move_to_end(key)
+        self._evict(now)
+        return True
+
+    def _evict(self, now: float):
+        """Remove entradas vencidas e, acima do limite, as menos recentes"""
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry.last_seen > self.ttl or len(self._entries) > self.capacity:
+                del self._entries[key]
+            else:
+                break
+
+    def clear(self):
+        """Esquece todos os corpos e o estado da câmera"""
+        self._entries.clear()
+        self._camera[:] = 0
+        self._previous_frame = None
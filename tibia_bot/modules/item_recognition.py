@@ -0,0 +1,212 @@
+"""
+Item Recognition - Reconhecimento de itens em grades de slots
+Recorta inventário/containers em slots de 32x32, calcula hash perceptual
+(diferença de gradientes) de todos os slots de uma vez e busca o item mais
+próximo (distância de Hamming vetorizada) num índice montado a partir dos sprites
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+ITEM_SPRITES_DIR = "assets/items"
+SLOT_SIZE = 32
+HASH_GRID = 8                       # Hash sobre a imagem reduzida a 8x8
+HASH_BYTES = 2 * HASH_GRID * (HASH_GRID - 1) // 8  # Gradientes horizontais + verticais (112 bits)
+SLOT_BACKGROUND = (40, 40, 40)      # Cor do fundo dos slots no cliente (BGR)
+GRADIENT_TOLERANCE = 4.0            # Diferença mínima entre blocos para ligar o bit (ruído/compressão)
+INVENTORY_ORIGIN = (600, 300)       # Primeiro slot do inventário sem ROI 'inventory'
+
+# Bits ligados por valor de byte (popcount por tabela)
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+@dataclass(frozen=True)
+class SlotGrid:
+    """Geometria de uma grade de slots na tela"""
+    x: int
+    y: int
+    columns: int = 4
+    rows: int = 5
+    slot_size: int = SLOT_SIZE
+    spacing: int = 2
+
+    @classmethod
+    def from_roi(cls, roi: Dict[str, int], slot_size: int = SLOT_SIZE, spacing: int = 2) -> 'SlotGrid':
+        """Grade que cabe numa ROI (canto superior esquerdo = primeiro slot)"""
+        pitch = slot_size + spacing
+        return cls(roi['x'], roi['y'],
+                   columns=max((roi['width'] + spacing) // pitch, 1),
+                   rows=max((roi['height'] + spacing) // pitch, 1),
+                   slot_size=slot_size, spacing=spacing)
+
+    @property
+    def slot_count(self) -> int:
+        return self.columns * self.rows
+
+    @property
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """Região coberta pela grade (x, y, largura, altura)"""
+        pitch = self.slot_size + self.spacing
+        return self.x, self.y, self.columns * pitch - self.spacing, self.rows * pitch - self.spacing
+
+    def slot_origin(self, slot: int) -> Tuple[int, int]:
+        """Canto superior esquerdo do slot (1 = primeiro)"""
+        row, col = divmod(slot - 1, self.columns)
+        pitch = self.slot_size + self.spacing
+        return self.x + col * pitch, self.y + row * pitch
+
+    def slot_center(self, slot: int) -> Optional[Tuple[int, int]]:
+        """Centro do slot na tela (None se fora da grade)"""
+        if not 1 <= slot <= self.slot_count:
+            return None
+        x, y = self.slot_origin(slot)
+        return x + self.slot_size // 2, y + self.slot_size // 2
+
+    def slice(self, image: np.ndarray) -> np.ndarray:
+        """Recorta todos os slots: array (n, slot, slot, canais); slots fora da imagem ficam zerados"""
+        size = self.slot_size
+        slots = np.zeros((self.slot_count, size, size) + image.shape[2:], dtype=image.dtype)
+        height, width = image.shape[:2]
+        for index in range(self.slot_count):
+            x, y = self.slot_origin(index + 1)
+            if x >= 0 and y >= 0 and x + size <= width and y + size <= height:
+                slots[index] = image[y:y + size, x:x + size]
+        return slots
+
+def perceptual_hashes(slots: np.ndarray) -> np.ndarray:
+    """
+    Hash de gradientes de um lote de imagens (n, h, w[, 3])
+    Retorna array (n, HASH_BYTES) de uint8
+    """
+    if slots.ndim == 4:
+        # Tons de cinza (pesos BT.601, canais BGR)
+        gray = slots[..., 0] * 0.114 + slots[..., 1] * 0.587 + slots[..., 2] * 0.299
+    else:
+        gray = slots.astype(np.float32)
+    n, height, width = gray.shape
+
+    # Redução por média de blocos (h e w múltiplos de HASH_GRID)
+    block_h, block_w = height // HASH_GRID, width // HASH_GRID
+    gray = gray[:, :block_h * HASH_GRID, :block_w * HASH_GRID]
+    small = gray.reshape(n, HASH_GRID, block_h, HASH_GRID, block_w).mean(axis=(2, 4))
+
+    # Blocos praticamente iguais (áreas lisas) ficam em 0 para o ruído não inverter bits
+    horizontal = small[:, :, 1:] - small[:, :, :-1] > GRADIENT_TOLERANCE
+    vertical = small[:, 1:, :] - small[:, :-1, :] > GRADIENT_TOLERANCE
+    bits = np.concatenate((horizontal.reshape(n, -1), vertical.reshape(n, -1)), axis=1)
+    return np.packbits(bits, axis=1)
+
+def hamming_distances(hashes: np.ndarray, index_hashes: np.ndarray) -> np.ndarray:
+    """Distâncias de Hamming (n, m) entre dois lotes de hashes"""
+    return _POPCOUNT[hashes[:, None, :] ^ index_hashes[None, :, :]].sum(axis=2, dtype=np.uint16)
+
+def empty_slots(slots: np.ndarray, min_std: float = 6.0) -> np.ndarray:
+    """Máscara de slots vazios (imagem praticamente uniforme)"""
+    flat = slots.reshape(len(slots), -1).astype(np.float32)
+    return flat.std(axis=1) < min_std
+
+class ItemIndex:
+    """Índice nome -> hash dos sprites de itens"""
+
+    def __init__(self, names: Optional[List[str]] = None, hashes: Optional[np.ndarray] = None):
+        self.names: List[str] = list(names or [])
+        self.hashes = hashes if hashes is not None else np.zeros((0, HASH_BYTES), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_directory(cls, sprites_dir: str = ITEM_SPRITES_DIR,
+                       background: Tuple[int, int, int] = SLOT_BACKGROUND) -> 'ItemIndex':
+        """
+        Monta índice a partir de <sprites_dir>/<nome do item>.png
+        ('_' no nome do arquivo vira espaço; transparência é composta sobre o fundo do slot)
+        """
+        logger = logging.getLogger(__name__)
+        names, sprites = [], []
+        if os.path.isdir(sprites_dir):
+            for filename in sorted(os.listdir(sprites_dir)):
+                stem, ext = os.path.splitext(filename)
+                if ext.lower() != '.png':
+                    continue
+                sprite = cv2.imread(os.path.join(sprites_dir, filename), cv2.IMREAD_UNCHANGED)
+                if sprite is None:
+                    logger.warning(f"Sprite ilegível: {filename}")
+                    continue
+                names.append(stem.replace('_', ' '))
+                sprites.append(_prepare_sprite(sprite, background))
+
+        index = cls(names, perceptual_hashes(np.stack(sprites)) if sprites else None)
+        logger.info(f"Índice de itens: {len(index)} sprites de {sprites_dir}")
+        return index
+
+    def lookup(self, hashes: np.ndarray, max_distance: int = 12) -> List[Optional[Tuple[str, int]]]:
+        """Item mais próximo de cada hash (None se nenhum a até max_distance bits)"""
+        if len(self.names) == 0 or len(hashes) == 0:
+            return [None] * len(hashes)
+
+        distances = hamming_distances(hashes, self.hashes)
+        best = distances.argmin(axis=1)
+        best_distance = distances[np.arange(len(hashes)), best]
+        return [(self.names[i], int(d)) if d <= max_distance else None
+                for i, d in zip(best, best_distance)]
+
+def _prepare_sprite(sprite: np.ndarray, background: Tuple[int, int, int]) -> np.ndarray:
+    """Sprite BGR 32x32, com transparência composta sobre o fundo do slot"""
+    if sprite.ndim == 2:
+        sprite = cv2.cvtColor(sprite, cv2.COLOR_GRAY2BGR)
+    if sprite.shape[2] == 4:
+        alpha = sprite[..., 3:4].astype(np.float32) / 255.0
+        base = np.empty_like(sprite[..., :3], dtype=np.float32)
+        base[:] = background
+        sprite = (sprite[..., :3] * alpha + base * (1 - alpha)).astype(np.uint8)
+    if sprite.shape[:2] != (SLOT_SIZE, SLOT_SIZE):
+        sprite = cv2.resize(sprite, (SLOT_SIZE, SLOT_SIZE), interpolation=cv2.INTER_AREA)
+    return sprite
+
+_indexes: Dict[str, ItemIndex] = {}
+
+def get_item_index(sprites_dir: str = ITEM_SPRITES_DIR) -> ItemIndex:
+    """Índice compartilhado (montado uma vez por diretório)"""
+    if sprites_dir not in _indexes:
+        _indexes[sprites_dir] = ItemIndex.from_directory(sprites_dir)
+    return _indexes[sprites_dir]
+
+def inventory_grid(rois: Dict[str, Optional[Dict[str, int]]],
+                   origin: Tuple[int, int] = INVENTORY_ORIGIN) -> SlotGrid:
+    """Grade do inventário: ROI 'inventory' ou 4x5 slots a partir de `origin`"""
+    roi = rois.get('inventory')
+    if roi:
+        return SlotGrid.from_roi(roi)
+    return SlotGrid(origin[0], origin[1])
+
+class ItemRecognizer:
+    """Identifica os itens de uma grade de slots num frame"""
+
+    def __init__(self, index: Optional[ItemIndex] = None, max_distance: int = 12):
+        self.index = index if index is not None else get_item_index()
+        self.max_distance = max_distance
+
+    def identify(self, image: np.ndarray, grid: SlotGrid) -> List[Optional[str]]:
+        """Nome do item em cada slot da grade (None = vazio ou desconhecido)"""
+        return self.scan(image, grid)[0]
+
+    def scan(self, image: np.ndarray, grid: SlotGrid) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Nomes dos itens e máscara de slots vazios da grade"""
+        slots = grid.slice(image)
+        names: List[Optional[str]] = [None] * len(slots)
+
+        empty = empty_slots(slots)
+        occupied = np.flatnonzero(~empty)
+        if len(occupied) == 0:
+            return names, empty
+
+        matches = self.index.lookup(perceptual_hashes(slots[occupied]), self.max_distance)
+        for slot_index, match in zip(occupied, matches):
+            if match is not None:
+                names[slot_index] = match[0]
+        return names, empty
@@ -0,0 +1,93 @@
+"""
+Loot Pipeline - Coleta de um corpo aberto em lote
+Detecta a janela do container pela mudança visual da sua região, reconhece
+todos os itens num único frame e planeja movimentos e descartes de uma vez
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Collection, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.item_recognition import SlotGrid
+from modules.waits import RegionChanged
+
+@dataclass(frozen=True)
+class LootMove:
+    """Arrasto planejado: item do container para o inventário ou descarte"""
+    item: Optional[str]             # None = item não reconhecido
+    source: Tuple[int, int]
+    target: Tuple[int, int]
+    discard: bool = False
+
+def container_opened(grid: SlotGrid, timeout: float = 0.6) -> RegionChanged:
+    """Espera a região do container mudar (janela do corpo aberta) e estabilizar"""
+    return RegionChanged(grid.bounds, timeout=timeout)
+
+def plan_loot(container: Optional[SlotGrid], container_items: Sequence[Optional[str]],
+              container_empty: Sequence[bool], inventory: SlotGrid,
+              inventory_items: Sequence[Optional[str]], inventory_empty: Sequence[bool],
+              valuable: Collection[str], trash: Collection[str], take_unlisted: bool,
+              discard_offset: Tuple[int, int] = (100, 100)) -> List[LootMove]:
+    """
+    Lista de movimentos para um corpo aberto
+
+    - Descartes primeiro: lixo reconhecido no inventário libera slots
+    - Coleta: itens valiosos; com `take_unlisted`, também tudo que não é lixo
+      (inclusive itens não reconhecidos) no espaço que os valiosos deixarem livre
+    - Containers do Tibia se compactam quando um item sai: as retiradas seguem
+      do último slot para o primeiro (os anteriores não mudam de posição) e os
+      itens são soltos nos slots vazios após a compactação, não nos liberados
+    """
+    moves: List[LootMove] = []
+
+    discarded = 0
+    for slot in range(len(inventory_items), 0, -1):
+        item = inventory_items[slot - 1]
+        if item is not None and item in trash:
+            x, y = inventory.slot_center(slot)
+            moves.append(LootMove(item, (x, y), (x + discard_offset[0], y + discard_offset[1]), discard=True))
+            discarded += 1
+
+    if container is None:
+        return moves
+
+    # Itens restantes ocupam os primeiros slots; os seguintes ficam vazios
+    occupied = sum(1 for empty in inventory_empty if not empty) - discarded
+    free_slots = list(range(occupied + 1, len(inventory_empty) + 1))
+
+    # Valiosos primeiro; o que sobrar de espaço vai para os demais itens que não são lixo
+    present = [(slot, item) for slot, (item, empty) in
+               enumerate(zip(container_items, container_empty), start=1) if not empty]
+    wanted = [(slot, item) for slot, item in present if item is not None and item in valuable]
+    if take_unlisted:
+        wanted += [(slot, item) for slot, item in present
+                   if item is None or (item not in valuable and item not in trash)]
+    wanted = sorted(wanted[:len(free_slots)], reverse=True)
+
+    for (slot, item), target in zip(wanted, free_slots):
+        moves.append(LootMove(item, container.slot_center(slot), inventory.slot_center(target)))
+
+    return moves
+
+class LootLatency:
+    """Latência por corpo (clique até o último movimento), janela das últimas coletas"""
+
+    def __init__(self, window: int = 50):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, latency_ms: float):
+        self.samples.append(latency_ms)
+
+    def summary(self) -> Dict[str, float]:
+        """Contagem, última, média e p95 (ms)"""
+        if not self.samples:
+            return {'count': 0, 'last_ms': 0.0, 'mean_ms': 0.0, 'p95_ms': 0.0}
+        values = np.fromiter(self.samples, dtype=np.float64)
+        return {
+            'count': len(values),
+            'last_ms': float(values[-1]),
+            'mean_ms': float(values.mean()),
+            'p95_ms': float(np.percentile(values, 95)),
+        }
@@ -0,0 +1,172 @@
+"""
+Minimap Locator - Localização do jogador pelo minimapa
+Registra o recorte do minimapa contra o mapa completo do andar usando
+correlação de fase (FFT) em uma janela ao redor da última posição conhecida
+"""
+
+import cv2
+import numpy as np
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from modules.tile_map import Position
+
+@dataclass
+class FloorMap:
+    """Imagem do mapa de um andar (1 pixel = 1 SQM)"""
+    path: str
+    origin_x: int
+    origin_y: int
+    image: Optional[np.ndarray] = None  # Escala de cinza, carregada sob demanda
+
+class MinimapLocator:
+    """Localizador por correlação de fase entre minimapa e mapa do andar"""
+
+    def __init__(self, search_radius: int = 24, min_confidence: float = 0.6, minimap_zoom: float = 1.0):
+        self.logger = logging.getLogger(__name__)
+        self.floors: Dict[int, FloorMap] = {}
+        self.search_radius = search_radius      # SQMs de busca ao redor da última posição
+        self.min_confidence = min_confidence    # Correlação normalizada mínima
+        self.minimap_zoom = minimap_zoom        # Pixels do minimapa por SQM
+        self.last_position: Optional[Position] = None
+        self.last_confidence = 0.0
+
+    def add_floor(self, z: int, image_path: str, origin_x: int, origin_y: int):
+        """Registra imagem do mapa de um andar e a coordenada do seu pixel (0, 0)"""
+        self.floors[z] = FloorMap(image_path, origin_x, origin_y)
+
+    def reset(self, position: Optional[Position] = None):
+        """Reinicia rastreamento (força busca global se position=None)"""
+        self.last_position = position
+
+    def locate(self, minimap: np.ndarray) -> Optional[Position]:
+        """Retorna posição do jogador (centro do minimapa) no mundo"""
+        try:
+            crop = self._prepare_crop(minimap)
+            if crop is None:
+                return None
+
+            result = None
+
+            # Busca local no andar atual (caso comum, a cada frame)
+            if self.last_position is not None:
+                result = self._search_floor(self.last_position.z, crop, self.last_position)
+
+            # Busca global: todos os andares, começando pelo atual
+            if result is None:
+                floors = sorted(self.floors, key=lambda z: (
+                    abs(z - self.last_position.z) if self.last_position else 0))
+                for z in floors:
+                    result = self._search_floor(z, crop, None)
+                    if result is not None:
+                        break
+
+            if result is None:
+                return None
+
+            position, confidence = result
+            self.last_position = position
+            self.last_confidence = confidence
+            return position
+
+        except Exception as e:
+            self.logger.error(f"Erro na localização pelo minimapa: {e}")
+            return None
+
+    def _prepare_crop(self, minimap: np.ndarray) -> Optional[np.ndarray]:
+        """Converte recorte para escala de cinza em 1 pixel por SQM"""
+        if minimap is None or minimap.size == 0:
+            return None
+
+        gray = cv2.cvtColor(minimap, cv2.COLOR_BGR2GRAY) if minimap.ndim == 3 else minimap
+        if self.minimap_zoom != 1.0:
+            gray = cv2.resize(gray, None, fx=1.0 / self.minimap_zoom, fy=1.0 / self.minimap_zoom,
+                              interpolation=cv2.INTER_AREA)
+        return gray.astype(np.float32)
+
+    def _floor_image(self, z: int) -> Optional[np.ndarray]:
+        """Carrega imagem do andar sob demanda"""
+        floor = self.floors.get(z)
+        if floor is None:
+            return None
+        if floor.image is None:
+            if not os.path.exists(floor.path):
+                self.logger.error(f"Mapa do andar {z} não encontrado: {floor.path}")
+                return None
+            floor.image = cv2.imread(floor.path, cv2.IMREAD_GRAYSCALE)
+        return floor.image
+
+    def _search_floor(self, z: int, crop: np.ndarray,
+                      around: Optional[Position]) -> Optional[Tuple[Position, float]]:
+        """Registra o recorte em uma janela do andar (ou no andar inteiro)"""
+        image = self._floor_image(z)
+        if image is None:
+            return None
+
+        floor = self.floors[z]
+        crop_h, crop_w = crop.shape
+        center_x, center_y = crop_w // 2, crop_h // 2
+
+        if around is not None:
+            # Janela = recorte deslocado em até search_radius SQMs
+            left = around.x - floor.origin_x - center_x - self.search_radius
+            top = around.y - floor.origin_y - center_y - self.search_radius
+            width = crop_w + 2 * self.search_radius
+            height = crop_h + 2 * self.search_radius
+        else:
+            left, top = 0, 0
+            height, width = image.shape
+
+        left = max(0, left)
+        top = max(0, top)
+        window = image[top:top + height, left:left + width]
+        if window.shape[0] < crop_h or window.shape[1] < crop_w:
+            return None
+
+        if around is not None:
+            dx, dy = self._phase_correlate(window.astype(np.float32), crop)
+        else:
+            # Andar inteiro: correlação normalizada é mais robusta que FFT gigante
+            result = cv2.matchTemplate(window, crop.astype(np.uint8), cv2.TM_CCOEFF_NORMED)
+            _, _, _, (dx, dy) = cv2.minMaxLoc(result)
+
+        if dx + crop_w > window.shape[1] or dy + crop_h > window.shape[0]:
+            return None
+
+        confidence = self._normalized_correlation(window[dy:dy + crop_h, dx:dx + crop_w], crop)
+        if confidence < self.min_confidence:
+            return None
+
+        position = Position(
+            floor.origin_x + left + dx + center_x,
+            floor.origin_y + top + dy + center_y,
+            z
+        )
+        return position, confidence
+
+    def _phase_correlate(self, window: np.ndarray, crop: np.ndarray) -> Tuple[int, int]:
+        """Deslocamento (dx, dy) do recorte dentro da janela via correlação de fase"""
+        crop = crop - crop.mean()
+        padded = np.zeros_like(window)
+        padded[:crop.shape[0], :crop.shape[1]] = crop
+
+        window_fft = np.fft.rfft2(window - window.mean())
+        crop_fft = np.fft.rfft2(padded)
+        cross_power = window_fft * np.conj(crop_fft)
+        cross_power /= np.abs(cross_power) + 1e-9
+
+        response = np.fft.irfft2(cross_power, s=window.shape)
+        dy, dx = np.unravel_index(np.argmax(response), response.shape)
+        return int(dx), int(dy)
+
+    @staticmethod
+    def _normalized_correlation(patch: np.ndarray, crop: np.ndarray) -> float:
+        """Correlação normalizada entre o trecho do mapa e o recorte"""
+        a = patch.astype(np.float32) - patch.mean()
+        b = crop - crop.mean()
+        denominator = np.sqrt((a * a).sum() * (b * b).sum())
+        if denominator == 0:
+            return 0.0
+        return float((a * b).sum() / denominator)
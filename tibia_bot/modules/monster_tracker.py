@@ -0,0 +1,141 @@
+"""
+Monster Tracker - Rastreamento de monstros entre frames
+Associa detecções por centróide a trilhas com ID estável e prevê a posição
+(velocidade constante) nos frames sem detecção completa
+"""
+
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (nome, x, y, confiança)
+Detection = Tuple[str, float, float, float]
+
+@dataclass
+class Track:
+    """Monstro rastreado"""
+    id: int
+    name: str
+    x: float
+    y: float
+    confidence: float
+    last_seen: float
+    vx: float = 0.0             # Pixels por segundo
+    vy: float = 0.0
+    hits: int = 1
+    misses: int = 0             # Detecções completas seguidas sem associação
+
+    def predict(self, now: float, horizon: float = float('inf')) -> Tuple[float, float]:
+        """Posição prevista no instante `now` (extrapolação limitada a `horizon` segundos)"""
+        dt = min(max(now - self.last_seen, 0.0), horizon)
+        return self.x + self.vx * dt, self.y + self.vy * dt
+
+class MonsterTracker:
+    """Associação de detecções a trilhas (vizinho mais próximo, por nome)"""
+
+    def __init__(self, max_distance: float = 48.0, max_misses: int = 2,
+                 velocity_smoothing: float = 0.5, max_speed: float = 400.0,
+                 max_prediction: float = 1.0):
+        self.max_distance = max_distance          # Distância máxima para associar (pixels)
+        self.max_misses = max_misses              # Detecções perdidas até descartar a trilha
+        self.velocity_smoothing = velocity_smoothing
+        self.max_speed = max_speed                # Limite da velocidade estimada (px/s)
+        self.max_prediction = max_prediction      # Extrapolação máxima sem nova medida (s)
+
+        self.tracks: Dict[int, Track] = {}
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+    def get(self, track_id: int) -> Optional[Track]:
+        """Trilha ativa pelo ID"""
+        return self.tracks.get(track_id)
+
+    def update(self, detections: Sequence[Detection], now: Optional[float] = None) -> List[Track]:
+        """
+        Incorpora detecções de uma varredura completa
+        Retorna as trilhas ativas (novas, atualizadas e ainda em tolerância)
+        """
+        now = time.time() if now is None else now
+        matched_tracks = set()
+        matched_detections = set()
+
+        # Associação gulosa pela menor distância, separada por tipo de monstro
+        names = {d[0] for d in detections} | {t.name for t in self.tracks.values()}
+        for name in names:
+            track_ids = [tid for tid, t in self.tracks.items() if t.name == name]
+            det_indices = [i for i, d in enumerate(detections) if d[0] == name]
+            if not track_ids or not det_indices:
+                continue
+
+            predicted = np.array([self.tracks[tid].predict(now, self.max_prediction) for tid in track_ids])
+            measured = np.array([(detections[i][1], detections[i][2]) for i in det_indices], dtype=np.float64)
+            distances = np.linalg.norm(predicted[:, None, :] - measured[None, :, :], axis=2)
+
+            for flat in np.argsort(distances, axis=None):
+                row, col = divmod(int(flat), len(det_indices))
+                if distances[row, col] > self.max_distance:
+                    break
+                track_id, det_index = track_ids[row], det_indices[col]
+                if track_id in matched_tracks or det_index in matched_detections:
+                    continue
+                self._correct(self.tracks[track_id], detections[det_index], now)
+                matched_tracks.add(track_id)
+                matched_detections.add(det_index)
+
+        # Trilhas sem detecção: tolerância de algumas varreduras (oclusão, falha de match)
+        for track_id in list(self.tracks):
+            if track_id not in matched_tracks:
+                track = self.tracks[track_id]
+                track.misses += 1
+                if track.misses > self.max_misses:
+                    del self.tracks[track_id]
+
+        # Detecções sem trilha: novos monstros
+        for index, (name, x, y, confidence) in enumerate(detections):
+            if index not in matched_detections:
+                track = Track(next(self._ids), name, float(x), float(y), float(confidence), now)
+                self.tracks[track.id] = track
+
+        return list(self.tracks.values())
+
+    def observe(self, track_id: int, x: float, y: float, confidence: float,
+                now: Optional[float] = None) -> bool:
+        """Atualiza uma trilha com medida local (sem varredura completa)"""
+        track = self.tracks.get(track_id)
+        if track is None:
+            return False
+        self._correct(track, (track.name, x, y, confidence), time.time() if now is None else now)
+        return True
+
+    def _correct(self, track: Track, detection: Detection, now: float):
+        """Atualiza trilha com a nova medida (posição e velocidade suavizada)"""
+        _, x, y, confidence = detection
+        dt = now - track.last_seen
+        if dt > 1e-3:
+            alpha = self.velocity_smoothing
+            vx = alpha * (x - track.x) / dt + (1 - alpha) * track.vx
+            vy = alpha * (y - track.y) / dt + (1 - alpha) * track.vy
+            speed = np.hypot(vx, vy)
+            if speed > self.max_speed:
+                vx, vy = vx * self.max_speed / speed, vy * self.max_speed / speed
+            track.vx, track.vy = vx, vy
+
+        track.x, track.y = float(x), float(y)
+        track.confidence = float(confidence)
+        track.last_seen = now
+        track.hits += 1
+        track.misses = 0
+
+    def predict(self, now: Optional[float] = None) -> List[Tuple[Track, float, float]]:
+        """Trilhas ativas com a posição prevista para `now`"""
+        now = time.time() if now is None else now
+        return [(track, *track.predict(now, self.max_prediction)) for track in self.tracks.values()]
+
+    def clear(self):
+        """Descarta todas as trilhas"""
+        self.tracks.clear()
@@ -0,0 +1,280 @@
+"""
+Pathfinding - Busca de caminho para o cavebot
+A* com Jump Point Search em grade de SQMs com custo uniforme
+"""
+
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+from modules.tile_map import Position
+
+# Direções de movimento (4 vizinhos, igual às setas do teclado)
+DIRECTION_KEYS = {
+    (0, -1): 'up',
+    (0, 1): 'down',
+    (-1, 0): 'left',
+    (1, 0): 'right',
+}
+
+Tile = Tuple[int, int]
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+class WalkabilityGrid:
+    """
+    Grade de caminhabilidade por andar
+    SQMs desconhecidos são considerados livres; bloqueios são descobertos
+    durante a caminhada. Cada andar tem uma versão que muda a cada alteração.
+    """
+
+    def __init__(self):
+        self._blocked: Dict[int, Set[Tile]] = {}
+        self._versions: Dict[int, int] = {}
+
+    def is_walkable(self, x: int, y: int, z: int) -> bool:
+        """Verifica se o SQM é caminhável"""
+        return (x, y) not in self._blocked.get(z, ())
+
+    def mark_blocked(self, position: Position):
+        """Marca SQM como bloqueado"""
+        blocked = self._blocked.setdefault(position.z, set())
+        if (position.x, position.y) not in blocked:
+            blocked.add((position.x, position.y))
+            self._versions[position.z] = self._versions.get(position.z, 0) + 1
+
+    def mark_walkable(self, position: Position):
+        """Marca SQM como caminhável (jogador pisou nele)"""
+        blocked = self._blocked.get(position.z)
+        if blocked and (position.x, position.y) in blocked:
+            blocked.discard((position.x, position.y))
+            self._versions[position.z] = self._versions.get(position.z, 0) + 1
+
+    def version(self, z: int) -> int:
+        """Versão atual do andar"""
+        return self._versions.get(z, 0)
+
+    def blocked_count(self, z: int) -> int:
+        """Quantidade de SQMs bloqueados conhecidos no andar"""
+        return len(self._blocked.get(z, ()))
+
+    def clear_floor(self, z: int):
+        """Esquece bloqueios de um andar"""
+        if self._blocked.pop(z, None):
+            self._versions[z] = self._versions.get(z, 0) + 1
+
+class PathFinder:
+    """
+    Jump Point Search para grade de 4 vizinhos
+
+    A busca fica limitada a uma janela ao redor da origem e do destino,
+    já que SQMs desconhecidos são livres e a grade seria infinita.
+    """
+
+    def __init__(self, grid: WalkabilityGrid, search_margin: int = 20, max_expansions: int = 20000):
+        self.grid = grid
+        self.search_margin = search_margin
+        self.max_expansions = max_expansions
+
+    def find_path(self, start: Position, goal: Position) -> Optional[List[Position]]:
+        """Retorna lista de SQMs de start (exclusivo) até goal (inclusivo)"""
+        if not start.same_floor(goal):
+            return None
+        if start == goal:
+            return []
+
+        if not self.grid.is_walkable(goal.x, goal.y, start.z):
+            return None
+
+        # Tentar janela normal e, se não houver caminho, uma janela maior
+        for margin in (self.search_margin, self.search_margin * 4):
+            path = self._search(start, goal, margin)
+            if path is not None:
+                return path
+        return None
+
+    def _search(self, start: Position, goal: Position, margin: int) -> Optional[List[Position]]:
+        """Busca JPS dentro da janela definida pela margem"""
+        z = start.z
+        self._bounds = (
+            min(start.x, goal.x) - margin, min(start.y, goal.y) - margin,
+            max(start.x, goal.x) + margin, max(start.y, goal.y) + margin
+        )
+        self._z = z
+        self._goal = (goal.x, goal.y)
+
+        origin = (start.x, start.y)
+        open_heap = [(self._heuristic(origin), 0, origin)]
+        g_score = {origin: 0}
+        parents: Dict[Tile, Optional[Tile]] = {origin: None}
+        closed: Set[Tile] = set()
+        expansions = 0
+
+        while open_heap:
+            _, g, node = heapq.heappop(open_heap)
+            if node in closed:
+                continue
+            if node == self._goal:
+                return self._expand(parents, node, z)
+
+            closed.add(node)
+            expansions += 1
+            if expansions > self.max_expansions:
+                return None
+
+            for neighbor in self._neighbors(node, parents[node]):
+                jump_point = self._jump(neighbor, node)
+                if jump_point is None or jump_point in closed:
+                    continue
+
+                cost = g + abs(jump_point[0] - node[0]) + abs(jump_point[1] - node[1])
+                if cost < g_score.get(jump_point, float('inf')):
+                    g_score[jump_point] = cost
+                    parents[jump_point] = node
+                    heapq.heappush(open_heap, (cost + self._heuristic(jump_point), cost, jump_point))
+
+        return None
+
+    def _walkable(self, x: int, y: int) -> bool:
+        min_x, min_y, max_x, max_y = self._bounds
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        return self.grid.is_walkable(x, y, self._z)
+
+    def _heuristic(self, tile: Tile) -> int:
+        return abs(tile[0] - self._goal[0]) + abs(tile[1] - self._goal[1])
+
+    def _neighbors(self, node: Tile, parent: Optional[Tile]) -> List[Tile]:
+        """Vizinhos podados conforme a direção de chegada"""
+        x, y = node
+        if parent is None:
+            candidates = [(x + dx, y + dy) for dx, dy in DIRECTION_KEYS]
+        else:
+            dx = _sign(x - parent[0])
+            dy = _sign(y - parent[1])
+            if dx != 0:
+                candidates = [(x, y - 1), (x, y + 1), (x + dx, y)]
+            else:
+                candidates = [(x - 1, y), (x + 1, y), (x, y + dy)]
+        return [c for c in candidates if self._walkable(*c)]
+
+    def _jump(self, tile: Tile, parent: Tile) -> Optional[Tile]:
+        """Avança em linha reta até encontrar um jump point"""
+        x, y = tile
+        dx = x - parent[0]
+        dy = y - parent[1]
+
+        while True:
+            if not self._walkable(x, y):
+                return None
+            if (x, y) == self._goal:
+                return (x, y)
+
+            if dx != 0:
+                # Vizinho forçado ao lado de um obstáculo que acabou
+                if ((self._walkable(x, y - 1) and not self._walkable(x - dx, y - 1)) or
+                        (self._walkable(x, y + 1) and not self._walkable(x - dx, y + 1))):
+                    return (x, y)
+            else:
+                if ((self._walkable(x - 1, y) and not self._walkable(x - 1, y - dy)) or
+                        (self._walkable(x + 1, y) and not self._walkable(x + 1, y - dy))):
+                    return (x, y)
+                # Em movimento vertical, verificar jump points horizontais
+                if self._jump((x + 1, y), (x, y)) or self._jump((x - 1, y), (x, y)):
+                    return (x, y)
+
+            x += dx
+            y += dy
+
+    def _expand(self, parents: Dict[Tile, Optional[Tile]], node: Tile, z: int) -> List[Position]:
+        """Reconstrói caminho completo interpolando entre jump points"""
+        jump_points = []
+        while node is not None:
+            jump_points.append(node)
+            node = parents[node]
+        jump_points.reverse()
+
+        path = []
+        for (x0, y0), (x1, y1) in zip(jump_points, jump_points[1:]):
+            dx, dy = _sign(x1 - x0), _sign(y1 - y0)
+            x, y = x0, y0
+            while (x, y) != (x1, y1):
+                x += dx
+                y += dy
+                path.append(Position(x, y, z))
+        return path
+
+class PathPlanner:
+    """
+    Planejamento com cache por andar e replanejamento incremental
+
+    O caminho até o destino atual é mantido enquanto o jogador estiver
+    sobre ele. Quando a grade do andar muda, apenas o trecho restante
+    é verificado; o replanejamento só acontece se algum SQM dele foi bloqueado.
+    """
+
+    def __init__(self, grid: Optional[WalkabilityGrid] = None, max_cached_paths: int = 32, **finder_options):
+        self.grid = grid or WalkabilityGrid()
+        self.finder = PathFinder(self.grid, **finder_options)
+        self.max_cached_paths = max_cached_paths
+        # andar -> destino -> (versão da grade, caminho, índice por posição)
+        self._cache: Dict[int, Dict[Position, Tuple[int, List[Position], Dict[Position, int]]]] = {}
+
+    def plan(self, start: Position, goal: Position) -> Optional[List[Position]]:
+        """Retorna caminho restante de start até goal"""
+        floor_cache = self._cache.setdefault(start.z, {})
+        cached = floor_cache.get(goal)
+
+        if cached is not None:
+            version, path, index = cached
+            position_index = index.get(start)
+            if position_index is not None:
+                remaining = path[position_index + 1:]
+                current_version = self.grid.version(start.z)
+                if version == current_version or all(
+                        self.grid.is_walkable(p.x, p.y, p.z) for p in remaining):
+                    floor_cache[goal] = (current_version, path, index)
+                    return remaining
+
+        path = self.finder.find_path(start, goal)
+        if path is None:
+            floor_cache.pop(goal, None)
+            return None
+
+        if len(floor_cache) >= self.max_cached_paths:
+            floor_cache.pop(next(iter(floor_cache)))
+        full_path = [start] + path
+        floor_cache[goal] = (
+            self.grid.version(start.z),
+            full_path,
+            {p: i for i, p in enumerate(full_path)}
+        )
+        return path
+
+    def invalidate(self, z: Optional[int] = None):
+        """Descarta caminhos em cache (de um andar ou de todos)"""
+        if z is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(z, None)
+
+    @staticmethod
+    def path_to_directions(start: Position, path: List[Position]) -> List[str]:
+        """Converte caminho em sequência de direções ('up', 'down', ...)"""
+        directions = []
+        previous = start
+        for position in path:
+            directions.append(DIRECTION_KEYS[(position.x - previous.x, position.y - previous.y)])
+            previous = position
+        return directions
+
+    @staticmethod
+    def click_target(start: Position, path: List[Position],
+                     max_dx: int = 7, max_dy: int = 5) -> Optional[Position]:
+        """Último SQM do caminho ainda visível na tela (para andar por clique)"""
+        target = None
+        for position in path:
+            if abs(position.x - start.x) > max_dx or abs(position.y - start.y) > max_dy:
+                break
+            target = position
+        return target
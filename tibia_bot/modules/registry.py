@@ -0,0 +1,92 @@
+"""
+Module Registry - Registro dos módulos do bot
+Cada módulo declara nome, prioridade, frequência e ROIs sem ser importado;
+a classe só é carregada quando o módulo é ativado pela primeira vez.
+
+Plugins externos podem registrar módulos pelo entry point 'tibia_bot.modules',
+apontando para um ModuleSpec.
+"""
+
+import logging
+from dataclasses import dataclass
+from importlib import metadata
+from typing import Dict, List, Optional, Tuple
+
+ENTRY_POINT_GROUP = "tibia_bot.modules"
+
+@dataclass(frozen=True)
+class ModuleSpec:
+    """Declaração de um módulo do bot"""
+    name: str
+    module_path: str                # Módulo Python com a classe
+    class_name: str
+    label: str = ""                 # Nome exibido na interface
+    priority: int = 100             # Menor executa primeiro no ciclo
+    tick_rate: float = 0.0          # Execuções por segundo (0 = todo ciclo)
+    rois: Tuple[str, ...] = ()      # ROIs da tela usadas pelo módulo
+    unload_on_disable: bool = True  # Descarregar (liberar templates/buffers) ao desativar
+
+    @property
+    def tick_interval(self) -> float:
+        """Intervalo mínimo entre execuções (segundos)"""
+        return 1.0 / self.tick_rate if self.tick_rate > 0 else 0.0
+
+# Módulos nativos. Cavebot e Auto Loot ficam carregados ao desativar
+# (script carregado e lista de itens editada vivem na instância)
+BUILTIN_MODULES = (
+    ModuleSpec('auto_heal', 'modules.auto_heal', 'AutoHeal', 'Auto Heal',
+               priority=10, rois=('health_bar',)),
+    ModuleSpec('auto_mana', 'modules.auto_mana', 'AutoMana', 'Auto Mana',
+               priority=20, rois=('mana_bar',)),
+    ModuleSpec('auto_food', 'modules.auto_food', 'AutoFood', 'Auto Food',
+               priority=30, tick_rate=1.0, rois=('food_status',)),
+    ModuleSpec('cavebot', 'modules.cavebot', 'Cavebot', 'Cavebot',
+               priority=40, rois=('game_area', 'minimap'), unload_on_disable=False),
+    ModuleSpec('auto_loot', 'modules.auto_loot', 'AutoLoot', 'Auto Loot',
+               priority=50, rois=('loot_area',), unload_on_disable=False),
+)
+
+_registry: Dict[str, ModuleSpec] = {}
+_plugins_loaded = False
+
+def register_module(spec: ModuleSpec):
+    """Registra (ou substitui) a declaração de um módulo"""
+    _registry[spec.name] = spec
+
+def get_module_spec(name: str) -> Optional[ModuleSpec]:
+    """Declaração de um módulo pelo nome"""
+    _ensure_loaded()
+    return _registry.get(name)
+
+def registered_modules() -> List[ModuleSpec]:
+    """Módulos registrados, em ordem de prioridade"""
+    _ensure_loaded()
+    return sorted(_registry.values(), key=lambda spec: (spec.priority, spec.name))
+
+def _ensure_loaded():
+    """Registra módulos nativos e plugins na primeira consulta"""
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+
+    for spec in BUILTIN_MODULES:
+        _registry.setdefault(spec.name, spec)
+
+    logger = logging.getLogger(__name__)
+    try:
+        entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except Exception as e:
+        logger.error(f"Erro ao procurar plugins de módulo: {e}")
+        return
+
+    for entry_point in entry_points:
+        try:
+            spec = entry_point.load()
+            if not isinstance(spec, ModuleSpec):
+                logger.warning(f"Plugin {entry_point.name} ignorado: não aponta para um ModuleSpec")
+                continue
+            register_module(spec)
+            logger.info(f"Plugin de módulo registrado: {spec.name}")
+        except Exception as e:
+            logger.error(f"Erro ao carregar plugin {entry_point.name}: {e}")
@@ -0,0 +1,191 @@
+"""
+Rule Engine - Motor de regras por faixa de percentual
+Compila regras de cura/mana em uma tabela de decisão ordenada
+"""
+
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class ThresholdRule:
+    """Regra acionada quando o percentual monitorado está na faixa [min, max]"""
+    name: str
+    hotkey: str
+    min_percent: float = 0.0
+    max_percent: float = 100.0
+    cooldown_group: str = "default"
+    cooldown: float = 1.0
+    conditions: Tuple[Tuple[str, float, float], ...] = field(default_factory=tuple)
+    enabled: bool = True
+
+    def matches_conditions(self, context: Dict[str, float]) -> bool:
+        """Verifica condições extras (ex: mana mínima para magia de cura)"""
+        for key, low, high in self.conditions:
+            value = context.get(key)
+            if value is None or not (low <= value <= high):
+                return False
+        return True
+
+def rule_from_dict(data: Dict[str, Any]) -> ThresholdRule:
+    """
+    Converte entrada de configuração em regra
+    Condições aceitam o formato {"mana": [20, 100]}
+    """
+    conditions = tuple(
+        (key, float(bounds[0]), float(bounds[1]))
+        for key, bounds in data.get('conditions', {}).items()
+    )
+    return ThresholdRule(
+        name=data.get('name', data['hotkey']),
+        hotkey=data['hotkey'],
+        min_percent=float(data.get('min_percent', 0.0)),
+        max_percent=float(data.get('max_percent', 100.0)),
+        cooldown_group=data.get('cooldown_group', 'default'),
+        cooldown=float(data.get('cooldown', 1.0)),
+        conditions=conditions,
+        enabled=data.get('enabled', True),
+    )
+
+def build_legacy_rules(config: Dict[str, Any], threshold_key: str,
+                       cooldown: float, cooldown_group: str) -> List[ThresholdRule]:
+    """
+    Gera regras equivalentes às chaves antigas (emergência, poção, magia)
+    Mantém compatibilidade com configurações sem a lista 'rules'
+    """
+    rules = [
+        ThresholdRule(
+            name='emergency',
+            hotkey=config['emergency_hotkey'],
+            max_percent=config['emergency_threshold'],
+            cooldown_group=cooldown_group,
+            cooldown=cooldown,
+        )
+    ]
+
+    if config.get('use_potions'):
+        rules.append(ThresholdRule(
+            name='potion',
+            hotkey=config['potion_hotkey'],
+            max_percent=config[threshold_key],
+            cooldown_group=cooldown_group,
+            cooldown=cooldown,
+        ))
+    elif config.get('use_spells'):
+        rules.append(ThresholdRule(
+            name='spell',
+            hotkey=config['spell_hotkey'],
+            max_percent=config[threshold_key],
+            cooldown_group=cooldown_group,
+            cooldown=cooldown,
+        ))
+
+    return rules
+
+class RuleState:
+    """
+    Estado comum às tabelas de regras de cura e mana
+
+    - Última leitura de cada valor monitorado (vida, mana), usada nas
+      `conditions` das regras de qualquer módulo
+    - Cooldown por grupo: um grupo usado pela cura (ex: "potion") também
+      bloqueia as regras de mana do mesmo grupo
+    """
+
+    def __init__(self, max_age: float = 1.0):
+        self.max_age = max_age  # Leituras mais antigas (s) ficam fora do contexto
+        self.group_ready_at: Dict[str, float] = {}
+        self._values: Dict[str, Tuple[float, float]] = {}
+
+    def update(self, key: str, value: float, now: Optional[float] = None):
+        """Registra leitura de um valor monitorado"""
+        self._values[key] = (value, time.time() if now is None else now)
+
+    def context(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Leituras recentes de todos os valores monitorados"""
+        if now is None:
+            now = time.time()
+        return {key: value for key, (value, at) in self._values.items() if now - at <= self.max_age}
+
+class ThresholdRuleEngine:
+    """
+    Tabela de decisão compilada a partir de N regras ordenadas
+
+    Os extremos de todas as faixas formam uma lista ordenada de pontos.
+    Cada ponto e cada intervalo aberto entre pontos vizinhos recebe,
+    na compilação, a tupla de regras candidatas na ordem original.
+    A avaliação é uma busca binária seguida da checagem de cooldown.
+    Leituras e cooldowns ficam em `state`, compartilhado entre os módulos
+    pelo BotManager.
+    """
+
+    def __init__(self, rules: Optional[List[ThresholdRule]] = None,
+                 state: Optional[RuleState] = None):
+        self.rules: List[ThresholdRule] = []
+        self._points: List[float] = []
+        self._at_point: List[Tuple[ThresholdRule, ...]] = []
+        self._between: List[Tuple[ThresholdRule, ...]] = []
+        self.state = state if state is not None else RuleState()
+
+        if rules:
+            self.compile(rules)
+
+    def compile(self, rules: List[ThresholdRule]):
+        """Compila regras na tabela de decisão"""
+        self.rules = [rule for rule in rules if rule.enabled]
+        self._points = sorted({p for rule in self.rules
+                               for p in (rule.min_percent, rule.max_percent)})
+
+        # Regras que cobrem exatamente cada ponto
+        self._at_point = [
+            tuple(r for r in self.rules if r.min_percent <= p <= r.max_percent)
+            for p in self._points
+        ]
+
+        # Regras que cobrem o intervalo aberto antes de cada ponto
+        # (índice 0 e o último ficam fora de todas as faixas)
+        self._between = [()]
+        for low, high in zip(self._points, self._points[1:]):
+            self._between.append(
+                tuple(r for r in self.rules if r.min_percent <= low and r.max_percent >= high)
+            )
+        self._between.append(())
+
+    def candidates(self, value: float) -> Tuple[ThresholdRule, ...]:
+        """Retorna regras cuja faixa contém o valor, na ordem de prioridade"""
+        index = bisect_left(self._points, value)
+        if index < len(self._points) and self._points[index] == value:
+            return self._at_point[index]
+        return self._between[index]
+
+    def evaluate(self, value: float, context: Optional[Dict[str, float]] = None,
+                 now: Optional[float] = None) -> Optional[ThresholdRule]:
+        """
+        Retorna primeira regra aplicável e fora de cooldown
+        Sem `context`, as condições usam as leituras recentes do estado compartilhado
+        """
+        if now is None:
+            now = time.time()
+        if context is None:
+            context = self.state.context(now)
+
+        ready_at = self.state.group_ready_at
+        for rule in self.candidates(value):
+            if ready_at.get(rule.cooldown_group, 0.0) > now:
+                continue
+            if rule.conditions and not rule.matches_conditions(context):
+                continue
+            return rule
+
+        return None
+
+    def mark_used(self, rule: ThresholdRule, now: Optional[float] = None):
+        """Inicia cooldown do grupo da regra"""
+        if now is None:
+            now = time.time()
+        self.state.group_ready_at[rule.cooldown_group] = now + rule.cooldown
+
+    def reset_cooldowns(self):
+        """Limpa todos os cooldowns"""
+        self.state.group_ready_at.clear()
@@ -0,0 +1,96 @@
+"""
+Spatial - Agrupamento e filtragem de pontos da tela
+Substitui comparações par a par por hash em grade (NumPy), usado para
+candidatos de loot e ocorrências de template de monstros
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+def _as_points(points) -> np.ndarray:
+    """Converte lista de (x, y) em array (n, 2) de floats"""
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+def cluster_points(points, radius: float,
+                   scores: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Agrupa pontos a menos de `radius` uns dos outros
+    Retorna (centróides (k, 2), maior score de cada grupo), grupos em ordem de score
+
+    Os pontos são primeiro somados por célula de uma grade de lado `radius`
+    (O(n)); o centróide de cada célula ocupada só é comparado com os das 8
+    células vizinhas, únicas que podem estar a menos de `radius`
+    """
+    pts = _as_points(points)
+    if len(pts) == 0:
+        return np.empty((0, 2)), np.empty(0)
+    if scores is None:
+        point_scores = np.ones(len(pts))
+    else:
+        point_scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    radius = max(float(radius), 1e-6)
+
+    # 1) Hash em grade: soma de coordenadas, contagem e score máximo por célula
+    cells = np.floor(pts / radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    stride = int(cells[:, 1].max()) + 2     # Chave única por célula, vizinhas incluídas
+    keys, cell_index, counts = np.unique(cells[:, 0] * stride + cells[:, 1],
+                                         return_inverse=True, return_counts=True)
+    cell_index = cell_index.reshape(-1)
+    sums = np.zeros((len(counts), 2))
+    np.add.at(sums, cell_index, pts)
+    cell_scores = np.full(len(counts), -np.inf)
+    np.maximum.at(cell_scores, cell_index, point_scores)
+
+    # 2) Unir células vizinhas cujos centróides estão a menos de `radius`
+    # (gulosa pelo score, como supressão de não-máximos)
+    centers = sums / counts[:, None]
+    pairs_a, pairs_b = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbor_keys = keys + dx * stride + dy
+            found = np.minimum(np.searchsorted(keys, neighbor_keys), len(keys) - 1)
+            present = np.flatnonzero(keys[found] == neighbor_keys)
+            pairs_a.append(present)
+            pairs_b.append(found[present])
+    pairs_a = np.concatenate(pairs_a)
+    pairs_b = np.concatenate(pairs_b)
+    diff = centers[pairs_a] - centers[pairs_b]
+    close = np.einsum('ij,ij->i', diff, diff) < radius * radius
+    pairs_a, pairs_b = pairs_a[close], pairs_b[close]
+
+    # Vizinhos próximos de cada célula (inclui a própria), em listas contíguas
+    by_cell = np.argsort(pairs_a, kind='stable')
+    neighbors = pairs_b[by_cell]
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(pairs_a, minlength=len(keys)))))
+
+    order = np.lexsort((-counts, -cell_scores))
+    owner = np.full(len(counts), -1)
+    for cell in order:
+        if owner[cell] >= 0:
+            continue
+        members = neighbors[bounds[cell]:bounds[cell + 1]]
+        owner[members[owner[members] < 0]] = cell
+
+    # 3) Centróide ponderado pelo número de pontos de cada célula
+    keepers, group = np.unique(owner, return_inverse=True)
+    group = group.reshape(-1)
+    group_sums = np.zeros((len(keepers), 2))
+    np.add.at(group_sums, group, sums)
+    group_counts = np.bincount(group, weights=counts, minlength=len(keepers))
+    centroids = group_sums / group_counts[:, None]
+    group_scores = cell_scores[keepers]
+
+    ranking = np.argsort(-group_scores, kind='stable')
+    return centroids[ranking], group_scores[ranking]
+
+def within_radius(points, center: Tuple[float, float], radius: float) -> np.ndarray:
+    """Máscara dos pontos a até `radius` de `center`"""
+    pts = _as_points(points)
+    delta = pts - np.asarray(center, dtype=np.float64)
+    return np.einsum('ij,ij->i', delta, delta) <= radius * radius
+
+def to_int_points(points) -> List[Tuple[int, int]]:
+    """Converte array de pontos em lista de tuplas (x, y) inteiras"""
+    return [(int(x), int(y)) for x, y in np.rint(_as_points(points))]
@@ -0,0 +1,83 @@
+"""
+Tile Map - Modelo de mundo em coordenadas de SQM
+Converte entre pixels da área de jogo e posições (x, y, z) do mapa
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple, Dict
+
+SQM_SIZE = 32  # Pixels por SQM na área de jogo
+DEFAULT_FLOOR = 7  # Andar térreo do Tibia
+
+@dataclass(frozen=True)
+class Position:
+    """Posição no mapa do jogo, em SQMs"""
+    x: int
+    y: int
+    z: int = DEFAULT_FLOOR
+
+    def offset(self, dx: int, dy: int, dz: int = 0) -> 'Position':
+        """Retorna posição deslocada"""
+        return Position(self.x + dx, self.y + dy, self.z + dz)
+
+    def distance_to(self, other: 'Position') -> int:
+        """Distância em SQMs (Chebyshev, diagonais custam 1 passo)"""
+        return max(abs(self.x - other.x), abs(self.y - other.y))
+
+    def same_floor(self, other: 'Position') -> bool:
+        """Verifica se as posições estão no mesmo andar"""
+        return self.z == other.z
+
+class TileMap:
+    """Conversão entre coordenadas de tela e coordenadas do mundo"""
+
+    def __init__(self, sqm_size: int = SQM_SIZE):
+        self.sqm_size = sqm_size
+        # Pixel central do SQM do jogador (centro da área de jogo)
+        self.view_center: Optional[Tuple[int, int]] = None
+
+    def update_view(self, screen_image, game_area: Optional[Dict[str, int]] = None):
+        """Atualiza centro da visão a partir da ROI da área de jogo ou da tela"""
+        if game_area:
+            self.view_center = (
+                game_area['x'] + game_area['width'] // 2,
+                game_area['y'] + game_area['height'] // 2
+            )
+        else:
+            height, width = screen_image.shape[:2]
+            self.view_center = (width // 2, height // 2)
+
+    def screen_to_offset(self, px: int, py: int) -> Optional[Tuple[int, int]]:
+        """Converte pixel da tela em deslocamento de SQMs relativo ao jogador"""
+        if self.view_center is None:
+            return None
+        cx, cy = self.view_center
+        half = self.sqm_size / 2
+        return (
+            int((px - cx + half) // self.sqm_size),
+            int((py - cy + half) // self.sqm_size)
+        )
+
+    def screen_to_world(self, px: int, py: int, player: Position) -> Optional[Position]:
+        """Converte pixel da tela em posição do mundo"""
+        offset = self.screen_to_offset(px, py)
+        if offset is None:
+            return None
+        return player.offset(*offset)
+
+    def world_to_screen(self, position: Position, player: Position) -> Optional[Tuple[int, int]]:
+        """Converte posição do mundo no pixel central do SQM na tela"""
+        if self.view_center is None or not position.same_floor(player):
+            return None
+        cx, cy = self.view_center
+        return (
+            cx + (position.x - player.x) * self.sqm_size,
+            cy + (position.y - player.y) * self.sqm_size
+        )
+
+    def screen_distance(self, px: int, py: int) -> Optional[int]:
+        """Distância em SQMs entre um pixel da tela e o jogador"""
+        offset = self.screen_to_offset(px, py)
+        if offset is None:
+            return None
+        return max(abs(offset[0]), abs(offset[1]))
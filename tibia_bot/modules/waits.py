@@ -0,0 +1,137 @@
+"""
+Waits - Condições visuais aguardadas sem bloquear o loop do bot
+Tarefas de módulos (geradores) produzem uma condição; a corrotina do módulo
+a aguarda com ModuleContext.condition() e retoma a tarefa quando ela é
+satisfeita ou expira
+"""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import Generator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# (x, y, largura, altura) na tela
+Bounds = Tuple[int, int, int, int]
+
+# Tarefa de módulo: produz Waits e recebe o frame que satisfez a condição (None se expirou)
+Task = Generator['Wait', Optional[np.ndarray], object]
+
+def region_change(previous: np.ndarray, current: np.ndarray) -> float:
+    """Diferença média absoluta entre duas imagens da mesma região"""
+    if previous.shape != current.shape:
+        return float('inf')
+    return float(np.abs(current.astype(np.int16) - previous.astype(np.int16)).mean())
+
+def crop(image: np.ndarray, bounds: Bounds) -> np.ndarray:
+    """Recorte da região na imagem"""
+    x, y, width, height = bounds
+    return image[y:y + height, x:x + width]
+
+class Wait(ABC):
+    """Condição avaliada a cada frame do loop, com tempo limite"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self.deadline = float('inf')
+
+    def start(self, frame: np.ndarray, now: float):
+        """Chamado no ciclo em que a tarefa produziu a condição (frame anterior às ações)"""
+        if self.timeout is not None:
+            self.deadline = now + self.timeout
+
+    def poll(self, frame: np.ndarray, now: float) -> Optional[bool]:
+        """True = satisfeita, False = expirou, None = continuar aguardando"""
+        if self.check(frame, now):
+            return True
+        return False if now >= self.deadline else None
+
+    @abstractmethod
+    def check(self, frame: np.ndarray, now: float) -> bool:
+        """Condição satisfeita neste frame"""
+        pass
+
+class NextFrame(Wait):
+    """Retoma no próximo ciclo (cede o loop entre ações longas)"""
+
+    def check(self, frame: np.ndarray, now: float) -> bool:
+        return True
+
+class Delay(Wait):
+    """Pausa sem bloquear: retoma após `seconds`"""
+
+    def __init__(self, seconds: float):
+        super().__init__()
+        self.seconds = seconds
+        self.until = 0.0
+
+    def start(self, frame: np.ndarray, now: float):
+        self.until = now + self.seconds
+
+    def check(self, frame: np.ndarray, now: float) -> bool:
+        return now >= self.until
+
+class InputDone(Wait):
+    """Comando de input enfileirado terminou (future do InputSimulator)"""
+
+    def __init__(self, future: Future, timeout: Optional[float] = 2.0):
+        super().__init__(timeout)
+        self.future = future
+
+    def check(self, frame: np.ndarray, now: float) -> bool:
+        return self.future.done()
+
+class RegionChanged(Wait):
+    """
+    Região mudou em relação ao frame em que a espera começou
+    Com `settle`, exige ainda um frame estável depois da mudança (interface desenhada)
+    """
+
+    def __init__(self, bounds: Bounds, min_change: float = 8.0, settle: bool = True,
+                 timeout: Optional[float] = 1.0):
+        super().__init__(timeout)
+        self.bounds = bounds
+        self.min_change = min_change
+        self.settle = settle
+        self._baseline: Optional[np.ndarray] = None
+        self._changed: Optional[np.ndarray] = None
+
+    def start(self, frame: np.ndarray, now: float):
+        super().start(frame, now)
+        self._baseline = crop(frame, self.bounds).copy()
+
+    def check(self, frame: np.ndarray, now: float) -> bool:
+        region = crop(frame, self.bounds)
+        if region_change(self._baseline, region) < self.min_change:
+            return False
+        if not self.settle:
+            return True
+        if self._changed is not None and region_change(self._changed, region) < self.min_change / 2:
+            return True
+        self._changed = region.copy()
+        return False
+
+class TemplateVisible(Wait):
+    """Template aparece na região (ou na tela inteira); posição em `location`"""
+
+    def __init__(self, template: np.ndarray, bounds: Optional[Bounds] = None,
+                 threshold: float = 0.8, timeout: Optional[float] = 1.0):
+        super().__init__(timeout)
+        self.template = template
+        self.bounds = bounds
+        self.threshold = threshold
+        self.location: Optional[Tuple[int, int]] = None  # Centro do match na tela
+
+    def check(self, frame: np.ndarray, now: float) -> bool:
+        region = crop(frame, self.bounds) if self.bounds else frame
+        th, tw = self.template.shape[:2]
+        if region.shape[0] < th or region.shape[1] < tw:
+            return False
+        result = cv2.matchTemplate(region, self.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (mx, my) = cv2.minMaxLoc(result)
+        if score < self.threshold:
+            return False
+        ox, oy = self.bounds[:2] if self.bounds else (0, 0)
+        self.location = (ox + mx + tw // 2, oy + my + th // 2)
+        return True
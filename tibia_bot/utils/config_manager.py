@@ -1,27 +1,116 @@
 """
 Config Manager - Gerenciador de configurações
 Salva e carrega configurações em arquivo JSON
+Seções são publicadas como fotografias imutáveis, com aviso aos inscritos a cada alteração;
+o arquivo pode ser recarregado automaticamente quando editado fora da interface.
+Gravações são atômicas (arquivo temporário + os.replace) e alterações seguidas
+são agrupadas em uma única gravação
 """
 
+import atexit
+import copy
 import json
 import os
+import re
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional, List, Tuple
 import logging
 
+from utils.config_schema import validate_config
+
+def _freeze(value: Any) -> Any:
+    """Converte dicts/listas em equivalentes somente leitura"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+class ConfigSnapshot:
+    """
+    Fotografia imutável de uma seção de configuração
+    Valores lidos como atributos (snapshot.cycle_delay), sem parsing de chaves
+    """
+    
+    __slots__ = ('section', 'version', '_values', '_source')
+    
+    def __init__(self, section: str, values: Dict[str, Any], version: int = 0):
+        source = copy.deepcopy(values)
+        object.__setattr__(self, 'section', section)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_source', source)
+        object.__setattr__(self, '_values', {k: _freeze(v) for k, v in source.items()})
+    
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"Configuração '{self.section}' sem chave '{name}'") from None
+    
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("ConfigSnapshot é imutável")
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ConfigSnapshot) and self.section == other.section and self._source == other._source
+    
+    def __repr__(self) -> str:
+        return f"ConfigSnapshot({self.section!r}, v{self.version})"
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Valor de uma chave da seção"""
+        return self._values.get(key, default)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Cópia mutável dos valores"""
+        return copy.deepcopy(self._source)
+
+ConfigListener = Callable[[ConfigSnapshot], None]
+
+PROFILES_DIR = "profiles"
+_PROFILE_NAME = re.compile(r'^[\w\-]+$')
+
+def write_atomic(path: Path, text: str):
+    """Grava arquivo sem risco de deixá-lo pela metade (temporário + os.replace)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
 class ConfigManager:
     """Gerenciador de configurações do bot"""
     
-    def __init__(self, config_file: str = "config/bot_config.json"):
-        self.config_file = Path(config_file)
+    def __init__(self, config_file: str = "config/bot_config.json", profile: Optional[str] = None):
+        self.base_config_file = Path(config_file)
         self.logger = logging.getLogger(__name__)
         
+        # Perfil (ex: um por personagem): config/profiles/<nome>.json
+        if profile and not _PROFILE_NAME.match(profile):
+            raise ValueError(f"Nome de perfil inválido: {profile}")
+        self.profile = profile
+        self.config_file = self._profile_path(profile)
+        
         # Configurações padrão
         self.default_config = {
             'bot': {
                 'cycle_delay': 0.1,
+                'tick_budget': 0.05,        # Passo síncrono máximo esperado de um módulo (s)
                 'emergency_stop_key': 'F12',
                 'debug_mode': False,
+                'event_log': False,         # Telemetria binária em logs/events-*.bin
+                'event_log_dir': 'logs',
+                'hot_reload': True,         # Recarregar bot_config.json ao ser editado
+                'hot_reload_interval': 1.0,
+                'autosave': True,           # Gravar alterações automaticamente
+                'autosave_delay': 1.0,      # Agrupa alterações feitas dentro deste intervalo
             },
             'screen_capture': {
                 'obs_window_title': 'OBS Studio - Preview',
@@ -43,6 +132,7 @@ class ConfigManager:
                 'potion_hotkey': 'F1',
                 'spell_hotkey': 'F5',
                 'emergency_hotkey': 'F2',
+                'rules': [],
             },
             'auto_mana': {
                 'mana_threshold': 60,
@@ -52,6 +142,7 @@ class ConfigManager:
                 'potion_hotkey': 'F3',
                 'spell_hotkey': 'F6',
                 'emergency_hotkey': 'F4',
+                'rules': [],
             },
             'auto_food': {
                 'food_hotkey': 'F7',
@@ -65,13 +156,24 @@ class ConfigManager:
                 'use_optimized_loot': True,
                 'auto_open_corpses': True,
                 'pickup_all_items': False,
+                'corpse_ttl': 300.0,
+                'corpse_memory': 256,
+                'container_timeout': 0.6,
             },
             'cavebot': {
                 'attack_enabled': True,
                 'walk_speed': 1.0,
                 'attack_range': 5,
                 'stuck_threshold': 5.0,
-                'waypoint_precision': 10,
+                'waypoint_precision': 1,
+                'step_timeout': 1.0,
+                'click_to_walk': False,
+                'minimap_maps': {},
+                'minimap_zoom': 1.0,
+                'full_scan_interval': 3,
+                'local_match_margin': 48,
+                'local_match_threshold': 0.7,
+                'monster_source': 'screen',
                 'monster_priority': ['dragon', 'demon', 'hero'],
                 'avoid_monsters': ['ancient scarab'],
             },
@@ -91,10 +193,34 @@ class ConfigManager:
                 'game_area': None,
                 'loot_area': None,
                 'chat_area': None,
+                'minimap': None,
+                'battle_list': None,
+                'inventory': None,
+                'loot_container': None,
             }
         }
         
-        self.config = self.default_config.copy()
+        self.config = copy.deepcopy(self.default_config)
+        
+        # Fotografias por seção e inscritos em alterações
+        self._snapshots: Dict[str, ConfigSnapshot] = {}
+        self._listeners: Dict[str, List[ConfigListener]] = {}
+        self._version = 0
+        self._lock = threading.RLock()
+        
+        # Recarga automática (verificação de mtime em thread própria)
+        self._file_signature: Optional[Tuple[int, int]] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        
+        # Gravação adiada (alterações seguidas geram uma única gravação)
+        self._last_written: Optional[str] = None
+        self._save_due = 0.0
+        self._save_requested = threading.Event()
+        self._saver_thread: Optional[threading.Thread] = None
+        # Alterações em memória ainda não gravadas (chave com pontos -> valor)
+        self._unsaved: Dict[str, Any] = {}
+        
         self.load_config()
     
     def load_config(self) -> bool:
@@ -107,28 +233,45 @@ class ConfigManager:
                 self.logger.info("Arquivo de configuração criado com valores padrão")
                 return True
             
+            signature = self._read_signature()
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 loaded_config = json.load(f)
+            self._file_signature = signature
             
             # Mesclar com configurações padrão (para adicionar novas chaves)
-            self.config = self._merge_configs(self.default_config, loaded_config)
+            with self._lock:
+                self.config = self._merge_configs(self.default_config, loaded_config)
+                self._unsaved.clear()
+            self._publish()
+            
+            for issue in validate_config(self.config):
+                self.logger.warning(f"Configuração inválida: {issue}")
             
             self.logger.info(f"Configurações carregadas de: {self.config_file}")
             return True
             
         except Exception as e:
             self.logger.error(f"Erro ao carregar configurações: {e}")
-            self.config = self.default_config.copy()
+            self.config = copy.deepcopy(self.default_config)
+            self._publish()
             return False
     
     def save_config(self) -> bool:
-        """Salva configurações no arquivo"""
+        """Salva configurações no arquivo (imediatamente, de forma atômica)"""
         try:
-            # Criar diretório se não existir
-            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            # Gravação pendente fica coberta por esta
+            self._save_requested.clear()
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            with self._lock:
+                text = json.dumps(self.config, indent=2, ensure_ascii=False)
+                self._unsaved.clear()
+                if text == self._last_written and self._read_signature() == self._file_signature:
+                    return True  # Arquivo já está atualizado
+                
+                write_atomic(self.config_file, text)
+                self._last_written = text
+                # Não tratar a própria gravação como edição externa
+                self._file_signature = self._read_signature()
             
             self.logger.info(f"Configurações salvas em: {self.config_file}")
             return True
@@ -137,6 +280,45 @@ class ConfigManager:
             self.logger.error(f"Erro ao salvar configurações: {e}")
             return False
     
+    def request_save(self):
+        """Agenda gravação; pedidos seguidos são agrupados em uma só"""
+        delay = self.get('bot.autosave_delay', 1.0)
+        self._save_due = time.monotonic() + delay
+        self._save_requested.set()
+        
+        if self._saver_thread is None or not self._saver_thread.is_alive():
+            with self._lock:
+                if self._saver_thread is None or not self._saver_thread.is_alive():
+                    self._saver_thread = threading.Thread(target=self._saver_loop,
+                                                          name="ConfigSaver", daemon=True)
+                    self._saver_thread.start()
+                    atexit.register(self.flush)
+    
+    def flush(self) -> bool:
+        """Grava agora se houver gravação pendente"""
+        if self._save_requested.is_set():
+            return self.save_config()
+        return True
+    
+    def _saver_loop(self):
+        """Thread de gravação: espera as alterações pararem antes de gravar"""
+        while True:
+            self._save_requested.wait()
+            
+            # Adiar enquanto continuarem chegando pedidos
+            remaining = self._save_due - time.monotonic()
+            while remaining > 0:
+                time.sleep(remaining)
+                remaining = self._save_due - time.monotonic()
+            
+            if self._save_requested.is_set():
+                self.save_config()
+    
+    def _autosave(self):
+        """Agenda gravação após alteração, se habilitado"""
+        if self.get('bot.autosave', False):
+            self.request_save()
+    
     def get(self, key: str, default: Any = None) -> Any:
         """
         Obtém valor de configuração usando notação de ponto
@@ -163,17 +345,11 @@ class ConfigManager:
         Exemplo: set('auto_heal.health_threshold', 80)
         """
         try:
-            keys = key.split('.')
-            config_ref = self.config
-            
-            # Navegar até o penúltimo nível
-            for k in keys[:-1]:
-                if k not in config_ref:
-                    config_ref[k] = {}
-                config_ref = config_ref[k]
-            
-            # Definir valor final
-            config_ref[keys[-1]] = value
+            with self._lock:
+                self._apply_edit(self.config, key, value)
+                self._unsaved[key] = value
+            self._publish(key.split('.')[0])
+            self._autosave()
             
             self.logger.debug(f"Configuração atualizada: {key} = {value}")
             return True
@@ -182,6 +358,21 @@ class ConfigManager:
             self.logger.error(f"Erro ao definir configuração {key}: {e}")
             return False
     
+    @staticmethod
+    def _apply_edit(config: Dict[str, Any], key: str, value: Any):
+        """Define valor em um dicionário de configuração usando notação de ponto"""
+        keys = key.split('.')
+        config_ref = config
+        
+        # Navegar até o penúltimo nível
+        for k in keys[:-1]:
+            if k not in config_ref:
+                config_ref[k] = {}
+            config_ref = config_ref[k]
+        
+        # Definir valor final
+        config_ref[keys[-1]] = value
+    
     def get_section(self, section: str) -> Dict[str, Any]:
         """Obtém seção completa de configuração"""
         return self.config.get(section, {}).copy()
@@ -189,10 +380,15 @@ class ConfigManager:
     def set_section(self, section: str, values: Dict[str, Any]) -> bool:
         """Define valores de uma seção completa"""
         try:
-            if section not in self.config:
-                self.config[section] = {}
-            
-            self.config[section].update(values)
+            with self._lock:
+                if section not in self.config:
+                    self.config[section] = {}
+                
+                self.config[section].update(copy.deepcopy(values))
+                for key, value in values.items():
+                    self._unsaved[f"{section}.{key}"] = copy.deepcopy(value)
+            self._publish(section)
+            self._autosave()
             self.logger.info(f"Seção {section} atualizada")
             return True
             
@@ -203,7 +399,8 @@ class ConfigManager:
     def reset_to_defaults(self) -> bool:
         """Restaura configurações padrão"""
         try:
-            self.config = self.default_config.copy()
+            self.config = copy.deepcopy(self.default_config)
+            self._publish()
             self.save_config()
             self.logger.info("Configurações restauradas para padrão")
             return True
@@ -215,11 +412,7 @@ class ConfigManager:
     def export_config(self, export_path: str) -> bool:
         """Exporta configurações para arquivo"""
         try:
-            export_file = Path(export_path)
-            export_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(export_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            write_atomic(Path(export_path), json.dumps(self.config, indent=2, ensure_ascii=False))
             
             self.logger.info(f"Configurações exportadas para: {export_path}")
             return True
@@ -241,6 +434,7 @@ class ConfigManager:
             
             # Mesclar com configurações atuais
             self.config = self._merge_configs(self.config, imported_config)
+            self._publish()
             self.save_config()
             
             self.logger.info(f"Configurações importadas de: {import_path}")
@@ -252,16 +446,163 @@ class ConfigManager:
     
     def _merge_configs(self, base: Dict, override: Dict) -> Dict:
         """Mescla duas configurações recursivamente"""
-        result = base.copy()
+        result = copy.deepcopy(base)
         
         for key, value in override.items():
             if key in result and isinstance(result[key], dict) and isinstance(value, dict):
                 result[key] = self._merge_configs(result[key], value)
             else:
-                result[key] = value
+                result[key] = copy.deepcopy(value)
         
         return result
     
+    def snapshot(self, section: str) -> ConfigSnapshot:
+        """Fotografia imutável atual de uma seção"""
+        snapshot = self._snapshots.get(section)
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshots.get(section)
+                if snapshot is None:
+                    snapshot = ConfigSnapshot(section, self.config.get(section) or {}, self._version)
+                    self._snapshots[section] = snapshot
+        return snapshot
+    
+    def subscribe(self, section: str, listener: ConfigListener) -> Callable[[], None]:
+        """
+        Inscreve listener nas alterações de uma seção
+        O listener recebe a nova fotografia; retorna função para cancelar a inscrição
+        """
+        with self._lock:
+            self._listeners.setdefault(section, []).append(listener)
+        
+        def unsubscribe():
+            with self._lock:
+                listeners = self._listeners.get(section, [])
+                if listener in listeners:
+                    listeners.remove(listener)
+        
+        return unsubscribe
+    
+    def _publish(self, section: Optional[str] = None):
+        """Gera novas fotografias da seção (ou de todas) e avisa os inscritos das que mudaram"""
+        with self._lock:
+            self._version += 1
+            sections = [section] if section is not None else set(self.config) | set(self._snapshots)
+            
+            changed = []
+            for name in sections:
+                snapshot = ConfigSnapshot(name, self.config.get(name) or {}, self._version)
+                previous = self._snapshots.get(name)
+                self._snapshots[name] = snapshot
+                if previous is None or previous != snapshot:
+                    changed.append((snapshot, list(self._listeners.get(name, ()))))
+        
+        # Avisar fora do lock (listeners podem consultar o ConfigManager)
+        for snapshot, listeners in changed:
+            for listener in listeners:
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    self.logger.error(f"Erro ao notificar alteração de {snapshot.section}: {e}")
+    
+    def start_watching(self, interval: float = 1.0):
+        """Inicia recarga automática do arquivo quando ele for alterado"""
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, args=(interval,),
+                                              name="ConfigWatcher", daemon=True)
+        self._watch_thread.start()
+        self.logger.info(f"Recarga automática de {self.config_file} ativada")
+    
+    def stop_watching(self):
+        """Para recarga automática"""
+        self._watch_stop.set()
+        if self._watch_thread and self._watch_thread.is_alive():
+            self._watch_thread.join(timeout=2)
+    
+    def _read_signature(self) -> Optional[Tuple[int, int]]:
+        """Identificação da versão do arquivo (mtime, tamanho)"""
+        try:
+            stat = self.config_file.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    def _watch_loop(self, interval: float):
+        """Verifica alterações do arquivo periodicamente"""
+        while not self._watch_stop.wait(interval):
+            try:
+                signature = self._read_signature()
+                if signature is not None and signature != self._file_signature:
+                    self.reload_if_valid(signature)
+            except Exception as e:
+                self.logger.error(f"Erro ao verificar arquivo de configuração: {e}")
+    
+    def reload_if_valid(self, signature: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Relê o arquivo e substitui a configuração se ele for válido
+        Arquivo inválido é ignorado (configuração atual continua em uso).
+        Alterações em memória ainda não gravadas (autosave pendente) são
+        reaplicadas sobre o arquivo e gravadas junto com a edição externa.
+        """
+        signature = signature or self._read_signature()
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                loaded_config = json.load(f)
+            if not isinstance(loaded_config, dict):
+                raise ValueError("raiz do arquivo deve ser um objeto")
+        except Exception as e:
+            # Arquivo pode estar sendo gravado: nova tentativa na próxima alteração
+            self._file_signature = signature
+            self.logger.warning(f"Recarga ignorada, arquivo ilegível: {e}")
+            return False
+        
+        with self._lock:
+            merged = self._merge_configs(self.default_config, loaded_config)
+            for key, value in self._unsaved.items():
+                self._apply_edit(merged, key, copy.deepcopy(value))
+            issues = validate_config(merged)
+            self._file_signature = signature
+            if issues:
+                self.logger.warning(f"Recarga ignorada, configuração inválida: {'; '.join(issues)}")
+                return False
+            
+            self.config = merged
+            if self._unsaved:
+                self.logger.info(f"Alterações pendentes mantidas na recarga: {', '.join(self._unsaved)}")
+        self._publish()
+        self.logger.info(f"Configurações recarregadas de: {self.config_file}")
+        return True
+    
+    def _profile_path(self, profile: Optional[str]) -> Path:
+        """Arquivo de configuração do perfil (None = arquivo principal)"""
+        if not profile:
+            return self.base_config_file
+        return self.base_config_file.parent / PROFILES_DIR / f"{profile}.json"
+    
+    def list_profiles(self) -> List[str]:
+        """Perfis salvos"""
+        profiles_dir = self.base_config_file.parent / PROFILES_DIR
+        if not profiles_dir.is_dir():
+            return []
+        return sorted(path.stem for path in profiles_dir.glob("*.json"))
+    
+    def switch_profile(self, profile: Optional[str]) -> bool:
+        """Troca de perfil, gravando antes alterações pendentes do atual"""
+        if profile and not _PROFILE_NAME.match(profile):
+            self.logger.error(f"Nome de perfil inválido: {profile}")
+            return False
+        
+        self.flush()
+        with self._lock:
+            self.profile = profile
+            self.config_file = self._profile_path(profile)
+            self._file_signature = None
+            self._last_written = None
+        self.logger.info(f"Perfil de configuração: {profile or 'padrão'}")
+        return self.load_config()
+    
     def get_hotkey(self, action: str) -> Optional[str]:
         """Obtém hotkey para uma ação específica"""
         return self.get(f'hotkeys.{action}')
@@ -281,30 +622,7 @@ class ConfigManager:
     
     def validate_config(self) -> List[str]:
         """Valida configuração atual e retorna lista de problemas"""
-        issues = []
-        
         try:
-            # Validar hotkeys
-            hotkeys = self.get_section('hotkeys')
-            for action, hotkey in hotkeys.items():
-                if not isinstance(hotkey, str) or not hotkey.strip():
-                    issues.append(f"Hotkey inválida para {action}: {hotkey}")
-            
-            # Validar thresholds
-            heal_threshold = self.get('auto_heal.health_threshold', 0)
-            if not 0 < heal_threshold <= 100:
-                issues.append(f"Threshold de vida inválido: {heal_threshold}")
-            
-            mana_threshold = self.get('auto_mana.mana_threshold', 0)
-            if not 0 < mana_threshold <= 100:
-                issues.append(f"Threshold de mana inválido: {mana_threshold}")
-            
-            # Validar delays
-            cycle_delay = self.get('bot.cycle_delay', 0)
-            if cycle_delay < 0.01:
-                issues.append(f"Delay de ciclo muito baixo: {cycle_delay}")
-            
+            return validate_config(self.config)
         except Exception as e:
-            issues.append(f"Erro na validação: {e}")
-        
-        return issues
\ No newline at end of file
+            return [f"Erro na validação: {e}"]
@@ -0,0 +1,259 @@
+"""
+Config Schema - Esquema das configurações do bot
+Tipos, faixas e sintaxe de hotkeys de cada chave de default_config
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Hotkeys: modificadores opcionais + tecla (ex: F1, Ctrl+F1, Alt+Q, Space)
+_NAMED_KEYS = (
+    'space', 'enter', 'return', 'esc', 'escape', 'tab', 'backspace', 'delete', 'del',
+    'insert', 'home', 'end', 'pageup', 'pagedown', 'up', 'down', 'left', 'right',
+    'pause', 'printscreen',
+) + tuple(f'num{i}' for i in range(10))
+HOTKEY_PATTERN = re.compile(
+    r'^(?:(?:ctrl|alt|shift)\+)*(?:f(?:[1-9]|1[0-9]|2[0-4])|[a-z0-9]|' + '|'.join(_NAMED_KEYS) + r')$',
+    re.IGNORECASE
+)
+
+def is_valid_hotkey(value: Any) -> bool:
+    """Verifica sintaxe de uma hotkey"""
+    return isinstance(value, str) and bool(HOTKEY_PATTERN.match(value.strip()))
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """Regra de validação de uma chave"""
+    types: Tuple[type, ...]
+    min: Optional[float] = None
+    max: Optional[float] = None
+    nullable: bool = False
+    check: Optional[Callable[[Any], Optional[str]]] = None  # Validação extra (retorna erro)
+
+    def validate(self, value: Any) -> Optional[str]:
+        """Retorna descrição do problema ou None se válido"""
+        if value is None:
+            return None if self.nullable else "valor obrigatório"
+        # bool é subclasse de int: só aceito onde declarado
+        if isinstance(value, bool) and bool not in self.types:
+            return f"tipo inválido ({type(value).__name__})"
+        if not isinstance(value, self.types):
+            return f"tipo inválido ({type(value).__name__})"
+        if self.min is not None and value < self.min:
+            return f"deve ser >= {self.min} (recebido {value})"
+        if self.max is not None and value > self.max:
+            return f"deve ser <= {self.max} (recebido {value})"
+        if self.check is not None:
+            return self.check(value)
+        return None
+
+def _check_hotkey(value: str) -> Optional[str]:
+    return None if is_valid_hotkey(value) else f"hotkey inválida '{value}'"
+
+def _check_region(value: Dict[str, Any]) -> Optional[str]:
+    """Região da tela {x, y, width, height}"""
+    for key in ('x', 'y', 'width', 'height'):
+        if not isinstance(value.get(key), int) or isinstance(value.get(key), bool):
+            return f"região sem '{key}' inteiro"
+    if value['x'] < 0 or value['y'] < 0:
+        return "região com coordenadas negativas"
+    if value['width'] <= 0 or value['height'] <= 0:
+        return "região com tamanho inválido"
+    return None
+
+def _check_rules(value: List[Any]) -> Optional[str]:
+    """Regras de cura/mana (ver rule_engine.rule_from_dict)"""
+    for index, rule in enumerate(value):
+        if not isinstance(rule, dict):
+            return f"regra {index}: deve ser um objeto"
+        if not is_valid_hotkey(rule.get('hotkey')):
+            return f"regra {index}: hotkey inválida '{rule.get('hotkey')}'"
+        try:
+            low = float(rule.get('min_percent', 0.0))
+            high = float(rule.get('max_percent', 100.0))
+            cooldown = float(rule.get('cooldown', 1.0))
+            for bounds in rule.get('conditions', {}).values():
+                float(bounds[0]), float(bounds[1])
+        except (TypeError, ValueError, IndexError, AttributeError):
+            return f"regra {index}: valores numéricos inválidos"
+        if not 0 <= low <= high <= 100:
+            return f"regra {index}: faixa inválida [{low}, {high}]"
+        if cooldown < 0:
+            return f"regra {index}: cooldown negativo"
+    return None
+
+def _check_minimap_maps(value: Dict[str, Any]) -> Optional[str]:
+    """Mapas por andar: {"7": {"path", "origin_x", "origin_y"}}"""
+    for z, floor in value.items():
+        try:
+            int(z)
+        except ValueError:
+            return f"andar inválido '{z}'"
+        if not isinstance(floor, dict) or not isinstance(floor.get('path'), str):
+            return f"andar {z}: 'path' ausente"
+        if not isinstance(floor.get('origin_x'), int) or not isinstance(floor.get('origin_y'), int):
+            return f"andar {z}: origem inválida"
+    return None
+
+def _check_names(value: List[Any]) -> Optional[str]:
+    if not all(isinstance(name, str) for name in value):
+        return "lista deve conter apenas nomes"
+    return None
+
+def _check_monster_source(value: str) -> Optional[str]:
+    if value not in ('screen', 'battle_list'):
+        return f"fonte de monstros inválida '{value}' (use 'screen' ou 'battle_list')"
+    return None
+
+NUMBER = (int, float)
+BOOL = FieldSpec((bool,))
+TEXT = FieldSpec((str,))
+HOTKEY = FieldSpec((str,), check=_check_hotkey)
+ROI = FieldSpec((dict,), nullable=True, check=_check_region)
+
+def _percent(low: float = 0) -> FieldSpec:
+    return FieldSpec(NUMBER, min=low, max=100)
+
+SCHEMA: Dict[str, Dict[str, FieldSpec]] = {
+    'bot': {
+        'cycle_delay': FieldSpec(NUMBER, min=0.01, max=5.0),
+        'tick_budget': FieldSpec(NUMBER, min=0.001, max=5.0),
+        'emergency_stop_key': HOTKEY,
+        'debug_mode': BOOL,
+        'event_log': BOOL,
+        'event_log_dir': TEXT,
+        'hot_reload': BOOL,
+        'hot_reload_interval': FieldSpec(NUMBER, min=0.1, max=60.0),
+        'autosave': BOOL,
+        'autosave_delay': FieldSpec(NUMBER, min=0.0, max=60.0),
+    },
+    'screen_capture': {
+        'obs_window_title': TEXT,
+        'capture_region': ROI,
+        'min_capture_interval': FieldSpec(NUMBER, min=0.0, max=1.0),
+    },
+    'input_simulator': {
+        'mouse_speed_base': FieldSpec(NUMBER, min=0.0, max=5.0),
+        'mouse_speed_variance': FieldSpec(NUMBER, min=0.0, max=5.0),
+        'click_delay_base': FieldSpec(NUMBER, min=0.0, max=1.0),
+        'click_delay_variance': FieldSpec(NUMBER, min=0.0, max=1.0),
+        'humanize_by_default': BOOL,
+    },
+    'auto_heal': {
+        'health_threshold': _percent(1),
+        'emergency_threshold': _percent(),
+        'use_potions': BOOL,
+        'use_spells': BOOL,
+        'potion_hotkey': HOTKEY,
+        'spell_hotkey': HOTKEY,
+        'emergency_hotkey': HOTKEY,
+        'rules': FieldSpec((list,), check=_check_rules),
+    },
+    'auto_mana': {
+        'mana_threshold': _percent(1),
+        'emergency_threshold': _percent(),
+        'use_potions': BOOL,
+        'use_spells': BOOL,
+        'potion_hotkey': HOTKEY,
+        'spell_hotkey': HOTKEY,
+        'emergency_hotkey': HOTKEY,
+        'rules': FieldSpec((list,), check=_check_rules),
+    },
+    'auto_food': {
+        'food_hotkey': HOTKEY,
+        'check_interval': FieldSpec(NUMBER, min=0.5, max=3600),
+        'use_right_click': BOOL,
+        'food_inventory_slot': FieldSpec((int,), min=1, max=20),
+    },
+    'auto_loot': {
+        'loot_radius': FieldSpec(NUMBER, min=1, max=2000),
+        'loot_delay': FieldSpec(NUMBER, min=0.0, max=5.0),
+        'use_optimized_loot': BOOL,
+        'auto_open_corpses': BOOL,
+        'pickup_all_items': BOOL,
+        'corpse_ttl': FieldSpec(NUMBER, min=1.0, max=3600),
+        'corpse_memory': FieldSpec((int,), min=1, max=100000),
+        'container_timeout': FieldSpec(NUMBER, min=0.05, max=5.0),
+    },
+    'cavebot': {
+        'attack_enabled': BOOL,
+        'walk_speed': FieldSpec(NUMBER, min=0.1, max=10.0),
+        'attack_range': FieldSpec((int,), min=1, max=20),
+        'stuck_threshold': FieldSpec(NUMBER, min=0.5, max=120),
+        'waypoint_precision': FieldSpec((int,), min=0, max=10),
+        'step_timeout': FieldSpec(NUMBER, min=0.1, max=30),
+        'click_to_walk': BOOL,
+        'minimap_maps': FieldSpec((dict,), check=_check_minimap_maps),
+        'minimap_zoom': FieldSpec(NUMBER, min=0.25, max=8.0),
+        'full_scan_interval': FieldSpec((int,), min=1, max=30),
+        'local_match_margin': FieldSpec((int,), min=4, max=512),
+        'local_match_threshold': FieldSpec(NUMBER, min=0.0, max=1.0),
+        'monster_source': FieldSpec((str,), check=_check_monster_source),
+        'monster_priority': FieldSpec((list,), check=_check_names),
+        'avoid_monsters': FieldSpec((list,), check=_check_names),
+    },
+    'hotkeys': {
+        'start_stop_bot': HOTKEY,
+        'emergency_stop': HOTKEY,
+        'toggle_auto_heal': HOTKEY,
+        'toggle_auto_mana': HOTKEY,
+        'toggle_auto_food': HOTKEY,
+        'toggle_auto_loot': HOTKEY,
+        'toggle_cavebot': HOTKEY,
+    },
+    'rois': {
+        'health_bar': ROI,
+        'mana_bar': ROI,
+        'food_status': ROI,
+        'game_area': ROI,
+        'loot_area': ROI,
+        'chat_area': ROI,
+        'minimap': ROI,
+        'battle_list': ROI,
+        'inventory': ROI,
+        'loot_container': ROI,
+    },
+}
+
+def _check_emergency_below(threshold_key: str) -> Callable[[Dict[str, Any]], Optional[str]]:
+    def check(section: Dict[str, Any]) -> Optional[str]:
+        emergency, threshold = section.get('emergency_threshold'), section.get(threshold_key)
+        if isinstance(emergency, NUMBER) and isinstance(threshold, NUMBER) and emergency > threshold:
+            return f"emergency_threshold ({emergency}) maior que {threshold_key} ({threshold})"
+        return None
+    return check
+
+# Validações entre chaves da mesma seção
+SECTION_CHECKS: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {
+    'auto_heal': _check_emergency_below('health_threshold'),
+    'auto_mana': _check_emergency_below('mana_threshold'),
+}
+
+def validate_section(section: str, values: Any) -> List[str]:
+    """Valida uma seção; chaves fora do esquema são ignoradas"""
+    if not isinstance(values, dict):
+        return [f"{section}: deve ser um objeto"]
+
+    issues = []
+    for key, spec in SCHEMA.get(section, {}).items():
+        if key not in values:
+            continue
+        problem = spec.validate(values[key])
+        if problem:
+            issues.append(f"{section}.{key}: {problem}")
+
+    section_check = SECTION_CHECKS.get(section)
+    if section_check and not issues:
+        problem = section_check(values)
+        if problem:
+            issues.append(f"{section}: {problem}")
+    return issues
+
+def validate_config(config: Dict[str, Any]) -> List[str]:
+    """Valida configuração completa e retorna lista de problemas"""
+    issues = []
+    for section, values in config.items():
+        if section in SCHEMA:
+            issues.extend(validate_section(section, values))
+    return issues
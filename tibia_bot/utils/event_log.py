@@ -0,0 +1,408 @@
+"""
+Event Log - Telemetria estruturada em formato binário
+Eventos de frame, detecção, ação e mudança de estado com esquemas fixos,
+gravados como registros com prefixo de tamanho por uma thread própria.
+
+Leitura e agregados (ações/min, tempo em cada estado, latência de cura):
+    python -m utils.event_log logs/events-*.bin
+"""
+
+import argparse
+import glob
+import logging
+import os
+import struct
+import threading
+import time
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"TBEV"
+FORMAT_VERSION = 1
+
+_FILE_HEADER = struct.Struct("<4sB")       # magic, versão
+_RECORD_HEADER = struct.Struct("<HBd")     # tamanho do corpo, tipo, timestamp
+_FRAME = struct.Struct("<f")               # cycle_ms
+_COUNT = struct.Struct("<H")               # quantidade detectada
+_ACTION_VALUES = struct.Struct("<ff")      # valor, latência (ms)
+
+class EventType(IntEnum):
+    """Tipos de evento e seus esquemas"""
+    FRAME = 1       # cycle_ms
+    DETECTION = 2   # fonte, quantidade
+    ACTION = 3      # módulo, ação, valor, latência_ms
+    STATE = 4       # módulo, estado anterior, novo estado ("" = fora da máquina de estados)
+
+def _pack_str(value: str) -> bytes:
+    """String com prefixo de 1 byte (truncada em 255 bytes)"""
+    data = value.encode('utf-8')[:255]
+    return bytes((len(data),)) + data
+
+def _unpack_str(buffer, offset: int) -> Tuple[str, int]:
+    length = buffer[offset]
+    start = offset + 1
+    return bytes(buffer[start:start + length]).decode('utf-8', 'replace'), start + length
+
+class EventLog:
+    """
+    Gravador de eventos com buffer em memória
+
+    Quem emite só empacota o registro e o acrescenta à lista pendente;
+    a thread de gravação descarrega a lista no arquivo a cada flush_interval.
+    Se o limite de memória pendente for atingido, eventos são descartados e contados.
+    Cada arquivo novo começa com o estado atual de cada módulo, de forma que
+    um arquivo lido sozinho também contabiliza o tempo em cada estado.
+    """
+
+    def __init__(self, directory: str = "logs", max_file_size: int = 256 * 1024 * 1024,
+                 flush_interval: float = 1.0, max_pending_bytes: int = 4 * 1024 * 1024):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.max_file_size = max_file_size
+        self.flush_interval = flush_interval
+        self.max_pending_bytes = max_pending_bytes
+        self.dropped = 0
+
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._states: Dict[str, str] = {}  # Estado atual de cada módulo (repetido em cada arquivo)
+        self._lock = threading.Lock()
+
+        self._file = None
+        self._file_size = 0
+        self._file_index = 0
+        self.current_path = ""
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    # Emissão (chamada pelos módulos, não faz I/O)
+    def frame(self, cycle_ms: float):
+        """Registra um ciclo do loop principal"""
+        self._emit(EventType.FRAME, _FRAME.pack(cycle_ms))
+
+    def detection(self, source: str, count: int):
+        """Registra resultado de uma detecção (ex: monstros visíveis)"""
+        self._emit(EventType.DETECTION, _pack_str(source) + _COUNT.pack(min(count, 0xFFFF)))
+
+    def action(self, module: str, action: str, value: float = 0.0, latency_ms: float = 0.0):
+        """Registra ação executada; latency_ms = tempo desde que a ação se tornou necessária"""
+        self._emit(EventType.ACTION,
+                   _pack_str(module) + _pack_str(action) + _ACTION_VALUES.pack(value, latency_ms))
+
+    def state(self, module: str, old: str, new: str):
+        """Registra transição de estado (old = "" no início do módulo, new = "" ao encerrar)"""
+        with self._lock:
+            if new:
+                self._states[module] = new
+            else:
+                self._states.pop(module, None)
+        self._emit(EventType.STATE, _pack_str(module) + _pack_str(old) + _pack_str(new))
+
+    def _emit(self, event_type: EventType, payload: bytes):
+        record = _RECORD_HEADER.pack(len(payload), event_type, time.time()) + payload
+        with self._lock:
+            if self._pending_bytes + len(record) > self.max_pending_bytes:
+                self.dropped += 1
+                return
+            self._pending.append(record)
+            self._pending_bytes += len(record)
+
+    # Gravação
+    def start(self):
+        """Inicia thread de gravação"""
+        if self._thread and self._thread.is_alive():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="EventLog", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Log de eventos ativo em {self.directory}")
+
+    def stop(self):
+        """Para thread de gravação, descarregando eventos pendentes"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Grava eventos pendentes no arquivo atual"""
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+            self._pending_bytes = 0
+        if not pending:
+            return
+
+        try:
+            if self._file is None or self._file_size >= self.max_file_size:
+                self._open_next_file(_RECORD_HEADER.unpack_from(pending[0])[2])
+            data = b"".join(pending)
+            self._file.write(data)
+            self._file.flush()
+            self._file_size += len(data)
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar log de eventos: {e}")
+
+    def _open_next_file(self, timestamp: float):
+        """Abre novo arquivo (rotação por tamanho) com o estado atual de cada módulo"""
+        if self._file:
+            self._file.close()
+        self._file_index += 1
+        name = f"events-{time.strftime('%Y%m%d-%H%M%S')}-{self._file_index:03d}.bin"
+        self.current_path = os.path.join(self.directory, name)
+        self._file = open(self.current_path, 'wb')
+
+        with self._lock:
+            states = list(self._states.items())
+        header = [_FILE_HEADER.pack(MAGIC, FORMAT_VERSION)]
+        for module, state in states:
+            payload = _pack_str(module) + _pack_str("") + _pack_str(state)
+            header.append(_RECORD_HEADER.pack(len(payload), EventType.STATE, timestamp) + payload)
+        data = b"".join(header)
+        self._file.write(data)
+        self._file_size = len(data)
+
+class _NullEventLog(EventLog):
+    """Log de eventos desativado: emissões não fazem nada"""
+
+    def _emit(self, event_type: EventType, payload: bytes):
+        pass
+
+    def frame(self, cycle_ms: float):
+        pass
+
+    def detection(self, source: str, count: int):
+        pass
+
+    def action(self, module: str, action: str, value: float = 0.0, latency_ms: float = 0.0):
+        pass
+
+    def state(self, module: str, old: str, new: str):
+        pass
+
+_NULL_EVENT_LOG = _NullEventLog()
+_event_log: EventLog = _NULL_EVENT_LOG
+
+def get_event_log() -> EventLog:
+    """Log de eventos ativo (ou um log nulo, se desativado)"""
+    return _event_log
+
+def start_event_log(directory: str = "logs", **options) -> EventLog:
+    """Ativa o log de eventos global"""
+    global _event_log
+    if _event_log is _NULL_EVENT_LOG:
+        _event_log = EventLog(directory, **options)
+        _event_log.start()
+    return _event_log
+
+def stop_event_log():
+    """Desativa o log de eventos global"""
+    global _event_log
+    if _event_log is not _NULL_EVENT_LOG:
+        _event_log.stop()
+        _event_log = _NULL_EVENT_LOG
+
+# Leitura
+Event = Tuple[EventType, float, tuple]
+
+def iter_events(path: str, chunk_size: int = 1024 * 1024) -> Iterator[Event]:
+    """Lê eventos de um arquivo em blocos, sem carregá-lo inteiro na memória"""
+    with open(path, 'rb') as f:
+        magic, version = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Arquivo de eventos inválido: {path}")
+
+        buffer = b""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer = buffer + chunk if buffer else chunk
+            view = memoryview(buffer)
+            offset = 0
+            end = len(buffer)
+
+            while offset + _RECORD_HEADER.size <= end:
+                length, event_type, timestamp = _RECORD_HEADER.unpack_from(view, offset)
+                body = offset + _RECORD_HEADER.size
+                if body + length > end:
+                    break
+                yield _decode(event_type, timestamp, view, body)
+                offset = body + length
+
+            buffer = bytes(view[offset:])
+            view.release()
+
+def _decode(event_type: int, timestamp: float, buffer, offset: int) -> Event:
+    """Decodifica corpo de um registro conforme o esquema do tipo"""
+    if event_type == EventType.FRAME:
+        return EventType.FRAME, timestamp, _FRAME.unpack_from(buffer, offset)
+    if event_type == EventType.DETECTION:
+        source, offset = _unpack_str(buffer, offset)
+        return EventType.DETECTION, timestamp, (source, _COUNT.unpack_from(buffer, offset)[0])
+    if event_type == EventType.ACTION:
+        module, offset = _unpack_str(buffer, offset)
+        action, offset = _unpack_str(buffer, offset)
+        return EventType.ACTION, timestamp, (module, action) + _ACTION_VALUES.unpack_from(buffer, offset)
+    if event_type == EventType.STATE:
+        module, offset = _unpack_str(buffer, offset)
+        old, offset = _unpack_str(buffer, offset)
+        new, offset = _unpack_str(buffer, offset)
+        return EventType.STATE, timestamp, (module, old, new)
+    raise ValueError(f"Tipo de evento desconhecido: {event_type}")
+
+class _Histogram:
+    """Histograma de buckets fixos (percentis em memória constante)"""
+
+    def __init__(self, bucket_ms: float = 1.0, max_ms: float = 10000.0):
+        self.bucket_ms = bucket_ms
+        self.counts = [0] * (int(max_ms / bucket_ms) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.counts[min(int(value / self.bucket_ms), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                return min((index + 1) * self.bucket_ms, self.max)
+        return 0.0
+
+class EventStats:
+    """Agregados calculados em uma única passagem pelos eventos"""
+
+    def __init__(self):
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.frame_times = _Histogram()
+        self.detections: Dict[str, List[int]] = {}              # fonte -> [eventos, total]
+        self.actions: Dict[Tuple[str, str], int] = {}
+        self.latencies: Dict[str, _Histogram] = {}              # módulo -> latência das ações
+        self.state_time: Dict[str, Dict[str, float]] = {}       # módulo -> estado -> segundos
+        self._current_state: Dict[str, Tuple[str, float]] = {}  # módulo -> (estado, desde)
+
+    def add(self, event: Event):
+        event_type, timestamp, fields = event
+        if self.first_ts is None:
+            self.first_ts = timestamp
+        self.last_ts = timestamp
+
+        if event_type == EventType.FRAME:
+            self.frame_times.add(fields[0])
+        elif event_type == EventType.DETECTION:
+            totals = self.detections.setdefault(fields[0], [0, 0])
+            totals[0] += 1
+            totals[1] += fields[1]
+        elif event_type == EventType.ACTION:
+            module, action, _, latency_ms = fields
+            self.actions[(module, action)] = self.actions.get((module, action), 0) + 1
+            if latency_ms > 0:
+                self.latencies.setdefault(module, _Histogram()).add(latency_ms)
+        elif event_type == EventType.STATE:
+            module, old, new = fields
+            self._close_state(module, timestamp)
+            if new:
+                self._current_state[module] = (new, timestamp)
+            else:
+                self._current_state.pop(module, None)
+
+    def _close_state(self, module: str, timestamp: float):
+        current = self._current_state.get(module)
+        if current is not None:
+            state, since = current
+            totals = self.state_time.setdefault(module, {})
+            totals[state] = totals.get(state, 0.0) + max(0.0, timestamp - since)
+
+    def end_file(self):
+        """
+        Fim de um arquivo: fecha os estados abertos no último evento lido
+        O intervalo até o próximo arquivo não conta como tempo no último estado
+        (cada arquivo recomeça com o estado atual dos módulos)
+        """
+        if self.last_ts is not None:
+            for module in list(self._current_state):
+                self._close_state(module, self.last_ts)
+        self._current_state.clear()
+
+    def finish(self):
+        """Contabiliza o tempo do estado atual de cada módulo até o último evento"""
+        if self.last_ts is not None:
+            for module in list(self._current_state):
+                self._close_state(module, self.last_ts)
+                self._current_state[module] = (self._current_state[module][0], self.last_ts)
+
+    def report(self) -> str:
+        """Resumo legível dos agregados"""
+        if self.first_ts is None:
+            return "Nenhum evento encontrado"
+
+        duration = max(self.last_ts - self.first_ts, 1e-6)
+        minutes = duration / 60
+        lines = [f"Duração: {duration:.1f}s"]
+
+        frames = self.frame_times
+        if frames.count:
+            lines.append(f"Frames: {frames.count} ({frames.count / duration:.1f} FPS), ciclo médio "
+                         f"{frames.mean():.1f}ms, p95 {frames.percentile(0.95):.0f}ms, máx {frames.max:.1f}ms")
+
+        for source, (events, total) in sorted(self.detections.items()):
+            lines.append(f"Detecção {source}: média {total / events:.2f} por leitura")
+
+        if self.actions:
+            lines.append("Ações por minuto:")
+            for (module, action), count in sorted(self.actions.items()):
+                lines.append(f"  {module}/{action}: {count} ({count / minutes:.1f}/min)")
+
+        for module, histogram in sorted(self.latencies.items()):
+            lines.append(f"Latência {module}: média {histogram.mean():.0f}ms, "
+                         f"p50 {histogram.percentile(0.5):.0f}ms, p95 {histogram.percentile(0.95):.0f}ms, "
+                         f"máx {histogram.max:.0f}ms")
+
+        for module, states in sorted(self.state_time.items()):
+            total = sum(states.values()) or 1.0
+            lines.append(f"Tempo em cada estado ({module}):")
+            for state, seconds in sorted(states.items(), key=lambda item: -item[1]):
+                lines.append(f"  {state}: {seconds:.1f}s ({seconds / total * 100:.1f}%)")
+
+        return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    """CLI de leitura: agrega um ou mais arquivos de eventos"""
+    parser = argparse.ArgumentParser(description="Agrega logs de eventos binários do Tibia Bot")
+    parser.add_argument("files", nargs="+", help="Arquivos .bin (aceita padrões glob)")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for pattern in args.files:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+
+    stats = EventStats()
+    for path in paths:
+        for event in iter_events(path):
+            stats.add(event)
+        stats.end_file()
+    stats.finish()
+    print(stats.report())
+
+if __name__ == "__main__":
+    main()
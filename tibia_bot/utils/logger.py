@@ -1,27 +1,124 @@
 """
 Logger - Sistema de logging configurável
+Os registros são enfileirados (QueueHandler) e gravados em disco por uma
+thread própria (QueueListener); quem registra o log nunca espera por I/O
 """
 
+import atexit
 import logging
 import os
+import heapq
+import itertools
+import queue
+import threading
+from collections import deque
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
 import sys
 
-def setup_logger(name: str = "tibia_bot", level: str = "INFO") -> logging.Logger:
+LogEntry = Tuple[int, str, str]  # (nível, nome do nível, linha formatada)
+
+# Loggers das ações dos módulos (cura, mana, comida): cada linha registra uma
+# tecla pressionada e nunca é limitada
+ACTION_LOGGERS = ("modules.auto_heal", "modules.auto_mana", "modules.auto_food")
+
+# Listener do pipeline assíncrono (None até setup_logger)
+_queue_listener: Optional[QueueListener] = None
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler com fila limitada: se a fila estiver cheia o registro é
+    descartado e contado, e um aviso com o total é enfileirado assim que houver espaço
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0  # Total de registros descartados
+        self._unreported_drops = 0
+    
+    def enqueue(self, record: logging.LogRecord):
+        """Enfileira sem bloquear (chamado com o lock do handler)"""
+        try:
+            if self._unreported_drops:
+                self.queue.put_nowait(self._drop_notice(self._unreported_drops))
+                self._unreported_drops = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported_drops += 1
+    
+    @staticmethod
+    def _drop_notice(count: int) -> logging.LogRecord:
+        """Registro de aviso sobre mensagens descartadas"""
+        return logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"{count} mensagens de log descartadas (fila cheia)", None, None
+        )
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita mensagens repetitivas por ponto de chamada (logger + linha)
+    Até 'burst' registros a cada 'interval' segundos; o excesso é descartado
+    e a quantidade suprimida é anexada ao próximo registro aceito.
+    Avisos, erros e os loggers em 'exempt' (e seus filhos) passam sempre.
+    """
+    
+    def __init__(self, interval: float = 5.0, burst: int = 3, max_level: int = logging.INFO,
+                 exempt: Tuple[str, ...] = ACTION_LOGGERS):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.max_level = max_level  # Níveis acima deste nunca são limitados
+        self.exempt = exempt
+        self.suppressed = 0  # Total de registros suprimidos
+        # (logger, linha) -> [início da janela, aceitos na janela, suprimidos na janela]
+        self._windows: Dict[Tuple[str, int], List] = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        if any(record.name == name or record.name.startswith(name + ".") for name in self.exempt):
+            return True
+        
+        key = (record.name, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [record.created, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.msg} (+{suppressed} repetidas suprimidas)"
+                return True
+            
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            
+            window[2] += 1
+            self.suppressed += 1
+            return False
+
+def setup_logger(name: str = "tibia_bot", level: str = "INFO", queue_size: int = 10000,
+                 rate_limit_interval: float = 5.0, rate_limit_burst: int = 3) -> logging.Logger:
     """
     Configura sistema de logging com arquivo rotativo e console
+    Os handlers de saída rodam na thread do QueueListener, instalado no logger
+    raiz para receber também os loggers dos módulos (nomeados por __name__)
     """
+    global _queue_listener
+    
     # Criar diretório de logs
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     
-    # Configurar logger principal
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, level.upper(), logging.INFO))
     
-    # Evitar handlers duplicados
-    if logger.handlers:
+    # Evitar pipelines duplicados
+    if _queue_listener is not None:
         return logger
     
     # Formatter
@@ -39,7 +136,6 @@ def setup_logger(name: str = "tibia_bot", level: str = "INFO") -> logging.Logger
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
     # Handler para console
     console_handler = logging.StreamHandler(sys.stdout)
@@ -48,7 +144,6 @@ def setup_logger(name: str = "tibia_bot", level: str = "INFO") -> logging.Logger
         '%(levelname)s - %(name)s - %(message)s'
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
     
     # Handler para erros críticos (arquivo separado)
     error_handler = RotatingFileHandler(
@@ -59,11 +154,99 @@ def setup_logger(name: str = "tibia_bot", level: str = "INFO") -> logging.Logger
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(formatter)
-    logger.addHandler(error_handler)
+    
+    # Fila limitada + limite de repetição aplicado antes de enfileirar
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    queue_handler.addFilter(RateLimitFilter(rate_limit_interval, rate_limit_burst))
+    root_logger.addHandler(queue_handler)
+    
+    _queue_listener = QueueListener(
+        queue_handler.queue, file_handler, console_handler, error_handler,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
+    atexit.register(shutdown_logging)
     
     logger.info(f"Logger configurado: {name}")
     return logger
 
+def shutdown_logging():
+    """Descarrega a fila e para a thread de gravação"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+def add_pipeline_handler(handler: logging.Handler):
+    """Adiciona handler de saída ao pipeline assíncrono (ou ao logger raiz sem pipeline)"""
+    if _queue_listener is not None:
+        _queue_listener.handlers = _queue_listener.handlers + (handler,)
+    else:
+        logging.getLogger().addHandler(handler)
+
+def remove_pipeline_handler(handler: logging.Handler):
+    """Remove handler adicionado por add_pipeline_handler"""
+    if _queue_listener is not None:
+        _queue_listener.handlers = tuple(h for h in _queue_listener.handlers if h is not handler)
+    logging.getLogger().removeHandler(handler)
+
 def get_logger(name: str) -> logging.Logger:
     """Obtém logger existente"""
-    return logging.getLogger(f"tibia_bot.{name}")
\ No newline at end of file
+    return logging.getLogger(f"tibia_bot.{name}")
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Guarda as últimas mensagens formatadas em um buffer circular por nível
+    Quem registra o log só faz um append; a interface lê as novidades em lote.
+    Um nível ruidoso (ex: INFO) não empurra para fora os avisos e erros.
+    """
+    
+    def __init__(self, capacity: int = 500, level: int = logging.DEBUG):
+        super().__init__(level)
+        self.capacity = capacity
+        self.buffers: Dict[int, deque] = {}  # nível -> deque de (sequência, entrada)
+        self.sequence = 0  # Total de registros recebidos desde a criação
+        self.setFormatter(logging.Formatter(
+            '[%(asctime)s] %(levelname)s: %(message)s', datefmt='%H:%M:%S'
+        ))
+    
+    def emit(self, record: logging.LogRecord):
+        """Adiciona registro ao buffer (chamado com o lock do handler)"""
+        try:
+            buffer = self.buffers.get(record.levelno)
+            if buffer is None:
+                buffer = self.buffers[record.levelno] = deque(maxlen=self.capacity)
+            self.sequence += 1
+            buffer.append((self.sequence, (record.levelno, record.levelname, self.format(record))))
+        except Exception:
+            self.handleError(record)
+    
+    def entries_since(self, sequence: int) -> Tuple[int, List[LogEntry]]:
+        """Retorna (sequência atual, entradas registradas depois de 'sequence')"""
+        with self.lock:
+            current = self.sequence
+            if current <= sequence:
+                return current, []
+            # Novidades de cada nível (já em ordem), intercaladas pela sequência
+            recent = []
+            for buffer in self.buffers.values():
+                count = 0
+                for seq, _ in reversed(buffer):
+                    if seq <= sequence:
+                        break
+                    count += 1
+                if count:
+                    recent.append(itertools.islice(buffer, len(buffer) - count, None))
+            return current, [entry for _, entry in heapq.merge(*recent, key=lambda item: item[0])]
+
+def attach_ring_buffer_handler(capacity: int = 500, level: int = logging.INFO) -> RingBufferHandler:
+    """Instala buffer circular no pipeline de log (recebe logs de todos os módulos)"""
+    handler = RingBufferHandler(capacity, level)
+    add_pipeline_handler(handler)
+    
+    # Loggers dos módulos herdam o nível do raiz (WARNING por padrão)
+    root_logger = logging.getLogger()
+    if root_logger.level > level:
+        root_logger.setLevel(level)
+    return handler
@@ -0,0 +1,175 @@
+"""
+Metrics - Métricas de desempenho do bot
+FPS e distribuição do tempo de ciclo do loop principal, memória (RSS) e CPU
+do processo, amostrados em uma thread separada
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+if hasattr(os, 'sysconf') and 'SC_PAGE_SIZE' in os.sysconf_names:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+else:
+    _PAGE_SIZE = 4096
+
+@dataclass(frozen=True)
+class MetricsSample:
+    """Amostra imutável das métricas de desempenho"""
+    timestamp: float = 0.0
+    fps: float = 0.0
+    cycle_time_ms: float = 0.0          # Média da janela de ciclos
+    cycle_time_p95_ms: float = 0.0
+    cycle_time_max_ms: float = 0.0
+    rss_mb: Optional[float] = None
+    cpu_percent: Optional[float] = None
+    fps_history: Tuple[float, ...] = ()
+    cycle_time_history: Tuple[float, ...] = ()
+    rss_history: Tuple[float, ...] = ()
+    cpu_history: Tuple[float, ...] = ()
+
+_psutil_process = None
+
+def read_rss_bytes() -> Optional[int]:
+    """Memória residente do processo (/proc/self/statm no Linux, psutil nos demais)"""
+    global _psutil_process
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if psutil is None:
+        return None
+    try:
+        if _psutil_process is None:
+            _psutil_process = psutil.Process()
+        return _psutil_process.memory_info().rss
+    except Exception:
+        return None
+
+def read_cpu_seconds() -> float:
+    """Tempo de CPU (usuário + sistema) consumido pelo processo"""
+    times = os.times()
+    return times.user + times.system
+
+class PerformanceMonitor:
+    """
+    Coleta de métricas com custo mínimo no loop do bot
+
+    O loop só registra a duração de cada ciclo (append em deque); agregação,
+    leitura de RSS/CPU e histórico ficam na thread de amostragem.
+    """
+
+    def __init__(self, sample_interval: float = 1.0, cycle_window: int = 200,
+                 history_size: int = 60, on_sample: Optional[Callable[[MetricsSample], None]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.sample_interval = sample_interval
+        self.on_sample = on_sample
+
+        self._cycle_times: Deque[float] = deque(maxlen=cycle_window)
+        self._cycle_count = 0
+
+        self._fps_history: Deque[float] = deque(maxlen=history_size)
+        self._cycle_time_history: Deque[float] = deque(maxlen=history_size)
+        self._rss_history: Deque[float] = deque(maxlen=history_size)
+        self._cpu_history: Deque[float] = deque(maxlen=history_size)
+
+        self._last_sample_time = time.perf_counter()
+        self._last_cycle_count = 0
+        self._last_cpu_seconds = read_cpu_seconds()
+        self._latest = MetricsSample()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def record_cycle(self, duration: float):
+        """Registra duração (segundos) de um ciclo do loop do bot"""
+        self._cycle_times.append(duration)
+        self._cycle_count += 1
+
+    def latest(self) -> MetricsSample:
+        """Última amostra calculada"""
+        return self._latest
+
+    def start(self):
+        """Inicia thread de amostragem"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="PerformanceMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Para thread de amostragem"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        """Loop da thread de amostragem"""
+        while not self._stop_event.wait(self.sample_interval):
+            try:
+                sample = self.sample()
+                if self.on_sample:
+                    self.on_sample(sample)
+            except Exception as e:
+                self.logger.error(f"Erro na amostragem de métricas: {e}")
+
+    def sample(self) -> MetricsSample:
+        """Calcula nova amostra a partir dos ciclos registrados desde a anterior"""
+        now = time.perf_counter()
+        elapsed = max(now - self._last_sample_time, 1e-6)
+
+        cycle_count = self._cycle_count
+        new_cycles = cycle_count - self._last_cycle_count
+        fps = new_cycles / elapsed
+
+        cpu_seconds = read_cpu_seconds()
+        cpu_percent = (cpu_seconds - self._last_cpu_seconds) / elapsed * 100
+
+        self._last_sample_time = now
+        self._last_cycle_count = cycle_count
+        self._last_cpu_seconds = cpu_seconds
+
+        # Distribuição do tempo de ciclo na janela recente (vazia com o loop parado)
+        durations = sorted(tuple(self._cycle_times)) if new_cycles else []
+        if durations:
+            mean_ms = sum(durations) / len(durations) * 1000
+            p95_ms = durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000
+            max_ms = durations[-1] * 1000
+        else:
+            mean_ms = p95_ms = max_ms = 0.0
+
+        rss = read_rss_bytes()
+        rss_mb = rss / (1024 * 1024) if rss is not None else None
+
+        self._fps_history.append(fps)
+        self._cycle_time_history.append(mean_ms)
+        self._cpu_history.append(cpu_percent)
+        if rss_mb is not None:
+            self._rss_history.append(rss_mb)
+
+        self._latest = MetricsSample(
+            timestamp=time.time(),
+            fps=fps,
+            cycle_time_ms=mean_ms,
+            cycle_time_p95_ms=p95_ms,
+            cycle_time_max_ms=max_ms,
+            rss_mb=rss_mb,
+            cpu_percent=cpu_percent,
+            fps_history=tuple(self._fps_history),
+            cycle_time_history=tuple(self._cycle_time_history),
+            rss_history=tuple(self._rss_history),
+            cpu_history=tuple(self._cpu_history)
+        )
+        return self._latest
@@ -0,0 +1,70 @@
+"""
+Startup - Medição do tempo de inicialização
+Fases da partida, imports pesados carregados sob demanda e tempo até o primeiro frame
+"""
+
+import importlib
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Referência de início (este módulo é importado logo no começo do main.py)
+_PROCESS_START = time.perf_counter()
+
+class StartupProfiler:
+    """Cronômetro das fases de inicialização"""
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = start if start is not None else _PROCESS_START
+        self.enabled = False  # Imprimir relatório (--startup-timing)
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: Dict[str, float] = {}
+        self.first_frame: Optional[float] = None
+        self._last_mark = self.start
+
+    def elapsed(self) -> float:
+        """Segundos desde o início do processo"""
+        return time.perf_counter() - self.start
+
+    def mark(self, phase: str):
+        """Fecha uma fase, registrando o tempo desde a marca anterior"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last_mark))
+        self._last_mark = now
+
+    def record_first_frame(self) -> Optional[float]:
+        """Registra o primeiro frame processado (só na primeira chamada)"""
+        if self.first_frame is not None:
+            return None
+        self.first_frame = self.elapsed()
+        if self.enabled:
+            print(f"[startup] primeiro frame processado em {self.first_frame * 1000:.0f}ms")
+        return self.first_frame
+
+    def report(self, top: int = 10) -> str:
+        """Relatório das fases e dos imports sob demanda mais lentos"""
+        lines = ["[startup] fases:"]
+        for phase, duration in self.phases:
+            lines.append(f"  {phase:<20} {duration * 1000:8.1f}ms")
+        lines.append(f"  {'total':<20} {(self._last_mark - self.start) * 1000:8.1f}ms")
+
+        if self.imports:
+            lines.append("[startup] imports sob demanda (cumulativo):")
+            slowest = sorted(self.imports.items(), key=lambda item: -item[1])[:top]
+            for module_name, duration in slowest:
+                lines.append(f"  {module_name:<30} {duration * 1000:8.1f}ms")
+        lines.append("[startup] detalhamento completo: python -X importtime main.py")
+        return "\n".join(lines)
+
+profiler = StartupProfiler()
+
+def lazy_import(module_name: str):
+    """Importa módulo sob demanda, registrando o tempo do primeiro import"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    profiler.imports[module_name] = time.perf_counter() - start
+    return module